@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""Batch OCR of scanned title documents.
+
+Every document is one title: a multi-page TIFF, a PDF or a single image.
+Documents are split into pages and the pages are recognized in parallel
+in the shared worker pool of batch_plotter. Workers decode their own page
+from the file, so no page image crosses a process boundary, and each
+worker process keeps its own OCR engine (see ocr_engine.get_engine).
+
+Recognized pages are collected in input order and the text of all pages
+of a title is joined before parsing, so a technical description, or a
+single bearing line, that continues onto the next page is read as one.
+Each title becomes one lot record in the JSONL format read by
+batch_plotter, with the tie point left for the user to fill in.
+
+With an ocr_cache.OcrCache, pages read before with the same settings are
+not recognized again; re-running a batch after a parser fix only parses
+the cached text. This module has no Qt dependency.
+"""
+
+import collections
+import json
+import os
+import time
+
+import numpy as np
+
+from . import batch_plotter
+from . import ocr_cache
+from . import ocr_engine
+from . import ocr_pipeline
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+try:
+    import fitz
+except ImportError:
+    fitz = None
+
+PDF_EXTENSIONS = (".pdf",)
+# Resolution PDF pages are rendered at for OCR
+PDF_DPI = 300
+
+
+def is_pdf(path):
+    return os.path.splitext(path)[1].lower() in PDF_EXTENSIONS
+
+
+def count_pages(path):
+    """Return the number of pages of a document without decoding them."""
+    if is_pdf(path):
+        if fitz is None:
+            raise ValueError("Reading PDF files needs the PyMuPDF package")
+        with fitz.open(path) as document:
+            return document.page_count
+    if Image is None:
+        raise ValueError("Reading images needs the Pillow package")
+    with Image.open(path) as image:
+        return getattr(image, "n_frames", 1)
+
+
+def load_page(path, page):
+    """Decode one page of a document into a grayscale array.
+
+    Pages are decoded straight to grayscale by one library, which is all
+    preprocessing needs, so no colour copy of the page is made.
+    """
+    if is_pdf(path):
+        with fitz.open(path) as document:
+            pixmap = document[page].get_pixmap(dpi=PDF_DPI, colorspace=fitz.csGRAY, alpha=False)
+        # Rows of a pixmap are padded to its stride
+        rows = np.frombuffer(pixmap.samples, dtype=np.uint8).reshape(pixmap.height, pixmap.stride)
+        return rows[:, :pixmap.width]
+    with Image.open(path) as image:
+        image.seek(page)
+        if image.mode != "L":
+            # Same luma weights as OpenCV's BGR to gray conversion
+            image = image.convert("L")
+        return np.asarray(image)
+
+
+def recognize_page(path, page, engine, detect_region=True, cache=None):
+    """Return the raw OCR text of one page and whether it came from the cache.
+
+    With detect_region only the technical description block is read, see
+    ocr_pipeline.find_description_region.
+    """
+    source = ocr_cache.file_digest(path) if cache is not None else None
+    _, raw_text, text_cached = ocr_pipeline.run_ocr(
+        lambda: load_page(path, page), engine,
+        region=ocr_pipeline.AUTO_REGION if detect_region else None,
+        cache=cache, source=source, page=page)
+    return raw_text, text_cached
+
+
+def _recognize_page_in_worker(path, page, engine_name, detect_region, cache_directory):
+    cache = ocr_cache.get_cache(cache_directory) if cache_directory is not None else None
+    return recognize_page(path, page, ocr_engine.get_engine(engine_name), detect_region, cache)
+
+
+def title_record(path, page_texts):
+    """Return the batch_plotter lot record of a title from the text of its pages."""
+    raw_text = "\n".join(page_texts)
+    return {
+        'lot_id': os.path.splitext(os.path.basename(path))[0],
+        'tie_point': '',
+        'province': '',
+        'municipality': '',
+        'tie_northing': None,
+        'tie_easting': None,
+        'lines': ocr_pipeline.parse_bearings(raw_text),
+        'source': path,
+        'pages': len(page_texts),
+    }
+
+
+class OcrStats:
+    """Running totals and throughput of a batch OCR run."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+        self.titles = 0
+        self.pages = 0
+        self.cached_pages = 0
+        self.errors = []
+
+    def add_page(self, cached=False):
+        self.pages += 1
+        self.cached_pages += cached
+        self.elapsed = time.perf_counter() - self.started
+
+    @property
+    def pages_per_minute(self):
+        return 60.0 * self.pages / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return (f"{self.titles} titles ({self.pages} pages, {self.cached_pages} from the OCR cache) "
+                f"in {self.elapsed:.1f} s: {self.pages_per_minute:,.1f} pages/min")
+
+
+def iter_page_tasks(paths, errors):
+    """Yield (path, page, page_count) for every page of every readable document.
+
+    Documents that cannot be opened are appended to ``errors``.
+    """
+    for path in paths:
+        try:
+            page_count = count_pages(path)
+        except (OSError, ValueError, RuntimeError) as e:
+            errors.append((path, str(e)))
+            continue
+        for page in range(page_count):
+            yield path, page, page_count
+
+
+def run_batch_ocr(paths, write_title, engine=None, workers=None, progress=None, detect_region=True, cache=None):
+    """OCR documents page by page and write one lot record per title.
+
+    Args:
+        paths: Document paths; each document is one title.
+        write_title: Callable taking each title's lot record, in input order.
+        engine: OCR engine for workers=1; worker processes start the
+            engine of the same name, by default the fastest available.
+        workers: Number of worker processes; 1 recognizes in this process.
+        progress: Optional callable taking the OcrStats after every page.
+            Returning False stops the run.
+        detect_region: Read only the technical description block of each
+            page instead of the whole page.
+        cache: Optional ocr_cache.OcrCache; pages already read with the
+            same settings are only parsed again.
+
+    Returns:
+        OcrStats of the run; unreadable documents and pages are listed in
+        ``errors`` and their titles are not written.
+    """
+    stats = OcrStats()
+    tasks = iter_page_tasks(paths, stats.errors)
+    # Text of the pages of the title being collected, None for failed pages
+    page_texts = []
+
+    def deliver(task, result, error=None):
+        path, page, page_count = task
+        if error is not None:
+            stats.errors.append((f"{path} page {page + 1}", error))
+        page_texts.append(result[0] if error is None else None)
+        stats.add_page(error is None and result[1])
+        if page == page_count - 1:
+            if None not in page_texts:
+                write_title(title_record(path, page_texts))
+                stats.titles += 1
+            page_texts.clear()
+        return progress is None or progress(stats) is not False
+
+    if workers == 1:
+        engine = engine or ocr_engine.get_engine()
+        for task in tasks:
+            try:
+                result, error = recognize_page(task[0], task[1], engine, detect_region, cache), None
+            except Exception as e:
+                result, error = None, str(e)
+            if not deliver(task, result, error):
+                break
+        stats.elapsed = time.perf_counter() - stats.started
+        return stats
+
+    engine_name = engine.name if engine is not None else None
+    cache_directory = cache.directory if cache is not None else None
+    pool = batch_plotter.get_pool(workers)
+    max_in_flight = 2 * (workers or os.cpu_count() or 1)
+    # Pages are delivered in submission order, which keeps titles together
+    pending = collections.deque()
+
+    def deliver_next():
+        task, future = pending.popleft()
+        try:
+            result, error = future.result(), None
+        except Exception as e:
+            result, error = None, str(e)
+        return deliver(task, result, error)
+
+    for task in tasks:
+        pending.append((task, pool.submit(_recognize_page_in_worker, task[0], task[1], engine_name, detect_region, cache_directory)))
+        if len(pending) >= max_in_flight and not deliver_next():
+            break
+    else:
+        while pending:
+            if not deliver_next():
+                break
+    for _, future in pending:
+        future.cancel()
+    stats.elapsed = time.perf_counter() - stats.started
+    return stats
+
+
+def write_jsonl(paths, output_path, engine=None, workers=None, progress=None, detect_region=True, cache=None):
+    """OCR documents into a JSONL file of lots for batch_plotter.
+
+    Returns:
+        OcrStats of the run.
+    """
+    with open(output_path, "w", encoding="utf-8") as f:
+        def write_title(record):
+            f.write(json.dumps(record) + "\n")
+        return run_batch_ocr(paths, write_title, engine, workers, progress, detect_region, cache)
@@ -0,0 +1,504 @@
+# -*- coding: utf-8 -*-
+"""Batch plotting of many technical descriptions at once.
+
+Lots are read from CSV or JSONL files and run through the traverse engine in
+a single vectorized pass. This module has no Qt dependency; writing the
+result into a QGIS layer is done by the dialog.
+
+CSV files have one row per bearing line with the columns ``lot_id``,
+``tie_point``, ``province``, ``municipality``, ``tie_northing``,
+``tie_easting``, ``direction``, ``degrees``, ``minutes``, ``quadrant`` and
+``distance``. Consecutive rows with the same ``lot_id`` form one lot and the
+tie point columns are taken from its first row.
+
+JSONL files have one lot per line with the same tie point keys and a
+``lines`` list. A line may be a bearing dict as produced by OCR, a
+``[ns, deg, min, ew, distance]`` list or a string like ``"N 69 16 E 100.00"``.
+JSON files hold the same lot objects in one array. A malformed JSONL line
+or array item is reported as an error of that lot, numbered by its line
+or position, and the other lots are still plotted.
+
+A lot is tied either by ``tie_northing``/``tie_easting`` or by a tie point
+name, optionally narrowed down by province and municipality. The province
+and municipality also give the PRS92 zone of the lot (see prs92_zones).
+"""
+
+import collections
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from . import prs92_zones
+from . import traverse
+
+# Lots per worker task; large enough to amortize pickling, small enough to balance
+PARALLEL_CHUNK_SIZE = 2000
+
+# Warm worker pool kept between batch runs, see get_pool()
+_POOL = None
+_POOL_WORKERS = 0
+
+LINE_PATTERN = re.compile(
+    r"(?P<ns>[NS])[\s.]*(?P<deg>\d{1,2})\D+?(?P<min>\d{1,2})\D*?(?P<ew>[EW])[\s,\-]*(?P<dist>\d+(?:[.,]\d+)?)",
+    re.IGNORECASE,
+)
+
+
+class LotBatch:
+    """Corners and summary values of a batch of computed lots.
+
+    Corners of all lots are stored back to back in ``corners``; lot ``i``
+    owns the rows ``offsets[i]:offsets[i+1]``. ``zones`` holds the PRS92
+    zone of every lot, prs92_zones.UNKNOWN_ZONE where it is not known.
+    """
+
+    def __init__(self, lot_ids, tie_points, offsets, corners, areas, misclosures, errors, valid=None, zones=None):
+        self.lot_ids = lot_ids
+        self.tie_points = tie_points
+        self.offsets = offsets
+        self.corners = corners
+        self.areas = areas
+        self.misclosures = misclosures
+        self.errors = errors
+        # Per-lot GEOS validity, filled in by the parallel workers
+        self.valid = valid
+        self.zones = zones if zones is not None else np.zeros(len(lot_ids), dtype=np.int8)
+
+    def __len__(self):
+        return len(self.lot_ids)
+
+    def lot_corners(self, index):
+        """Return the (n, 2) corner array of one lot."""
+        return self.corners[self.offsets[index]:self.offsets[index + 1]]
+
+    def take(self, indices):
+        """Return a LotBatch of the lots at the given positions, without errors."""
+        indices = np.asarray(indices, dtype=np.int64)
+        counts = self.offsets[indices + 1] - self.offsets[indices]
+        offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        # Corner rows of the chosen lots, in order
+        rows = np.arange(offsets[-1]) + np.repeat(self.offsets[indices] - offsets[:-1], counts)
+        return LotBatch(
+            [self.lot_ids[i] for i in indices.tolist()],
+            [self.tie_points[i] for i in indices.tolist()],
+            offsets, self.corners[rows], self.areas[indices], self.misclosures[indices], [],
+            self.valid[indices] if self.valid is not None else None, self.zones[indices],
+        )
+
+
+def parse_line(line):
+    """Convert one bearing line into a (ns, deg, min, ew, distance) tuple."""
+    if isinstance(line, dict):
+        return (line['direction'], line['degrees'], line['minutes'], line['quadrant'], line['distance'])
+    if isinstance(line, str):
+        match = LINE_PATTERN.search(line)
+        if not match:
+            raise ValueError(f"Unrecognized bearing line: {line!r}")
+        return (match.group('ns'), match.group('deg'), match.group('min'), match.group('ew'), match.group('dist'))
+    return tuple(line)
+
+
+def _parse_tie_value(value):
+    if value is None or str(value).strip() == "":
+        return None
+    return float(str(value).strip().replace(",", "."))
+
+
+def _new_lot(record):
+    return {
+        'lot_id': str(record.get('lot_id', '')).strip(),
+        'tie_point': str(record.get('tie_point') or '').strip(),
+        'province': str(record.get('province') or '').strip(),
+        'municipality': str(record.get('municipality') or '').strip(),
+        'tie_northing': record.get('tie_northing'),
+        'tie_easting': record.get('tie_easting'),
+        'lines': [],
+    }
+
+
+def iter_csv_lots(path):
+    """Yield lots from a CSV file with one row per bearing line."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        lot = None
+        for record in csv.DictReader(f):
+            record = {k.strip().lower(): v for k, v in record.items() if k}
+            lot_id = str(record.get('lot_id', '')).strip()
+            if lot is None or lot_id != lot['lot_id']:
+                if lot is not None:
+                    yield lot
+                lot = _new_lot(record)
+            lot['lines'].append((
+                record.get('direction'), record.get('degrees'), record.get('minutes'),
+                record.get('quadrant'), record.get('distance'),
+            ))
+        if lot is not None:
+            yield lot
+
+
+def _json_lot(record, number):
+    """Return the lot of a decoded JSON record, numbered if it has no lot_id.
+
+    A record that is not an object gives a lot with an ``error`` message,
+    which is reported when the lot is computed.
+    """
+    if not isinstance(record, dict):
+        return {'lot_id': str(number), 'lines': [], 'error': "A lot must be a JSON object"}
+    lot = _new_lot(record)
+    if not lot['lot_id']:
+        lot['lot_id'] = str(number)
+    lot['lines'] = record.get('lines', [])
+    return lot
+
+
+def iter_jsonl_lots(path):
+    """Yield lots from a JSONL file with one lot per line."""
+    with open(path, encoding="utf-8") as f:
+        for line_number, text in enumerate(f, start=1):
+            if not text.strip():
+                continue
+            try:
+                record = json.loads(text)
+            except json.JSONDecodeError as e:
+                yield {'lot_id': str(line_number), 'lines': [], 'error': f"Malformed JSON: {e}"}
+                continue
+            yield _json_lot(record, line_number)
+
+
+def iter_json_lots(path):
+    """Yield lots from a JSON file holding an array of lots."""
+    with open(path, encoding="utf-8") as f:
+        records = json.load(f)
+    if not isinstance(records, list):
+        raise ValueError("A JSON batch file must hold an array of lots")
+    for number, record in enumerate(records, start=1):
+        yield _json_lot(record, number)
+
+
+def read_lots(path):
+    """Yield lots from a CSV, JSONL or JSON file, chosen by file extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return iter_csv_lots(path)
+    if extension in (".jsonl", ".ndjson"):
+        return iter_jsonl_lots(path)
+    if extension == ".json":
+        return iter_json_lots(path)
+    raise ValueError(f"Unsupported batch file type: {extension}")
+
+
+def resolve_tie(lot, resolve_tie_point=None):
+    """Return the (easting, northing) tie coordinates of a lot.
+
+    Explicit coordinates win over the tie point name. ``resolve_tie_point`` is
+    called with (name, province, municipality) and returns (northing, easting)
+    or None.
+    """
+    northing = _parse_tie_value(lot.get('tie_northing'))
+    easting = _parse_tie_value(lot.get('tie_easting'))
+    if northing is not None and easting is not None:
+        return easting, northing
+
+    name = lot.get('tie_point')
+    if not name:
+        raise ValueError("No tie point name or coordinates")
+    if resolve_tie_point is None:
+        raise ValueError(f"Tie point {name!r} cannot be looked up")
+    found = resolve_tie_point(name, lot.get('province'), lot.get('municipality'))
+    if found is None:
+        raise ValueError(f"Tie point {name!r} not found or ambiguous")
+    northing, easting = found
+    return float(easting), float(northing)
+
+
+def polygon_areas(offsets, corners):
+    """Return the shoelace area of every lot in a corner batch."""
+    counts = np.diff(offsets)
+    if len(counts) == 0:
+        return np.zeros(0)
+    starts = offsets[:-1]
+    # Work relative to each lot's first corner to keep precision at PRS92 magnitudes
+    local = corners - np.repeat(corners[starts], counts, axis=0)
+    following = np.arange(1, len(corners) + 1)
+    following[offsets[1:] - 1] = starts
+    cross = local[:, 0] * local[following, 1] - local[following, 0] * local[:, 1]
+    return np.abs(np.add.reduceat(cross, starts)) / 2.0
+
+
+def compute_lots(lots, resolve_tie_point=None):
+    """Compute the corners, area and misclosure of many lots in one pass.
+
+    Lots that cannot be parsed or have fewer than three corners are skipped
+    and reported in ``LotBatch.errors`` as (lot_id, message) pairs.
+    """
+    lot_ids = []
+    tie_points = []
+    zones = []
+    ties = []
+    line_counts = []
+    parsed = []
+    errors = []
+
+    for lot in lots:
+        try:
+            if 'error' in lot:
+                raise ValueError(lot['error'])
+            lot_rows = [parse_line(line) for line in lot['lines']]
+            if len(lot_rows) < 4:
+                raise ValueError("A lot needs a tie line and at least three boundary lines")
+            tie = resolve_tie(lot, resolve_tie_point)
+            zone = prs92_zones.zone_for(lot.get('province'), lot.get('municipality'))
+            if zone != prs92_zones.UNKNOWN_ZONE and not prs92_zones.in_prs92_range(*tie):
+                raise ValueError("Tie point coordinates are outside the PRS92 grid range")
+            lot_lines = traverse.parse_bearing_rows(lot_rows)
+        except (ValueError, KeyError, TypeError) as e:
+            errors.append((lot.get('lot_id'), str(e)))
+            continue
+        lot_ids.append(lot['lot_id'])
+        tie_points.append(lot.get('tie_point', ''))
+        zones.append(zone)
+        ties.append(tie)
+        line_counts.append(len(lot_rows))
+        parsed.append(lot_lines)
+
+    if not parsed:
+        return LotBatch([], [], np.zeros(1, dtype=np.int64), np.zeros((0, 2)), np.zeros(0), np.zeros(0), errors)
+
+    ns, deg, minutes, ew, distance = (np.concatenate(column) for column in zip(*parsed))
+    delta_lat, delta_dep = traverse.calculate_deltas(ns, deg, minutes, ew, distance)
+
+    line_offsets = np.zeros(len(line_counts) + 1, dtype=np.int64)
+    np.cumsum(line_counts, out=line_offsets[1:])
+    ties = np.asarray(ties, dtype=np.float64).reshape(-1, 2)
+    path = traverse.traverse_lots(ties[:, 0], ties[:, 1], line_offsets, delta_lat, delta_dep)
+
+    # Corners are the positions after every line except the closing one
+    is_corner = np.ones(len(path), dtype=bool)
+    is_corner[line_offsets[1:] - 1] = False
+    corners = path[is_corner]
+    offsets = line_offsets - np.arange(len(line_offsets))
+
+    closing = path[line_offsets[1:] - 1]
+    misclosures = np.hypot(*(closing - corners[offsets[:-1]]).T)
+
+    return LotBatch(
+        lot_ids, tie_points, offsets, corners,
+        polygon_areas(offsets, corners), misclosures, errors,
+        zones=np.array(zones, dtype=np.int8),
+    )
+
+
+def merge_batches(batches):
+    """Concatenate LotBatch objects in order into one LotBatch."""
+    batches = list(batches)
+    corner_counts = [len(batch.corners) for batch in batches]
+    shifts = np.cumsum([0] + corner_counts[:-1])
+    offsets = np.concatenate([np.zeros(1, dtype=np.int64)] + [
+        batch.offsets[1:] + shift for batch, shift in zip(batches, shifts)
+    ])
+    valid = None
+    if batches and all(batch.valid is not None for batch in batches):
+        valid = np.concatenate([batch.valid for batch in batches])
+    return LotBatch(
+        [lot_id for batch in batches for lot_id in batch.lot_ids],
+        [name for batch in batches for name in batch.tie_points],
+        offsets,
+        np.concatenate([batch.corners for batch in batches]) if batches else np.zeros((0, 2)),
+        np.concatenate([batch.areas for batch in batches]) if batches else np.zeros(0),
+        np.concatenate([batch.misclosures for batch in batches]) if batches else np.zeros(0),
+        [error for batch in batches for error in batch.errors],
+        valid,
+        np.concatenate([batch.zones for batch in batches]) if batches else None,
+    )
+
+
+def polygon_validity(batch):
+    """Return a boolean array with the GEOS validity of every lot polygon."""
+    import shapely
+    counts = np.diff(batch.offsets)
+    if hasattr(shapely, "linearrings"):
+        # Shapely 2 builds and checks all rings in vectorized GEOS calls
+        rings = shapely.linearrings(batch.corners, indices=np.repeat(np.arange(len(counts)), counts))
+        return shapely.is_valid(shapely.polygons(rings))
+    from shapely.geometry import Polygon
+    return np.array([Polygon(batch.lot_corners(i)).is_valid for i in range(len(counts))], dtype=bool)
+
+
+def _compute_shard(lots):
+    batch = compute_lots(lots)
+    batch.valid = polygon_validity(batch)
+    return batch
+
+
+def _python_executable():
+    """Return a Python interpreter to run workers with.
+
+    Inside QGIS sys.executable is the QGIS binary, which must not be used to
+    spawn worker processes.
+    """
+    if os.path.basename(sys.executable).lower().startswith("python"):
+        return sys.executable
+    for name in ("pythonw.exe", "python.exe", os.path.join("bin", "python3")):
+        candidate = os.path.join(sys.exec_prefix, name)
+        if os.path.exists(candidate):
+            return candidate
+    return sys.executable
+
+
+def get_pool(workers=None):
+    """Return the shared warm worker pool, creating it on first use."""
+    global _POOL, _POOL_WORKERS
+    workers = workers or os.cpu_count() or 1
+    if _POOL is None or _POOL_WORKERS != workers:
+        shutdown_pool()
+        context = multiprocessing.get_context("spawn")
+        context.set_executable(_python_executable())
+        _POOL = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        _POOL_WORKERS = workers
+    return _POOL
+
+
+def shutdown_pool():
+    """Stop the shared worker pool, e.g. when the plugin is unloaded."""
+    global _POOL, _POOL_WORKERS
+    if _POOL is not None:
+        _POOL.shutdown(wait=False, cancel_futures=True)
+        _POOL = None
+        _POOL_WORKERS = 0
+
+
+def _tie_lot(lot, resolve_tie_point):
+    """Replace a tie point name with coordinates so workers need no tie point table."""
+    if 'error' in lot:
+        raise ValueError(lot['error'])
+    easting, northing = resolve_tie(lot, resolve_tie_point)
+    return dict(lot, tie_easting=easting, tie_northing=northing)
+
+
+def iter_tied_chunks(lots, resolve_tie_point, chunk_size, errors):
+    """Yield lists of at most ``chunk_size`` lots with tie coordinates filled in.
+
+    Lots whose tie point cannot be resolved are appended to ``errors``.
+    """
+    chunk = []
+    for lot in lots:
+        try:
+            chunk.append(_tie_lot(lot, resolve_tie_point))
+        except ValueError as e:
+            errors.append((lot.get('lot_id'), str(e)))
+            continue
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class BatchStats:
+    """Running totals and throughput of a streamed batch run."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+        self.lots = 0
+        self.lines = 0
+        self.chunks = 0
+        self.errors = []
+
+    def add(self, batch):
+        self.lots += len(batch)
+        self.lines += int(batch.offsets[-1]) + len(batch)
+        self.chunks += 1
+        self.elapsed = time.perf_counter() - self.started
+
+    @property
+    def lots_per_second(self):
+        return self.lots / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def lines_per_second(self):
+        return self.lines / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return (f"{self.lots} lots ({self.lines} lines) in {self.elapsed:.1f} s: "
+                f"{self.lots_per_second:,.0f} lots/s, {self.lines_per_second:,.0f} lines/s")
+
+
+def run_batch(lots, write_chunk, resolve_tie_point=None, workers=None,
+              chunk_size=PARALLEL_CHUNK_SIZE, progress=None):
+    """Stream lots through compute, validation and writing in chunks.
+
+    Lots are pulled lazily from ``lots`` (e.g. ``read_lots``), grouped into
+    chunks and computed in the worker pool. ``write_chunk`` receives each
+    computed LotBatch in input order. At most two chunks per worker are in
+    flight, so memory stays bounded whatever the input size.
+
+    Args:
+        lots: Iterable of lot dicts.
+        write_chunk: Callable taking a LotBatch.
+        resolve_tie_point: Optional tie point name resolver, see resolve_tie.
+        workers: Number of worker processes; 1 computes in this process.
+        chunk_size: Number of lots per chunk.
+        progress: Optional callable taking the BatchStats after every chunk.
+            Returning False stops the run.
+
+    Returns:
+        BatchStats of the run; skipped lots are listed in ``errors``.
+    """
+    stats = BatchStats()
+    chunks = iter_tied_chunks(lots, resolve_tie_point, chunk_size, stats.errors)
+
+    def deliver(batch):
+        stats.errors.extend(batch.errors)
+        write_chunk(batch)
+        stats.add(batch)
+        return progress is None or progress(stats) is not False
+
+    first = next(chunks, None)
+    second = next(chunks, None) if first is not None else None
+    if second is None or workers == 1:
+        # Small inputs are not worth the inter-process round trip
+        for chunk in itertools.chain([first] if first else [], [second] if second else [], chunks):
+            if not deliver(_compute_shard(chunk)):
+                break
+        stats.elapsed = time.perf_counter() - stats.started
+        return stats
+
+    pool = get_pool(workers)
+    max_in_flight = 2 * (workers or os.cpu_count() or 1)
+    pending = collections.deque()
+    for chunk in itertools.chain([first, second], chunks):
+        pending.append(pool.submit(_compute_shard, chunk))
+        if len(pending) >= max_in_flight and not deliver(pending.popleft().result()):
+            break
+    else:
+        while pending:
+            if not deliver(pending.popleft().result()):
+                break
+    for future in pending:
+        future.cancel()
+    stats.elapsed = time.perf_counter() - stats.started
+    return stats
+
+
+def compute_lots_parallel(lots, resolve_tie_point=None, workers=None, chunk_size=PARALLEL_CHUNK_SIZE):
+    """Compute lots across a process pool and return one merged LotBatch.
+
+    Tie points are resolved in this process, then lots are sharded into
+    chunks of ``chunk_size``. Workers run the traverse and the GEOS validity
+    check and send back coordinate arrays; the merged batch keeps input order.
+    Use run_batch instead when the input does not fit in memory.
+    """
+    results = []
+    stats = run_batch(lots, results.append, resolve_tie_point, workers, chunk_size)
+    batch = merge_batches(results)
+    batch.errors = stats.errors
+    return batch
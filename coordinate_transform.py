@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""Cached coordinate transforms between PRS92 zones, WGS84 and the map CRS.
+
+Transforms are created once per (source, destination) pair and reused, so
+transforming a tie point or a batch of lots never pays the setup cost
+again. Coordinates are transformed as whole arrays: with pyproj in one
+vectorized call, otherwise point by point through a cached
+QgsCoordinateTransform. CRSs are given by auth id ("EPSG:3123").
+
+pyproj transformers must not be shared between threads, so every thread
+keeps its own cache. pyproj and the QGIS fallback are imported when the
+first transform is created: pyproj would slow down QGIS startup, and the
+QGIS import keeps this module free of a Qt dependency.
+"""
+
+import functools
+import threading
+
+import numpy as np
+
+WGS84 = "EPSG:4326"
+# PRS92 Philippines zones I to V (central meridians 117 to 125 degrees east)
+PRS92_ZONES = {
+    1: "EPSG:3121",
+    2: "EPSG:3122",
+    3: "EPSG:3123",
+    4: "EPSG:3124",
+    5: "EPSG:3125",
+}
+
+# Transform functions per (source, destination), one cache per thread
+_CACHE = threading.local()
+
+
+@functools.lru_cache(maxsize=None)
+def transformer_class():
+    """Return pyproj's Transformer, or None if pyproj is not installed; imported once."""
+    try:
+        from pyproj import Transformer
+    except ImportError:
+        return None
+    return Transformer
+
+
+def _create_transform(source, destination):
+    """Return a function transforming x and y arrays from source to destination."""
+    Transformer = transformer_class()
+    if Transformer is not None:
+        # always_xy: easting/longitude first whatever the axis order of the CRS
+        return Transformer.from_crs(source, destination, always_xy=True).transform
+
+    from qgis.core import QgsCoordinateReferenceSystem, QgsCoordinateTransform, QgsPointXY, QgsProject
+    transform = QgsCoordinateTransform(
+        QgsCoordinateReferenceSystem(source), QgsCoordinateReferenceSystem(destination), QgsProject.instance())
+
+    def transform_arrays(x, y):
+        points = [transform.transform(QgsPointXY(px, py)) for px, py in zip(x.tolist(), y.tolist())]
+        return np.array([p.x() for p in points]), np.array([p.y() for p in points])
+    return transform_arrays
+
+
+def get_transform(source, destination):
+    """Return the cached transform function of a CRS pair for this thread."""
+    transforms = getattr(_CACHE, "transforms", None)
+    if transforms is None:
+        transforms = _CACHE.transforms = {}
+    key = (source, destination)
+    if key not in transforms:
+        transforms[key] = _create_transform(source, destination)
+    return transforms[key]
+
+
+def transform(x, y, source, destination):
+    """Transform coordinate arrays (eastings/longitudes, northings/latitudes).
+
+    Returns:
+        Tuple (x, y) of float64 arrays in the destination CRS.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if source == destination or not len(x):
+        return x.copy(), y.copy()
+    tx, ty = get_transform(source, destination)(x, y)
+    return np.asarray(tx, dtype=np.float64), np.asarray(ty, dtype=np.float64)
+
+
+def transform_point(x, y, source, destination):
+    """Transform one coordinate pair and return it as (x, y) floats."""
+    tx, ty = transform([x], [y], source, destination)
+    return float(tx[0]), float(ty[0])
+
+
+def transform_corners(corners, source, destination):
+    """Transform an (n, 2) array of (x, y) corners."""
+    corners = np.asarray(corners, dtype=np.float64)
+    x, y = transform(corners[:, 0], corners[:, 1], source, destination)
+    return np.column_stack([x, y])
+
@@ -1,23 +1,28 @@
 from qgis.PyQt import uic, QtWidgets
-from qgis.PyQt.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QFileDialog, QMessageBox, QTextEdit
-from qgis.PyQt.QtGui import QPixmap, QImage
-from qgis.PyQt.QtCore import Qt, QBuffer, QIODevice
+from qgis.PyQt.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QFileDialog, QMessageBox, QTextEdit, QProgressDialog
+from qgis.PyQt.QtGui import QPixmap, QImage, QImageReader, QPainter, QPen, QColor
+from qgis.PyQt.QtCore import Qt, QEvent, QRectF, QSettings, pyqtSignal
+from qgis.core import QgsApplication, QgsTask
+import hashlib
 import os
-import re
 import sys
 import webbrowser
-from io import BytesIO
 import cv2
 import numpy as np
 
+from .. import batch_ocr
+from .. import ocr_cache
+from .. import ocr_engine
+from .. import ocr_pipeline
+from .. import traverse
+
 # Try importing OCR-related modules with detailed error reporting
 OCR_ENABLED = False
 missing_modules = []
-TESSERACT_PATH = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
 
 def check_tesseract():
     """Check if Tesseract OCR is installed and accessible."""
-    if not os.path.exists(TESSERACT_PATH):
+    if not ocr_engine.available_engines():
         msg = QMessageBox()
         msg.setIcon(QMessageBox.Warning)
         msg.setWindowTitle("Tesseract OCR Not Found")
@@ -26,7 +31,8 @@ def check_tesseract():
             "Please install Tesseract OCR manually from:\n"
             "https://github.com/UB-Mannheim/tesseract/wiki\n\n"
             "After installing, ensure the folder is located at:\n"
-            "C:\\Program Files\\Tesseract-OCR\\tesseract.exe\n\n"
+            "C:\\Program Files\\Tesseract-OCR\\tesseract.exe\n"
+            "or that tesseract is on the PATH.\n\n"
             "Then restart QGIS."
         )
         
@@ -45,29 +51,11 @@ def check_tesseract():
 
 print("Starting OCR module imports...")
 
-try:
-    import pytesseract
-    if check_tesseract():
-        pytesseract.pytesseract.tesseract_cmd = TESSERACT_PATH
-        print("Successfully imported pytesseract")
-        print(f"Tesseract version: {pytesseract.get_tesseract_version()}")
-        # Set Tesseract path explicitly
-        pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
-    else:
-        raise Exception("Tesseract OCR not found")
-except ImportError as e:
+# The Tesseract engine itself is detected on first use (see ocr_engine),
+# so importing this module starts no tesseract process
+if ocr_engine.tesserocr is None and ocr_engine.pytesseract is None:
     missing_modules.append("pytesseract")
-    print(f"Failed to import pytesseract: {str(e)}")
-except Exception as e:
-    missing_modules.append("pytesseract")
-    print(f"Error with pytesseract: {str(e)}")
-
-try:
-    from PIL import Image
-    print("Successfully imported PIL.Image")
-except ImportError as e:
-    missing_modules.append("Pillow")
-    print(f"Failed to import PIL.Image: {str(e)}")
+    print("Failed to import pytesseract and tesserocr")
 
 try:
     import cv2
@@ -96,21 +84,161 @@ else:
 FORM_CLASS, _ = uic.loadUiType(os.path.join(
     os.path.dirname(os.path.dirname(__file__)), 'forms', 'TCT_OCR_Dialog.ui'))
 
+# QSettings key and default for the size cap of the OCR cache, in MB
+OCR_CACHE_SIZE_SETTING = "TitlePlotterPH/ocrCacheSizeMb"
+DEFAULT_OCR_CACHE_SIZE_MB = 500
+
+# Smallest drag on the preview, in pixels, that sets the region to read
+MIN_DRAG_PIXELS = 10
+
+# Progress bar text of each OCR stage
+STAGE_LABELS = {
+    "load": "Loading image... %p%",
+    "preprocess": "Preprocessing image... %p%",
+    "recognize": "Recognizing text... %p%",
+    "parse": "Reading bearings... %p%",
+}
+
+
+# QImage formats whose pixels qimage_to_array views as they are
+ARRAY_FORMATS = (QImage.Format_Grayscale8, QImage.Format_RGB32, QImage.Format_ARGB32,
+                 QImage.Format_ARGB32_Premultiplied)
+# Formats with a colour table, converted to grayscale when the table is gray
+PALETTE_FORMATS = (QImage.Format_Mono, QImage.Format_MonoLSB, QImage.Format_Indexed8)
+
+
+def array_image(image):
+    """Return a QImage in one of ARRAY_FORMATS, converting it only if needed."""
+    if image.format() in ARRAY_FORMATS:
+        return image
+    if image.format() in PALETTE_FORMATS and image.isGrayscale():
+        # Bilevel and gray scans stay one byte per pixel
+        return image.convertToFormat(QImage.Format_Grayscale8)
+    return image.convertToFormat(QImage.Format_RGB32)
+
+
+def qimage_to_array(image):
+    """Return a NumPy view of a QImage's pixels, without copying them.
+
+    image must be in one of ARRAY_FORMATS (see array_image). Grayscale
+    images give an (height, width) array, the others (height, width, 4)
+    BGRA: 32-bit pixels are 0xAARRGGBB words, stored B, G, R, A on
+    little-endian machines. The view shares the QImage's buffer, so the
+    QImage must be kept, and not modified, while the array is used.
+    """
+    # constBits does not detach the image, so the pixels are not copied
+    pointer = image.constBits()
+    pointer.setsize(image.bytesPerLine() * image.height())
+    rows = np.frombuffer(pointer, dtype=np.uint8).reshape(image.height(), image.bytesPerLine())
+    if image.format() == QImage.Format_Grayscale8:
+        # Rows are padded to 4 bytes
+        return rows[:, :image.width()]
+    pixels = rows.reshape(image.height(), -1, 4)[:, :image.width()]
+    return pixels if sys.byteorder == "little" else pixels[:, :, ::-1]
+
+
+def qimage_digest(image):
+    """Return the SHA-256 hex digest of a QImage's size, format and pixels."""
+    pointer = image.constBits()
+    pointer.setsize(image.bytesPerLine() * image.height())
+    digest = hashlib.sha256(f"{image.width()}x{image.height()}:{int(image.format())}".encode("ascii"))
+    digest.update(np.frombuffer(pointer, dtype=np.uint8))
+    return digest.hexdigest()
+
+
+class OcrTask(QgsTask):
+    """Read the bearings of one image in the QGIS task manager.
+
+    stage_changed carries each OCR stage as it starts. The result arrives
+    on the UI thread through ocr_finished (bearings, raw text), or
+    ocr_failed (error message); a cancelled task emits neither.
+    """
+
+    stage_changed = pyqtSignal(str)
+    ocr_finished = pyqtSignal(object, str)
+    ocr_failed = pyqtSignal(str)
+
+    def __init__(self, image, engine=None, region=None, cache=None, path=None):
+        """engine defaults to the shared one, started in the task; region
+        is the (x, y, width, height) to read, None for the whole image.
+        Results are looked up in and added to cache, keyed by the bytes of
+        the file at path or else the pixels of image."""
+        super(OcrTask, self).__init__("Reading TCT image", QgsTask.CanCancel)
+        self.image = image
+        self.engine = engine
+        self.region = region
+        self.cache = cache
+        self.path = path
+        self.result = None
+        self.error = None
+
+    def run(self):
+        """Run the OCR stages; called in a worker thread."""
+        try:
+            engine = self.engine or ocr_engine.get_engine()
+            source = None
+            if self.cache is not None:
+                source = ocr_cache.file_digest(self.path) if self.path else qimage_digest(self.image)
+            self.result = ocr_pipeline.run_ocr(
+                lambda: qimage_to_array(self.image), engine, self.report_stage, self.isCanceled, self.region,
+                self.cache, source)
+        except Exception as e:
+            self.error = str(e)
+            return False
+        return self.result is not None
+
+    def report_stage(self, stage):
+        self.setProgress(100.0 * ocr_pipeline.STAGES.index(stage) / len(ocr_pipeline.STAGES))
+        self.stage_changed.emit(stage)
+
+    def finished(self, result):
+        """Deliver the result; called on the UI thread."""
+        if result and not self.isCanceled():
+            bearings, raw_text, _ = self.result
+            self.ocr_finished.emit(bearings, raw_text)
+        elif self.error is not None:
+            self.ocr_failed.emit(self.error)
+
+
 class TCTOCRDialog(QDialog, FORM_CLASS):
-    def __init__(self, parent=None):
-        """Constructor."""
+    def __init__(self, parent=None, engine=None):
+        """Constructor.
+
+        engine is the OCR engine to use, by default the shared one from
+        ocr_engine.get_engine().
+        """
         super(TCTOCRDialog, self).__init__(parent)
         self.setupUi(self)
         
         # Store the parent dialog reference
         self.parent_dialog = parent
+        self.engine = engine
         
         # Initialize image data
         self.current_image = None
+        # File of the current image, None for a pasted image
+        self.current_path = None
+        # OCR results of images read before, see ocr_cache
+        self.cache = ocr_cache.get_cache()
+        self.cache.max_bytes = int(QSettings().value(OCR_CACHE_SIZE_SETTING, DEFAULT_OCR_CACHE_SIZE_MB)) * 1024 * 1024
+        # Running OCR task, if any
+        self.ocr_task = None
+        # Scaled copy of the image shown in the preview, and image pixels per preview pixel
+        self.preview_image = None
+        self.preview_scale = 1.0
+        # (x, y, width, height) in image pixels to read, None for the whole image
+        self.ocr_region = None
+        # Preview position where a region drag started
+        self.drag_start = None
+        self.imagePreview.installEventFilter(self)
         
         # Connect signals
         self.uploadButton.clicked.connect(self.upload_image)
         self.pasteButton.clicked.connect(self.paste_from_clipboard)
+        self.batchOcrButton.clicked.connect(self.batch_ocr)
+        self.detectRegionButton.clicked.connect(self.detect_region)
+        self.wholePageButton.clicked.connect(self.use_whole_page)
+        self.clearCacheButton.clicked.connect(self.clear_cache)
         self.doneButton.clicked.connect(self.process_image)
         self.cancelButton.clicked.connect(self.reject)
         
@@ -126,14 +254,18 @@ class TCTOCRDialog(QDialog, FORM_CLASS):
         if not OCR_ENABLED:
             self.uploadButton.setEnabled(False)
             self.pasteButton.setEnabled(False)
+            self.batchOcrButton.setEnabled(False)
             error_msg = f"OCR unavailable. Missing modules: {', '.join(missing_modules)}"
             self.uploadButton.setToolTip(error_msg)
             self.pasteButton.setToolTip(error_msg)
+            self.batchOcrButton.setToolTip(error_msg)
             print(error_msg)
         else:
             self.uploadButton.setEnabled(True)
             self.pasteButton.setEnabled(True)
+            self.batchOcrButton.setEnabled(True)
             print("OCR buttons enabled")
+        self.show_cache_stats()
 
     def upload_image(self):
         """Handle image upload from file."""
@@ -153,213 +285,219 @@ class TCTOCRDialog(QDialog, FORM_CLASS):
         image = clipboard.image()
         
         if not image.isNull():
-            self.current_image = image
-            self.display_image(image)
+            self.current_image = array_image(image)
+            self.current_path = None
+            self.display_image(self.current_image)
         else:
             QMessageBox.warning(self, "Error", "No image found in clipboard.")
 
     def load_image(self, file_path):
         """Load and display image from file."""
+        # Decode once; the same QImage is displayed and, through a view of its pixels, read
+        reader = QImageReader(file_path)
+        image = reader.read()
+        if image.isNull():
+            QMessageBox.critical(self, "Error", f"Failed to load image: {reader.errorString()}")
+            return
+        self.current_image = array_image(image)
+        self.current_path = file_path
+        self.display_image(self.current_image)
+
+    def batch_ocr(self):
+        """OCR many scanned titles into a JSONL file for Batch Plot.
+
+        Every file is one title; the pages of multi-page TIFFs and PDFs are
+        recognized in parallel and joined in page order.
+        """
+        file_names, _ = QFileDialog.getOpenFileNames(
+            self,
+            "Select Scanned Titles",
+            "",
+            "Scanned Titles (*.tif *.tiff *.pdf *.png *.jpg *.jpeg *.bmp)"
+        )
+        if not file_names:
+            return
+        output_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save Technical Descriptions",
+            os.path.join(os.path.dirname(file_names[0]), "technical_descriptions.jsonl"),
+            "Technical Descriptions (*.jsonl)"
+        )
+        if not output_path:
+            return
+
+        progress = QProgressDialog("Reading titles...", "Cancel", 0, 0, self)
+        progress.setWindowTitle("Batch OCR")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(500)
+
+        def report(stats):
+            progress.setLabelText(f"Reading titles...\n{stats}")
+            QgsApplication.processEvents()
+            return not progress.wasCanceled()
+
         try:
-            # Load image using PIL for OCR
-            self.current_image = Image.open(file_path)
-            
-            # Convert to QImage for display
-            qimage = QImage(file_path)
-            self.display_image(qimage)
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to load image: {str(e)}")
+            stats = batch_ocr.write_jsonl(file_names, output_path, progress=report, cache=self.cache)
+        except (OSError, ocr_engine.OcrError) as e:
+            progress.close()
+            QMessageBox.critical(self, "Batch OCR", f"Failed to read the titles: {e}")
+            return
+        progress.close()
+
+        message = f"Read {stats.titles} of {len(file_names)} titles into {output_path}.\n{stats}"
+        if stats.errors:
+            details = "\n".join(f"{os.path.basename(source)}: {error}" for source, error in stats.errors[:10])
+            message += f"\n{len(stats.errors)} errors:\n{details}"
+        message += "\n\nAdd the tie points to the file, then load it with Batch Plot."
+        self.show_cache_stats()
+        QMessageBox.information(self, "Batch OCR", message)
 
     def display_image(self, image):
-        """Display image in the preview area."""
-        pixmap = QPixmap.fromImage(image)
-        scaled_pixmap = pixmap.scaled(
+        """Display image in the preview area and find its technical description."""
+        self.preview_image = array_image(image.scaled(
             self.imagePreview.size(),
             Qt.KeepAspectRatio,
             Qt.SmoothTransformation
-        )
-        self.imagePreview.setPixmap(scaled_pixmap)
+        ))
+        # Image pixels per preview pixel
+        self.preview_scale = image.width() / max(1, self.preview_image.width())
+        self.detect_region()
+
+    def detect_region(self):
+        """Find the technical description on the preview and show it."""
+        self.ocr_region = None
+        if self.preview_image is not None and ocr_pipeline.cv2 is not None:
+            # The preview is large enough to find text blocks, and much faster than the full scan
+            region = ocr_pipeline.find_description_region(qimage_to_array(self.preview_image))
+            if region is not None:
+                self.ocr_region = tuple(int(round(v * self.preview_scale)) for v in region)
+        self.show_preview()
+
+    def use_whole_page(self):
+        """Read the whole image."""
+        self.ocr_region = None
+        self.show_preview()
+
+    def show_preview(self):
+        """Show the preview with the region to read outlined."""
+        if self.preview_image is None:
+            return
+        pixmap = QPixmap.fromImage(self.preview_image)
+        if self.ocr_region is not None:
+            painter = QPainter(pixmap)
+            painter.setPen(QPen(QColor(220, 0, 0), 2))
+            painter.drawRect(QRectF(*(v / self.preview_scale for v in self.ocr_region)))
+            painter.end()
+        self.imagePreview.setPixmap(pixmap)
+
+    def preview_position(self, pos):
+        """Return a position on the preview label in preview image pixels."""
+        x = pos.x() - (self.imagePreview.width() - self.preview_image.width()) / 2
+        y = pos.y() - (self.imagePreview.height() - self.preview_image.height()) / 2
+        return min(max(x, 0), self.preview_image.width()), min(max(y, 0), self.preview_image.height())
+
+    def drag_region(self, pos):
+        """Set the region to read from a drag on the preview."""
+        (x0, y0), (x1, y1) = self.drag_start, self.preview_position(pos)
+        if abs(x1 - x0) < MIN_DRAG_PIXELS or abs(y1 - y0) < MIN_DRAG_PIXELS:
+            return
+        self.ocr_region = tuple(int(round(v * self.preview_scale))
+                                for v in (min(x0, x1), min(y0, y1), abs(x1 - x0), abs(y1 - y0)))
+        self.show_preview()
+
+    def eventFilter(self, watched, event):
+        """Let the user drag the region to read on the preview."""
+        if watched is self.imagePreview and self.preview_image is not None and self.ocr_task is None:
+            if event.type() == QEvent.MouseButtonPress and event.button() == Qt.LeftButton:
+                self.drag_start = self.preview_position(event.pos())
+                return True
+            if event.type() in (QEvent.MouseMove, QEvent.MouseButtonRelease) and self.drag_start is not None:
+                self.drag_region(event.pos())
+                if event.type() == QEvent.MouseButtonRelease:
+                    self.drag_start = None
+                return True
+        return super(TCTOCRDialog, self).eventFilter(watched, event)
 
     def process_image(self):
-        """Process the image using OCR and extract bearing-distance data."""
+        """Start OCR of the image in a background task."""
         if not self.current_image:
             QMessageBox.warning(self, "Error", "No image to process.")
             return
+        if self.ocr_task is not None:
+            return
             
         # Hide raw OCR text box
         self.rawOcrTextEdit.hide()
 
-        try:
-            # Convert PIL Image to NumPy array first
-            if isinstance(self.current_image, QImage):
-                # Convert QImage to PIL Image using BytesIO
-                buffer = QBuffer()
-                buffer.open(QIODevice.WriteOnly)
-                self.current_image.save(buffer, "PNG")
-                bytes_io = BytesIO(buffer.data())
-                pil_image = Image.open(bytes_io)
-            else:
-                pil_image = self.current_image
-
-            # Convert PIL Image to NumPy array
-            img_np = np.array(pil_image)
-            
-            # Convert RGB to BGR for OpenCV if needed
-            if len(img_np.shape) == 3:
-                 img_np = cv2.cvtColor(img_np, cv2.COLOR_RGB2BGR)
-            elif len(img_np.shape) == 2:
-                 # If it's already grayscale, convert to BGR anyway for preprocess
-                 img_np = cv2.cvtColor(img_np, cv2.COLOR_GRAY2BGR)
-
-            # Extract bearing-distance data
-            bearings, raw_text = self.extract_bearings(img_np)
-            
-            if bearings:
-                print(f"Successfully extracted {len(bearings)} bearing lines.")
-                # Add bearings to parent dialog
-                self.add_bearings_to_parent(bearings)
-                self.accept()
-            else:
-                print("No bearing-distance data found after extraction.")
-                QMessageBox.warning(self, "Warning", "No bearing-distance data found in the image after parsing.")
-                # Show raw OCR text in the text edit
-                self.rawOcrTextEdit.setPlainText(raw_text)
-                self.rawOcrTextEdit.show()
-                
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to process image: {str(e)}")
-
-    def preprocess(self, image: np.ndarray) -> np.ndarray:
-        """Preprocess the image for better OCR results.
-        
-        Args:
-            image: Input image as numpy array
-            
-        Returns:
-            Preprocessed image as numpy array
-        """
-        # Grayscale
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        self.ocr_task = OcrTask(self.current_image, self.engine, self.ocr_region, self.cache, self.current_path)
+        self.ocr_task.progressChanged.connect(lambda value: self.ocrProgressBar.setValue(int(value)))
+        self.ocr_task.stage_changed.connect(self.show_ocr_stage)
+        self.ocr_task.ocr_finished.connect(self.ocr_finished)
+        self.ocr_task.ocr_failed.connect(self.ocr_failed)
+        self.ocr_task.taskCompleted.connect(self.ocr_task_ended)
+        self.ocr_task.taskTerminated.connect(self.ocr_task_ended)
+        self.set_ocr_running(True)
+        QgsApplication.taskManager().addTask(self.ocr_task)
 
-        # Thresholding
-        _, thresh = cv2.threshold(gray, 150, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    def set_ocr_running(self, running):
+        """Show the progress bar and lock the inputs while OCR runs."""
+        self.ocrProgressBar.setValue(0)
+        self.ocrProgressBar.setVisible(running)
+        for button in (self.uploadButton, self.pasteButton, self.batchOcrButton,
+                       self.detectRegionButton, self.wholePageButton, self.doneButton):
+            button.setEnabled(not running and (OCR_ENABLED or button is self.doneButton))
 
-        return thresh
+    def show_ocr_stage(self, stage):
+        """Show the OCR stage that has started."""
+        self.ocrProgressBar.setFormat(STAGE_LABELS[stage])
 
-    def extract_bearings(self, image):
-        """Extract bearing-distance data from OCR text using a tolerant regex and filter results."""
-        bearings = []
-        
-        # Preprocess image for better OCR
-        processed_img = self.preprocess(image)
-        
-        # Perform OCR with PSM mode 6 (Assume a single block of text)
-        raw_text = pytesseract.image_to_string(processed_img, config='--psm 6')
-        
-        # Log the raw input text for debugging
+    def ocr_finished(self, bearings, raw_text):
+        """Add the bearings read from the image, or show the raw text if there are none."""
         print("OCR raw text:", raw_text)
-        
-        # Pre-clean the OCR text
-        cleaned_text = raw_text.replace('%', '°') \
-                           .replace('’', "'") \
-                           .replace('o', '°') \
-                           .replace(',', '.') \
-                           .replace('O', '0') \
-                           .replace('|', '1') \
-                           .replace('"', '"') \
-                           .replace('°°', '°') \
-                           .replace('  ', ' ')
-
-        # Use a forgiving regex pattern to extract the lines
-        bearing_pattern = re.compile(
-            r"""
-            (?P<ns>[NS])                # N or S
-            [\s.]*                      # Optional spacing/dot
-            (?P<deg>\d{1,3})            # Degrees (changed to 1-3 digits)
-            [^\dA-Za-z]?[°%o]?[^\dA-Za-z]?  # Common OCR substitutions
-            (?P<min>\d{1,2})            # Minutes
-            [^\dA-Za-z]?[''7]?          # Common OCR substitutions for '
-            [\s.]*                      # Optional spacing
-            (?P<ew>[EW])                # E or W
-            [\s,]*                      # Optional spacing/comma
-            (?P<dist>\d+(\.\d+)?)       # Distance (e.g. 123.45)
-            [\s]*[mM]?                 # Optional 'm' or 'M'
-            """,
-            re.IGNORECASE | re.VERBOSE
-        )
-        
-        # Match all lines from OCR output
-        matches = bearing_pattern.findall(cleaned_text)
-
-        print(f"Found {len(matches)} bearing-distance matches.")
-
-        # Process matches and convert to desired format
-        for match in matches:
-            try:
-                direction_str, degrees_str, _, minutes_str, _, quadrant_str, dist_str, _ = match
-                
-                # Clean and validate extracted values
-                direction = direction_str.strip().upper()
-                quadrant = quadrant_str.strip().upper()
-                degrees = int(degrees_str.strip())
-                minutes = int(minutes_str.strip())
-                distance = float(dist_str.strip())
-                
-                # Enhanced validation with logging
-                if direction in ['N', 'S'] and quadrant in ['E', 'W']:
-                    # Allow 0-359 for degrees temporarily for better parsing, will validate against bearing rules later
-                    if 0 <= minutes <= 59:
-                        if distance > 0:
-                            bearing = {
-                                'direction': direction,
-                                'degrees': degrees, # Keep as int for now
-                                'minutes': minutes, # Keep as int for now
-                                'quadrant': quadrant,
-                                'distance': distance
-                            }
-                            bearings.append(bearing)
-                            print(f"✓ Valid bearing found: {direction} {degrees}° {minutes}' {quadrant} {distance}m")
-                        else:
-                            print(f"✗ Invalid distance: {distance}m")
-                    else:
-                        print(f"✗ Invalid minutes: {minutes}'")
-                else:
-                    print(f"✗ Invalid direction/quadrant: {direction}/{quadrant}")
-
-            except (ValueError, IndexError) as e:
-                print(f"✗ Error processing match {match}: {str(e)}")
-                continue
-
-        return bearings, raw_text
+        if bearings:
+            print(f"Successfully extracted {len(bearings)} bearing lines.")
+            # Add bearings to parent dialog
+            self.add_bearings_to_parent(bearings)
+            self.accept()
+        else:
+            print("No bearing-distance data found after extraction.")
+            QMessageBox.warning(self, "Warning", "No bearing-distance data found in the image after parsing.")
+            # Show raw OCR text in the text edit
+            self.rawOcrTextEdit.setPlainText(raw_text)
+            self.rawOcrTextEdit.show()
+
+    def ocr_failed(self, message):
+        """Report an OCR task that raised an error."""
+        QMessageBox.critical(self, "Error", f"Failed to process image: {message}")
+
+    def ocr_task_ended(self):
+        """Forget the finished or cancelled OCR task."""
+        self.ocr_task = None
+        self.set_ocr_running(False)
+        self.show_cache_stats()
+
+    def show_cache_stats(self):
+        """Show the hit and miss counts of the OCR cache."""
+        self.cacheStatsLabel.setText(f"OCR cache: {self.cache}")
+
+    def clear_cache(self):
+        """Remove all cached OCR results."""
+        self.cache.clear()
+        self.show_cache_stats()
+
+    def done(self, result):
+        """Cancel a running OCR task when the dialog closes."""
+        if self.ocr_task is not None:
+            self.ocr_task.cancel()
+        super(TCTOCRDialog, self).done(result)
 
     def add_bearings_to_parent(self, bearings):
         """Add extracted bearings to the parent dialog's bearing rows."""
         if not self.parent_dialog:
             return
             
-        # Clear existing rows except the first one
-        while self.parent_dialog.bearingListLayout.count() > 1:
-            row = self.parent_dialog.bearingListLayout.itemAt(1)
-            if row:
-                self.parent_dialog.remove_bearing_row(row.widget())
-        
-        # Add new bearing rows
-        for bearing in bearings:
-            self.parent_dialog.add_bearing_row()
-            row = self.parent_dialog.bearingListLayout.itemAt(
-                self.parent_dialog.bearingListLayout.count() - 1
-            ).widget()
-            
-            # Set values
-            row.directionInput.setText(bearing['direction'])
-            row.degreesInput.setText(str(bearing['degrees']))
-            row.minutesInput.setText(str(bearing['minutes']))
-            row.quadrantInput.setText(bearing['quadrant'])
-            row.distanceInput.setText(str(bearing['distance']))
-            
-        # Update preview
-        self.parent_dialog.generate_wkt()
+        # Load all lines in one pass with a single preview update
+        self.parent_dialog.set_bearing_rows(traverse.bearing_dicts_to_rows(bearings))
 
     def resizeEvent(self, event):
         """Handles resize event for the dialog."""
@@ -1,35 +1,212 @@
 # -*- coding: utf-8 -*-
 
 import os
-import pandas as pd
-import json
+import threading
+import numpy as np
 from qgis.PyQt import uic
-from qgis.PyQt.QtWidgets import QDialog, QTableWidgetItem, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QLabel, QHeaderView, QAbstractItemView, QComboBox
-from qgis.PyQt.QtCore import pyqtSignal, Qt
-
-# Load and normalize data at module level
-try:
-    json_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "resources", "tiepoints.json")
-    with open(json_path, "r") as f:
-        raw_data = json.load(f)
-    # Normalize key casing: "PROVINCE" → "Province"
-    normalized_data = [{k.title(): v for k, v in row.items()} for row in raw_data]
-    # Create DataFrame and clean data
-    _TIEPOINT_DF = pd.DataFrame(normalized_data)
-    
-    # For entries with null Municipality, use the Province value as the Municipality
-    _TIEPOINT_DF["Municipality"] = _TIEPOINT_DF.apply(
-        lambda row: row["Province"] if pd.isna(row["Municipality"]) else row["Municipality"], 
-        axis=1
+from qgis.PyQt.QtWidgets import QDialog, QHeaderView, QAbstractItemView, QMessageBox
+from qgis.PyQt.QtCore import pyqtSignal, Qt, QTimer, QObject, QAbstractTableModel, QModelIndex
+
+from .. import tiepoint_store
+from .. import coordinate_transform
+from .. import prs92_zones
+
+# Pause after the last keystroke before searching
+SEARCH_DELAY_MS = 150
+# Result rows delivered to the table at a time
+SEARCH_PAGE_SIZE = 500
+# Rows measured when sizing the result columns to their contents
+COLUMN_SIZE_SAMPLE = 200
+# Tie points listed by a nearest search
+NEAREST_COUNT = 20
+
+def tiepoint_data():
+    """Return the shared tie point store, loading it on first use.
+
+    An empty store is returned if the tie points cannot be loaded.
+    """
+    try:
+        return tiepoint_store.get_store()
+    except Exception as e:
+        print(f"Error loading tie points: {e}")
+        return tiepoint_store.TiePointStore(tiepoint_store.compile_records([]))
+
+# Normalized tie point name -> store ids, built on first lookup
+_TIEPOINT_NAME_INDEX = None
+
+def find_tie_point(name, province=None, municipality=None):
+    """Return (northing, easting) of the tie point with this name, or None.
+
+    Names are matched case and space insensitively. Province and municipality
+    narrow the match down; None is returned if no or several tie points match.
+    """
+    global _TIEPOINT_NAME_INDEX
+    store = tiepoint_data()
+    if not len(store):
+        return None
+    if _TIEPOINT_NAME_INDEX is None:
+        # Built once so batch lookups do not rescan the whole table per lot
+        _TIEPOINT_NAME_INDEX = {}
+        for index, tie_point_name in enumerate(store.column("name")):
+            _TIEPOINT_NAME_INDEX.setdefault(tie_point_name.replace(" ", "").lower(), []).append(index)
+
+    matches = _TIEPOINT_NAME_INDEX.get(str(name).replace(" ", "").lower(), [])
+    if province:
+        provinces = store.column("province")
+        matches = [i for i in matches if provinces[i].lower() == province.strip().lower()]
+    if municipality:
+        municipalities = store.column("municipality")
+        matches = [i for i in matches if municipalities[i].lower() == municipality.strip().lower()]
+    if len(matches) != 1:
+        return None
+    return float(store.northing[matches[0]]), float(store.easting[matches[0]])
+
+class TiePointResultModel(QAbstractTableModel):
+    """Search results shown straight from the tie point store.
+
+    The model only holds the store ids of the result rows; cell texts are
+    read from the store columns when the view paints them. Sorting reorders
+    the ids by the store's sort keys, and sorting by column -1 restores the
+    ranked order of the search. Results of a nearest search also show their
+    distance from the position searched near.
+    """
+    COLUMNS = ("Tie Point Name", "Description", "Province", "Municipality", "Northing", "Easting", "Distance (m)")
+    FIELDS = ("name", "description", "province", "municipality", "northing", "easting", "distance")
+    TOOLTIPS = (
+        "Name of the tie point (case and space insensitive)",
+        "Description of the tie point (partial match)",
+        "Province where the tie point is located (select from list)",
+        "Municipality where the tie point is located (partial match)",
+        "Northing coordinate of the tie point",
+        "Easting coordinate of the tie point",
+        "Distance from the position searched near",
     )
-    
-    # Remove rows with missing critical data
-    _TIEPOINT_DF.dropna(subset=["Tie Point Name", "Province"], inplace=True)
-    # Remove rows with empty strings in critical fields
-    _TIEPOINT_DF = _TIEPOINT_DF[_TIEPOINT_DF["Tie Point Name"].astype(str).str.strip() != ""]
-except Exception as e:
-    print(f"Error loading tie points: {e}")
-    _TIEPOINT_DF = pd.DataFrame()
+
+    def __init__(self, parent=None):
+        super(TiePointResultModel, self).__init__(parent)
+        self.store = None
+        self.ranked_ids = np.empty(0, dtype=np.int64)
+        self.ids = self.ranked_ids
+        self.sort_column = -1
+        self.sort_order = Qt.AscendingOrder
+        # Store id -> distance of the results of a nearest search
+        self.distances = None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation != Qt.Horizontal:
+            return section + 1 if role == Qt.DisplayRole else None
+        if role == Qt.DisplayRole:
+            return self.COLUMNS[section]
+        if role == Qt.ToolTipRole:
+            return self.TOOLTIPS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        tie_point = self.ids[index.row()]
+        field = self.FIELDS[index.column()]
+        if field == "distance":
+            return None if self.distances is None else f"{self.distances[int(tie_point)]:.1f}"
+        if field in ("northing", "easting"):
+            return str(float(self.store.arrays[field][tie_point]))
+        return self.store.column(field)[tie_point]
+
+    def set_ids(self, ids, distances=None):
+        """Show new results in their ranked order.
+
+        distances are the distances of the results of a nearest search.
+        """
+        self.beginResetModel()
+        self.store = tiepoint_data()
+        self.ranked_ids = np.asarray(ids, dtype=np.int64)
+        self.ids = self.ranked_ids
+        self.sort_column = -1
+        self.distances = None if distances is None else dict(zip(self.ranked_ids.tolist(), np.asarray(distances).tolist()))
+        self.endResetModel()
+
+    def append_ids(self, ids):
+        """Add the next page of results."""
+        if not len(ids):
+            return
+        self.ranked_ids = np.concatenate([self.ranked_ids, np.asarray(ids, dtype=np.int64)])
+        if self.sort_column >= 0:
+            # Sorted results take the new rows in their sorted places
+            self.sort(self.sort_column, self.sort_order)
+            return
+        self.beginInsertRows(QModelIndex(), len(self.ids), len(self.ranked_ids) - 1)
+        self.ids = self.ranked_ids
+        self.endInsertRows()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        self.sort_column, self.sort_order = column, order
+        if column < 0 or self.store is None:
+            self.ids = self.ranked_ids
+        else:
+            field = self.FIELDS[column]
+            if field == "distance":
+                keys = np.array([self.distances[i] for i in self.ranked_ids.tolist()] if self.distances is not None else np.zeros(len(self.ranked_ids)))
+            else:
+                keys = self.store.sort_key(field)[self.ranked_ids]
+            if order == Qt.DescendingOrder:
+                keys = -keys
+            self.ids = self.ranked_ids[np.argsort(keys, kind="stable")]
+        self.layoutChanged.emit()
+
+    def tie_point(self, row):
+        """Return the tie point shown in a row as a dict."""
+        return self.store.row(self.ids[row])
+
+class TiePointSearchWorker(QObject):
+    """Run tie point searches in a background thread.
+
+    Starting a search cancels the one still running. Pages of results are
+    delivered through page_ready, best matches first, and search_finished
+    follows the last page; both are queued to the UI thread and carry the
+    search generation so pages of an older search can be told apart.
+    """
+
+    page_ready = pyqtSignal(int, object)
+    search_finished = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super(TiePointSearchWorker, self).__init__(parent)
+        self.generation = 0
+        self._cancel_event = None
+
+    def start(self, **filters):
+        """Cancel the running search, start a new one and return its generation."""
+        self.cancel()
+        self.generation += 1
+        self._cancel_event = threading.Event()
+        thread = threading.Thread(target=self._run, args=(self.generation, self._cancel_event, filters),
+                                  name="tiepoint-search", daemon=True)
+        thread.start()
+        return self.generation
+
+    def cancel(self):
+        """Stop the running search at its next field lookup or page."""
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+
+    def _run(self, generation, cancel_event, filters):
+        try:
+            search = tiepoint_data().search_index()
+            for ids in search.search_pages(SEARCH_PAGE_SIZE, cancelled=cancel_event.is_set, **filters):
+                if cancel_event.is_set():
+                    return
+                self.page_ready.emit(generation, ids)
+            if not cancel_event.is_set():
+                self.search_finished.emit(generation)
+        except Exception as e:
+            print(f"Error searching tie points: {e}")
 
 # This loads your .ui file so that PyQt can populate your plugin with the elements from Qt Designer
 FORM_CLASS, _ = uic.loadUiType(os.path.join(
@@ -39,132 +216,268 @@ class TiePointSelectorDialog(QDialog, FORM_CLASS):
     # Signal to emit when a tie point is selected
     tie_point_selected = pyqtSignal(str, str)
 
-    def __init__(self, parent=None):
-        """Constructor."""
+    def __init__(self, parent=None, canvas=None, map_position=None, crs=None):
+        """Constructor.
+
+        canvas is the QGIS map canvas used to search near the map centre,
+        map_position an (x, y) in the map CRS to list the nearest tie points
+        of, and crs the auth id of the tie point coordinates: None for the
+        map CRS, prs92_zones.AUTO for the zone of each tie point.
+        """
         super(TiePointSelectorDialog, self).__init__(parent)
         self.setupUi(self)
+        self.canvas = canvas
+        self.crs = crs
+        # Set when the user asks to click the map; the caller then picks a point and reopens the selector
+        self.pick_requested = False
+        self.pending_map_position = map_position
+        # Searches run in a worker thread, started SEARCH_DELAY_MS after typing stops
+        self.search_worker = TiePointSearchWorker(self)
+        self.search_worker.page_ready.connect(self.show_result_page)
+        self.search_worker.search_finished.connect(self.finish_search)
+        self.search_generation = None
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.apply_filters)
+        self.result_model = TiePointResultModel(self)
+        self.tiePointTable.setModel(self.result_model)
         self.setup_connections()
         self.setup_table_headers()
+        # The tie points may still be loading in the background
+        self.tiepoint_loader = None
+        if tiepoint_store.is_loaded():
+            self.finish_loading()
+        else:
+            self.set_loading(True)
+            self.tiepoint_loader = tiepoint_store.load_in_background()
+            self.load_timer = QTimer(self)
+            self.load_timer.setInterval(100)
+            self.load_timer.timeout.connect(self.check_loaded)
+            self.load_timer.start()
+
+    def set_loading(self, loading):
+        """Disable searching and selecting while the tie points are loading."""
+        for widget in (self.searchButton, self.selectButton, self.provinceComboBox,
+                       self.nameInput, self.descriptionInput, self.municipalityInput,
+                       self.nearNorthingInput, self.nearEastingInput, self.nearestButton):
+            widget.setEnabled(not loading)
+        for widget in (self.mapCentreButton, self.pickOnMapButton):
+            widget.setEnabled(not loading and self.canvas is not None)
+        if loading:
+            self.statusLabel.setText("Status: Loading tie points...")
+
+    def check_loaded(self):
+        """Leave the loading state once the background load has finished."""
+        if tiepoint_store.is_loaded() or self.tiepoint_loader is None or not self.tiepoint_loader.is_alive():
+            self.load_timer.stop()
+            self.finish_loading()
+
+    def finish_loading(self):
+        """Fill the province filter and enable searching."""
         self.setup_province_combo()
-        # Initialize empty table
-        self.tiePointTable.setRowCount(0)
-        self.tiePointTable.setColumnCount(6)
-        self.tiePointTable.setHorizontalHeaderLabels([
-            "Tie Point Name", "Description", "Province", "Municipality", "Northing", "Easting"
-        ])
-        # Update status label
+        self.set_loading(False)
         self.statusLabel.setText("Status: No data loaded. Use search to find tie points.")
+        if self.pending_map_position:
+            self.find_nearest_map_position(*self.pending_map_position)
+        self.pending_map_position = None
 
     def setup_connections(self):
-        # Remove textChanged connections and add search button connection
+        # Filter as you type; the search button searches right away
         self.searchButton.clicked.connect(self.apply_filters)
-        self.tiePointTable.itemDoubleClicked.connect(self.accept_selection)
+        for line_edit in (self.nameInput, self.descriptionInput, self.municipalityInput):
+            line_edit.textChanged.connect(self.schedule_search)
+        self.provinceComboBox.currentIndexChanged.connect(self.schedule_search)
+        self.nearestButton.clicked.connect(self.find_nearest)
+        self.nearNorthingInput.returnPressed.connect(self.find_nearest)
+        self.nearEastingInput.returnPressed.connect(self.find_nearest)
+        self.mapCentreButton.clicked.connect(self.find_nearest_map_centre)
+        self.pickOnMapButton.clicked.connect(self.request_map_pick)
+        self.tiePointTable.doubleClicked.connect(self.accept_selection)
         self.selectButton.clicked.connect(self.accept_selection)
         self.cancelButton.clicked.connect(self.reject)
 
     def setup_province_combo(self):
         """Set up the province ComboBox with unique provinces"""
-        provinces = sorted(_TIEPOINT_DF["Province"].dropna().unique())
+        # The store keeps the distinct provinces sorted
+        provinces = tiepoint_data().categories("province").names
         self.provinceComboBox.addItem("")  # Blank = no filter
         self.provinceComboBox.addItems(provinces)
 
     def setup_table_headers(self):
-        """Set up table headers and tooltips"""
-        headers = ["Tie Point Name", "Description", "Province", "Municipality", "Northing", "Easting"]
-        self.tiePointTable.setColumnCount(len(headers))
-        self.tiePointTable.setHorizontalHeaderLabels(headers)
-
-        # Set header resize mode and enable sorting
+        """Set up table headers, sorting and selection"""
+        # Columns are sized once per search from a sample of rows, never from all of them
         header = self.tiePointTable.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        header.setResizeContentsPrecision(COLUMN_SIZE_SAMPLE)
+        # Keep the ranked order of the search until a column header is clicked
+        header.setSortIndicator(-1, Qt.AscendingOrder)
         self.tiePointTable.setSortingEnabled(True)
-
-        # Set tooltips for headers
-        tooltips = [
-            "Name of the tie point (case and space insensitive)",
-            "Description of the tie point (partial match)",
-            "Province where the tie point is located (select from list)",
-            "Municipality where the tie point is located (partial match)",
-            "Northing coordinate of the tie point",
-            "Easting coordinate of the tie point"
-        ]
-        for i, tooltip in enumerate(tooltips):
-            self.tiePointTable.horizontalHeaderItem(i).setToolTip(tooltip)
+        self.tiePointTable.verticalHeader().setDefaultSectionSize(self.tiePointTable.fontMetrics().height() + 6)
 
         # Allow single row selection
         self.tiePointTable.setSelectionMode(QAbstractItemView.SingleSelection)
         self.tiePointTable.setSelectionBehavior(QAbstractItemView.SelectRows)
 
-    def populate_table(self, df):
-        """Populate table with data from DataFrame"""
-        # Clear existing contents and reset row count
-        self.tiePointTable.clearContents()
-        self.tiePointTable.setRowCount(0)
-
-        # Set new row count and ensure column count
-        self.tiePointTable.setRowCount(len(df))
-        self.tiePointTable.setColumnCount(6)
-        self.tiePointTable.setHorizontalHeaderLabels([
-            "Tie Point Name", "Description", "Province", "Municipality", "Northing", "Easting"
-        ])
-
-        # Populate table with data
-        for row_idx, (_, row) in enumerate(df.iterrows()):
-            self.tiePointTable.setItem(row_idx, 0, QTableWidgetItem(str(row["Tie Point Name"])))
-            self.tiePointTable.setItem(row_idx, 1, QTableWidgetItem(str(row["Description"])))
-            self.tiePointTable.setItem(row_idx, 2, QTableWidgetItem(str(row["Province"])))
-            self.tiePointTable.setItem(row_idx, 3, QTableWidgetItem(str(row["Municipality"])))
-            self.tiePointTable.setItem(row_idx, 4, QTableWidgetItem(str(row["Northing"])))
-            self.tiePointTable.setItem(row_idx, 5, QTableWidgetItem(str(row["Easting"])))
-
+    def populate_table(self, ids):
+        """Replace the table contents with the tie points of the given store ids"""
+        self.tiePointTable.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.result_model.set_ids(ids)
         # Resize columns to content after populating
         self.tiePointTable.resizeColumnsToContents()
 
-        # Update status label
-        self.statusLabel.setText(f"Status: {len(df)} rows shown")
+    def append_rows(self, ids):
+        """Add the tie points of the given store ids below the current rows"""
+        self.result_model.append_ids(ids)
+
+    def current_filters(self):
+        """Return the search filters entered in the dialog"""
+        return {
+            "name": self.nameInput.text(),
+            "description": self.descriptionInput.text(),
+            "municipality": self.municipalityInput.text(),
+            "province": self.provinceComboBox.currentText().strip(),
+        }
+
+    def schedule_search(self, *args):
+        """Restart the search delay after an edit and drop the search still running"""
+        self.search_worker.cancel()
+        self.search_generation = None
+        if not any(value.strip() for value in self.current_filters().values()):
+            # Listing the whole database needs an explicit click on Search
+            self.search_timer.stop()
+            self.populate_table([])
+            self.statusLabel.setText("Status: No data loaded. Use search to find tie points.")
+            return
+        self.search_timer.start()
 
     def apply_filters(self):
-        """Apply filters based on input fields"""
-        name_filter = self.nameInput.text().replace(" ", "").lower()
-        description_filter = self.descriptionInput.text().strip().lower()
-        municipality_filter = self.municipalityInput.text().strip().lower()
-        province_filter = self.provinceComboBox.currentText().strip()
+        """Search the tie points with the entered filters in the background.
+
+        Name, description and municipality are ranked substring matches that
+        tolerate spacing, "No." and OCR slips such as 8 for B (see
+        tiepoint_search); the best matches come first.
+        """
+        self.search_timer.stop()
+        self.search_generation = self.search_worker.start(**self.current_filters())
+        self.result_pages = 0
+        self.statusLabel.setText("Status: Searching...")
+
+    def show_result_page(self, generation, ids):
+        """Show a page of results of the current search"""
+        if generation != self.search_generation:
+            return
+        if self.result_pages == 0:
+            self.populate_table(ids)
+        else:
+            self.append_rows(ids)
+        self.result_pages += 1
+        self.statusLabel.setText(f"Status: {self.result_model.rowCount()} rows shown, searching...")
+
+    def finish_search(self, generation):
+        """Show the row count once the current search has delivered all pages"""
+        if generation == self.search_generation:
+            self.search_generation = None
+            self.statusLabel.setText(f"Status: {self.result_model.rowCount()} rows shown")
+
+    def show_nearest(self, ids, distances, position):
+        """List the results of a nearest search, closest first"""
+        self.search_timer.stop()
+        self.search_worker.cancel()
+        self.search_generation = None
+        self.tiePointTable.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.result_model.set_ids(ids, distances)
+        self.tiePointTable.resizeColumnsToContents()
+        self.statusLabel.setText(f"Status: {len(ids)} tie points nearest to {position}")
 
-        df = _TIEPOINT_DF.copy()
+    def find_nearest(self):
+        """List the tie points nearest to the typed approximate coordinates"""
+        try:
+            # "," is a decimal separator, as everywhere else in the plugin
+            northing = float(self.nearNorthingInput.text().strip().replace(",", "."))
+            easting = float(self.nearEastingInput.text().strip().replace(",", "."))
+        except ValueError:
+            QMessageBox.warning(self, "Invalid Coordinates",
+                                "Please enter the approximate northing and easting as numbers, "
+                                "without thousands separators.")
+            return
+        crs = self.typed_coordinates_crs()
+        if crs is None:
+            return
+        ids, distances = tiepoint_data().nearest_in_crs(easting, northing, crs, NEAREST_COUNT)
+        self.show_nearest(ids, distances, f"N {northing:.3f}, E {easting:.3f}")
 
-        # Normalize name column for flexible matching
-        df["__name"] = df["Tie Point Name"].astype(str).str.replace(" ", "").str.lower()
+    def typed_coordinates_crs(self):
+        """Return the CRS of the typed approximate coordinates, or None after telling the user why not.
 
-        # Apply filters
-        if name_filter:
-            df = df[df["__name"].str.contains(name_filter)]
+        They are in the chosen zone, or else in the map CRS. With "Auto" the
+        zone of the coordinates is not known, so the map must be in a PRS92
+        zone; tie points of all zones are never compared in one grid.
+        """
+        if self.crs not in (None, prs92_zones.AUTO):
+            return self.crs
+        map_crs = self.canvas.mapSettings().destinationCrs().authid() if self.canvas is not None else None
+        if self.crs == prs92_zones.AUTO and prs92_zones.crs_zone(map_crs) == prs92_zones.UNKNOWN_ZONE:
+            QMessageBox.warning(self, "Unknown Zone",
+                                "The PRS92 zone of the coordinates is not known. Please choose the zone "
+                                "next to the tie point coordinates, or switch the map to a PRS92 zone.")
+            return None
+        if map_crs is None:
+            QMessageBox.warning(self, "Unknown Zone",
+                                "Please choose the PRS92 zone of the coordinates next to the tie point coordinates.")
+            return None
+        return map_crs if self.map_is_projected() else None
 
-        if description_filter:
-            df = df[df["Description"].astype(str).str.lower().str.contains(description_filter)]
+    def map_is_projected(self):
+        """Return True if map positions can be compared with tie point coordinates"""
+        if self.crs is None and self.canvas.mapSettings().destinationCrs().authid() == coordinate_transform.WGS84:
+            QMessageBox.warning(self, "Invalid Projection", "Please switch the map projection to a local coordinate system (not WGS84 / EPSG:4326).")
+            return False
+        return True
 
-        if municipality_filter:
-            df = df[df["Municipality"].astype(str).str.lower().str.contains(municipality_filter)]
+    def find_nearest_map_centre(self):
+        """List the tie points nearest to the centre of the map canvas"""
+        if self.canvas is None or not self.map_is_projected():
+            return
+        centre = self.canvas.extent().center()
+        self.find_nearest_map_position(centre.x(), centre.y())
 
-        if province_filter:
-            df = df[df["Province"] == province_filter]
+    def find_nearest_map_position(self, x, y):
+        """List the tie points nearest to a position in the map CRS"""
+        map_crs = self.canvas.mapSettings().destinationCrs().authid()
+        store = tiepoint_data()
+        if self.crs == prs92_zones.AUTO:
+            # Every tie point is compared in its own PRS92 zone
+            ids, distances = store.nearest_to_position(x, y, map_crs, NEAREST_COUNT)
+            self.show_nearest(ids, distances, "the map position")
+            return
+        easting, northing = x, y
+        if self.crs is not None:
+            easting, northing = coordinate_transform.transform_point(x, y, map_crs, self.crs)
+        self.nearEastingInput.setText(f"{easting:.3f}")
+        self.nearNorthingInput.setText(f"{northing:.3f}")
+        ids, distances = store.nearest_in_crs(easting, northing, self.crs or map_crs, NEAREST_COUNT)
+        self.show_nearest(ids, distances, f"N {northing:.3f}, E {easting:.3f}")
 
-        # Drop temporary columns
-        df = df.drop(columns=["__name"])
+    def request_map_pick(self):
+        """Close the selector so the caller can let the user click the map"""
+        if self.canvas is None or not self.map_is_projected():
+            return
+        self.pick_requested = True
+        self.reject()
 
-        self.populate_table(df)
+    def done(self, result):
+        """Stop searching when the dialog is closed"""
+        self.search_timer.stop()
+        self.search_worker.cancel()
+        self.search_generation = None
+        super(TiePointSelectorDialog, self).done(result)
 
     def accept_selection(self):
         """Handle selection of a tie point"""
-        current_row = self.tiePointTable.currentRow()
+        current_row = self.tiePointTable.currentIndex().row()
         if current_row >= 0:
-            self.selected_row = {
-                'name': self.tiePointTable.item(current_row, 0).text(),
-                'description': self.tiePointTable.item(current_row, 1).text(),
-                'province': self.tiePointTable.item(current_row, 2).text(),
-                'municipality': self.tiePointTable.item(current_row, 3).text(),
-                'northing': float(self.tiePointTable.item(current_row, 4).text()),
-                'easting': float(self.tiePointTable.item(current_row, 5).text())
-            }
+            self.selected_row = self.result_model.tie_point(current_row)
             self.accept()
 
     def get_selected_row(self):
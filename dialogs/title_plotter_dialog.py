@@ -1,11 +1,10 @@
 from qgis.PyQt import uic, QtWidgets
-from qgis.PyQt.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QWidget, QGraphicsScene, QGraphicsPolygonItem, QGraphicsLineItem, QSizePolicy, QMessageBox, QTableWidgetItem, QHeaderView, QAbstractItemView, QComboBox, QLabel
-from qgis.PyQt.QtGui import QPolygonF, QPen, QColor, QPainter, QIntValidator, QRegExpValidator
-from qgis.PyQt.QtCore import Qt, QPointF, pyqtSignal, QVariant, QBuffer, QIODevice, QRegExp
+from qgis.PyQt.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QWidget, QGraphicsScene, QGraphicsPolygonItem, QGraphicsLineItem, QSizePolicy, QMessageBox, QTableWidgetItem, QHeaderView, QAbstractItemView, QComboBox, QFileDialog, QProgressDialog, QStyledItemDelegate
+from qgis.PyQt.QtGui import QPen, QColor, QPainter, QIntValidator, QRegExpValidator
+from qgis.PyQt.QtCore import Qt, pyqtSignal, QVariant, QBuffer, QIODevice, QRegExp, QTimer, QSettings, QAbstractTableModel, QModelIndex
 import os
-import math
+import numpy as np
 from shapely.geometry import Polygon
-from math import sin, cos, radians
 from qgis.core import (
     QgsPointXY, 
     QgsGeometry, 
@@ -17,17 +16,16 @@ from qgis.core import (
     QgsFields,
     QgsField,
     QgsWkbTypes,
-    QgsApplication
+    QgsApplication,
+    QgsVectorFileWriter
 )
-from qgis.gui import QgsMapCanvas
+from qgis.gui import QgsMapCanvas, QgsMapToolEmitPoint
 from qgis.core import QgsFillSymbol
 
-# Attempt to import TiePointSelectorDialog, handle potential ImportError later if the file is missing
-try:
-    from .tie_point_selector_dialog import TiePointSelectorDialog
-except ImportError:
-    TiePointSelectorDialog = None
-    print("Warning: tie_point_selector_dialog.py not found. Tie point selection functionality will be disabled.")
+from .. import traverse
+from .. import batch_plotter
+from .. import coordinate_transform
+from .. import prs92_zones
 
 # Make sure shapely is installed in your QGIS environment
 # You might need to install it using QGIS's Python terminal or OSGeo4W shell:
@@ -48,271 +46,298 @@ except ImportError:
 FORM_CLASS, _ = uic.loadUiType(os.path.join(
     os.path.dirname(os.path.dirname(__file__)), 'forms', 'title_plotter_dialog_base.ui'))
 
+# QSettings key and default for the delay between the last edit and the preview refresh;
+# the key is set by hand in the QGIS advanced settings (see README)
+PREVIEW_DELAY_SETTING = "TitlePlotterPH/previewDelayMs"
+DEFAULT_PREVIEW_DELAY_MS = 150
+
+# CRS of each tiePointCrsComboBox entry; None is the map CRS, AUTO the zone of the tie point
+TIE_POINT_CRS_CHOICES = (prs92_zones.AUTO, None) + tuple(coordinate_transform.PRS92_ZONES.values())
+
 def bearing_to_azimuth(direction_ns, degrees, minutes, direction_ew):
     """Convert bearing to azimuth in degrees using Excel's method."""
-    angle = int(degrees) + int(minutes) / 60
-    if direction_ns == "N" and direction_ew == "E":
-        return angle
-    elif direction_ns == "S" and direction_ew == "E":
-        return 180 - angle
-    elif direction_ns == "S" and direction_ew == "W":
-        return 180 + angle
-    elif direction_ns == "N" and direction_ew == "W":
-        return 360 - angle
-    else:
+    if direction_ns not in ("N", "S") or direction_ew not in ("E", "W"):
         raise ValueError("Invalid bearing direction combination.")
+    return float(traverse.bearing_to_azimuth(direction_ns, int(degrees), int(minutes), direction_ew))
 
 def calculate_deltas(ns, deg, minute, ew, distance):
     """Calculate latitude and departure deltas for a single bearing line with correct signs."""
-    angle_degrees = deg + (minute / 60)
-    angle_radians = math.radians(angle_degrees)
-
-    delta_lat = distance * math.cos(angle_radians)
-    delta_dep = distance * math.sin(angle_radians)
-
-    # Apply sign based on direction
-    if ns.upper() == 'S':
-        delta_lat *= -1
-    if ew.upper() == 'W':
-        delta_dep *= -1
-
-    return round(delta_lat, 3), round(delta_dep, 3) # Round to 3 decimal places
-
-def generate_coordinates(tie_easting, tie_northing, bearing_rows):
-    """Generate coordinates using Excel's cumulative delta method."""
-    coords = []
-
-    current_e = tie_easting
-    current_n = tie_northing
-
-    for i, row in enumerate(bearing_rows):
-        try:
-            ns = row.directionInput.text().strip().upper()
-            deg = int(row.degreesInput.text().strip())
-            min_ = int(row.minutesInput.text().strip())
-            ew = row.quadrantInput.text().strip().upper()
-            dist = float(row.distanceInput.text().strip().replace(",", "."))
-            
-            # Validate degrees and minutes
-            if deg < 0 or deg > 90:
-                raise ValueError(f"Degrees must be between 0 and 90 (got {deg})")
-            if min_ < 0 or min_ > 59:
-                raise ValueError(f"Minutes must be between 0 and 59 (got {min_})")
-                
-        except Exception as e:
-            raise ValueError(f"Bearing row {i+1} has invalid input: {e}")
-
-        # Use the new calculate_deltas function
-        delta_lat, delta_dep = calculate_deltas(ns, deg, min_, ew, dist)
-
-        current_n += delta_lat
-        current_e += delta_dep
-
-        coords.append((current_e, current_n))
-
-    return coords
-
-class BearingRowWidget(QWidget):
-    """Widget for a single bearing input row with delta calculations."""
-    def __init__(self, parent=None, is_first_row=False):
-        super(BearingRowWidget, self).__init__(parent)
-        self.is_first_row = is_first_row
-        self.setup_ui()
-        
-    def setup_ui(self):
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(2)  # Reduced spacing between all elements
-
-        # Add Line Label
-        self.lineLabel = QLabel("")
-        self.lineLabel.setFixedWidth(60)
-        layout.addWidget(self.lineLabel)
-
-        # Create input fields
-        self.directionInput = QLineEdit()
-        self.degreesInput = QLineEdit()
-        self.minutesInput = QLineEdit()
-        self.quadrantInput = QLineEdit()
-        self.distanceInput = QLineEdit()
-
-        # Set properties
-        self.directionInput.setMaxLength(1)
-        self.degreesInput.setMaxLength(3) # Allow up to 3 digits for 0-90 (e.g., 90)
-        self.minutesInput.setMaxLength(2) # Allow up to 2 digits for 0-59 (e.g., 59)
-        self.quadrantInput.setMaxLength(1)
-
-        # Set fixed widths
-        self.directionInput.setFixedWidth(30)  # N/S
-        self.degreesInput.setFixedWidth(40)    # Deg
-        self.minutesInput.setFixedWidth(40)    # Min
-        self.quadrantInput.setFixedWidth(30)   # E/W
-        self.distanceInput.setFixedWidth(80)   # Distance
-
-        # Set placeholders
-        self.directionInput.setPlaceholderText("N/S")
-        self.degreesInput.setPlaceholderText("Deg")
-        self.minutesInput.setPlaceholderText("Min")
-        self.quadrantInput.setPlaceholderText("E/W")
-        self.distanceInput.setPlaceholderText("Distance")
-
-        # Add Validators
-        self.directionInput.setValidator(QRegExpValidator(QRegExp("^[NSns]$")))
-        # Use QIntValidator with ranges for degrees and minutes
-        self.degreesInput.setValidator(QIntValidator(0, 90, self))
-        self.minutesInput.setValidator(QIntValidator(0, 59, self))
-        self.quadrantInput.setValidator(QRegExpValidator(QRegExp("^[EWew]$")))
-
-        # Create delta labels
-        self.deltaLatLabel = QLabel("ΔLat: 0.000")
-        self.deltaDepLabel = QLabel("ΔDep: 0.000")
-        self.deltaLatLabel.setFixedWidth(80)
-        self.deltaDepLabel.setFixedWidth(80)
-
-        # Create buttons
-        self.add_btn = QPushButton("+")
-        self.remove_btn = QPushButton("-")
-        self.add_btn.setFixedWidth(30)
-        self.remove_btn.setFixedWidth(30)
-
-        # Add widgets to layout
-        layout.addWidget(self.directionInput)
-        layout.addWidget(self.degreesInput)
-        layout.addWidget(self.minutesInput)
-        layout.addWidget(self.quadrantInput)
-        layout.addWidget(self.distanceInput)
-        layout.addWidget(self.add_btn)
-        layout.addWidget(self.remove_btn)
-        
-        # Add a small spacer between remove button and delta labels
-        spacer = QWidget()
-        spacer.setFixedWidth(12)
-        layout.addWidget(spacer)
-        
-        layout.addWidget(self.deltaLatLabel)
-        layout.addWidget(self.deltaDepLabel)
-
-        # Connect signals
-        self.distanceInput.textChanged.connect(self.update_deltas)
-        self.directionInput.textChanged.connect(self.update_deltas) # Also update deltas on direction change
-        self.degreesInput.textChanged.connect(self.update_deltas) # Also update deltas on degrees change
-        self.minutesInput.textChanged.connect(self.update_deltas) # Also update deltas on minutes change
-        self.quadrantInput.textChanged.connect(self.update_deltas) # Also update deltas on quadrant change
-        
-        # Add validation signals
-        self.degreesInput.textChanged.connect(self.validate_degrees)
-        self.minutesInput.textChanged.connect(self.validate_minutes)
-        self.directionInput.textChanged.connect(self.auto_capitalize_direction)
-        self.quadrantInput.textChanged.connect(self.auto_capitalize_quadrant)
-        
-        self.add_btn.clicked.connect(self.parent().add_bearing_row)
-        
-        # Only connect remove button if not first row
-        if not self.is_first_row:
-            # Store reference to the dialog instance
-            dialog = self.parent()
-            if isinstance(dialog, TitlePlotterPhilippineLandTitlesDialog):
-                self.remove_btn.clicked.connect(lambda _, row=self: dialog.remove_bearing_row(row))
-        else:
-            self.remove_btn.setEnabled(False)
-
-        # Connect text changed signals to trigger WKT generation
-        for input_field in [self.directionInput, self.degreesInput, self.minutesInput, 
-                          self.quadrantInput, self.distanceInput]:
-            input_field.textChanged.connect(self.parent().generate_wkt)
-
-    def validate_degrees(self):
-        """Validate degrees input and update UI accordingly."""
+    delta_lat, delta_dep = traverse.calculate_deltas(ns.upper(), deg, minute, ew.upper(), distance)
+    return float(delta_lat), float(delta_dep)
+
+def load_tie_point_selector():
+    """Import the tie point selector module on first use.
+
+    The selector pulls in the tie point database and its search index, so it is not
+    imported with the plugin. Returns None if the module is missing.
+    """
+    try:
+        from . import tie_point_selector_dialog
+    except ImportError:
+        print("Warning: tie_point_selector_dialog.py not found. Tie point selection functionality will be disabled.")
+        return None
+    return tie_point_selector_dialog
+
+def lot_fields():
+    """Return the attribute fields of batch plotted lots."""
+    fields = QgsFields()
+    fields.append(QgsField("lot_id", QVariant.String))
+    fields.append(QgsField("tie_point", QVariant.String))
+    fields.append(QgsField("area", QVariant.Double))
+    fields.append(QgsField("misclosure", QVariant.Double))
+    return fields
+
+def create_lots_layer(crs_authid, name="Title Plot Batch", path=None, add_to_file=False):
+    """Create an empty polygon layer for batch plotted lots.
+
+    Without a path a memory layer is returned. With a path the lots go into a
+    GeoPackage, so large batches are written to disk instead of being held
+    in memory. add_to_file adds the layer to a GeoPackage written by an
+    earlier call instead of replacing the file.
+    """
+    if not path:
+        layer = QgsVectorLayer(f"Polygon?crs={crs_authid}", name, "memory")
+        layer.dataProvider().addAttributes(lot_fields().toList())
+        layer.updateFields()
+        return layer
+
+    options = QgsVectorFileWriter.SaveVectorOptions()
+    options.driverName = "GPKG"
+    options.layerName = name
+    if add_to_file:
+        options.actionOnExistingFile = QgsVectorFileWriter.CreateOrOverwriteLayer
+    writer = QgsVectorFileWriter.create(
+        path, lot_fields(), QgsWkbTypes.Polygon, QgsCoordinateReferenceSystem(crs_authid),
+        QgsProject.instance().transformContext(), options)
+    if writer.hasError() != QgsVectorFileWriter.NoError:
+        raise IOError(writer.errorMessage())
+    # Deleting the writer flushes and closes the new file
+    del writer
+    return QgsVectorLayer(f"{path}|layername={name}", name, "ogr")
+
+def add_lot_features(layer, batch):
+    """Add every lot of a computed LotBatch to a layer with one addFeatures call.
+
+    Lots whose polygon is not GEOS valid are left out and returned as
+    (lot_id, message) pairs.
+    """
+    features = []
+    invalid = []
+    for i, lot_id in enumerate(batch.lot_ids):
+        ring = [QgsPointXY(x, y) for x, y in batch.lot_corners(i).tolist()]
+        ring.append(ring[0])
+        geometry = QgsGeometry.fromPolygonXY([ring])
+        # Parallel batches arrive with validity already checked by the workers
+        is_valid = batch.valid[i] if batch.valid is not None else geometry.isGeosValid()
+        if not is_valid:
+            invalid.append((lot_id, "The generated polygon is not valid."))
+            continue
+        feature = QgsFeature(layer.fields())
+        feature.setGeometry(geometry)
+        # Set by name, GeoPackage layers have an extra fid field in front
+        feature.setAttribute("lot_id", lot_id)
+        feature.setAttribute("tie_point", batch.tie_points[i])
+        feature.setAttribute("area", round(float(batch.areas[i]), 3))
+        feature.setAttribute("misclosure", round(float(batch.misclosures[i]), 3))
+        features.append(feature)
+
+    layer.dataProvider().addFeatures(features)
+    return invalid
+
+# Typed inputs and computed deltas of one traverse line. Inputs are Python
+# strings, so pasted text of any length is kept as it is and a bad value is
+# shown and rejected instead of being silently cut to fit.
+LINE_DTYPE = np.dtype([
+    ("ns", "O"),
+    ("deg", "O"),
+    ("min", "O"),
+    ("ew", "O"),
+    ("distance", "O"),
+    ("delta_lat", "f8"),
+    ("delta_dep", "f8"),
+])
+INPUT_FIELDS = ("ns", "deg", "min", "ew", "distance")
+DELTA_FIELDS = ("delta_lat", "delta_dep")
+
+def empty_lines(count):
+    """Return count lines with empty inputs and zero deltas."""
+    lines = np.zeros(count, dtype=LINE_DTYPE)
+    for field in INPUT_FIELDS:
+        lines[field] = ""
+    return lines
+
+class BearingTableModel(QAbstractTableModel):
+    """Bearing lines of the technical description stored in one NumPy record array.
+
+    Each record holds the texts typed for N/S, degrees, minutes, E/W and
+    distance plus the computed deltas. The view only creates an editor for
+    the cell being edited, so no widgets are allocated per line.
+    """
+    COLUMNS = ("N/S", "Deg", "Min", "E/W", "Distance", "ΔLat", "ΔDep")
+    COLUMN_WIDTHS = (40, 45, 45, 40, 90, 90, 90)
+    PLACEHOLDERS = ("N/S", "Deg", "Min", "E/W", "Distance")
+
+    def __init__(self, parent=None):
+        super(BearingTableModel, self).__init__(parent)
+        self.lines = empty_lines(1)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.lines)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def line_label(self, row):
+        """Return the label of a line: the tie line, a course, or the closing line."""
+        if row == 0:
+            return "TP - 1"
+        elif row == len(self.lines) - 1:
+            return f"{row} - 1"
+        return f"{row} - {row+1}"
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.COLUMNS[section]
+        return self.line_label(section)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() < len(INPUT_FIELDS):
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def is_out_of_range(self, row, column):
+        """Return True if the degrees or minutes typed in a cell are not a whole number in range."""
+        limits = {1: 90, 2: 59}
+        text = self.lines[INPUT_FIELDS[column]][row] if column in limits else ""
+        if not text:
+            return False
         try:
-            value = int(self.degreesInput.text())
-            if value > 90:
-                self.degreesInput.setStyleSheet("background-color: #8b0000; color: white")
-                self.add_btn.setEnabled(False)
-            else:
-                self.degreesInput.setStyleSheet("")
-                self.add_btn.setEnabled(True)
+            return not 0 <= int(text) <= limits[column]
         except ValueError:
-            self.degreesInput.setStyleSheet("")
-            self.add_btn.setEnabled(True)
+            # Pasted text such as "123.456" is kept and flagged, not cut to fit
+            return True
 
-    def validate_minutes(self):
-        """Validate minutes input and update UI accordingly."""
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if column < len(INPUT_FIELDS):
+                return str(self.lines[INPUT_FIELDS[column]][row])
+            return f"{self.lines[DELTA_FIELDS[column - len(INPUT_FIELDS)]][row]:.3f}"
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role == Qt.BackgroundRole and self.is_out_of_range(row, column):
+            return QColor("#8b0000")
+        if role == Qt.ForegroundRole and self.is_out_of_range(row, column):
+            return QColor("white")
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole or index.column() >= len(INPUT_FIELDS):
+            return False
+        field = INPUT_FIELDS[index.column()]
+        text = str(value).strip()
+        # Auto-capitalize N/S and E/W
+        if field in ("ns", "ew"):
+            text = text.upper()
+        row = index.row()
+        if text == self.lines[field][row]:
+            return False
+        self.lines[field][row] = text
+        self.update_deltas(row, row + 1)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.COLUMNS) - 1))
+        return True
+
+    def insertRows(self, row, count, parent=QModelIndex()):
+        self.beginInsertRows(parent, row, row + count - 1)
+        self.lines = np.insert(self.lines, row, empty_lines(count))
+        self.endInsertRows()
+        # The closing line label moves to the new last row
+        self.headerDataChanged.emit(Qt.Vertical, 0, len(self.lines) - 1)
+        return True
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        # Keep at least one line
+        if count < 1 or count >= len(self.lines):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        self.lines = np.delete(self.lines, np.s_[row:row + count])
+        self.endRemoveRows()
+        self.headerDataChanged.emit(Qt.Vertical, 0, len(self.lines) - 1)
+        return True
+
+    def set_rows(self, rows):
+        """Replace all lines with (ns, deg, min, ew, distance) tuples in one model reset."""
+        rows = list(rows) or [("", "", "", "", "")]
+        lines = empty_lines(len(rows))
+        for field, values in zip(INPUT_FIELDS, zip(*rows)):
+            values = [str(value).strip() for value in values]
+            if field in ("ns", "ew"):
+                values = [value.upper() for value in values]
+            lines[field] = values
+
+        self.beginResetModel()
+        self.lines = lines
+        self.update_deltas()
+        self.endResetModel()
+
+    def line(self, row):
+        """Return the (ns, deg, min, ew, distance) texts of one line."""
+        return tuple(str(self.lines[field][row]) for field in INPUT_FIELDS)
+
+    def line_rows(self):
+        """Return the (ns, deg, min, ew, distance) texts of all lines."""
+        return self.lines[list(INPUT_FIELDS)].tolist()
+
+    def update_deltas(self, start=0, stop=None):
+        """Recompute the deltas of lines start:stop; incomplete or invalid lines get 0.000."""
+        lines = self.lines[start:stop]
+        lines["delta_lat"] = 0.0
+        lines["delta_dep"] = 0.0
+        rows = lines[list(INPUT_FIELDS)].tolist()
+        filled = [i for i, row in enumerate(rows) if all(row)]
         try:
-            value = int(self.minutesInput.text())
-            if value > 59:
-                self.minutesInput.setStyleSheet("background-color: #8b0000; color: white")
-                self.add_btn.setEnabled(False)
-            else:
-                self.minutesInput.setStyleSheet("")
-                self.add_btn.setEnabled(True)
+            delta_lat, delta_dep = traverse.calculate_deltas(
+                *traverse.parse_bearing_rows([rows[i] for i in filled]))
+            lines["delta_lat"][filled] = delta_lat
+            lines["delta_dep"][filled] = delta_dep
         except ValueError:
-            self.minutesInput.setStyleSheet("")
-            self.add_btn.setEnabled(True)
-
-    def auto_capitalize_direction(self):
-        """Auto-capitalize N/S input."""
-        text = self.directionInput.text().upper()
-        if text != self.directionInput.text():
-            self.directionInput.setText(text)
-
-    def auto_capitalize_quadrant(self):
-        """Auto-capitalize E/W input."""
-        text = self.quadrantInput.text().upper()
-        if text != self.quadrantInput.text():
-            self.quadrantInput.setText(text)
-
-    def reset_values(self):
-        """Reset all input values to empty and clear styles."""
-        self.directionInput.setText("")
-        self.degreesInput.setText("")
-        self.minutesInput.setText("")
-        self.quadrantInput.setText("")
-        self.distanceInput.setText("")
-        self.degreesInput.setStyleSheet("")
-        self.minutesInput.setStyleSheet("")
-        self.deltaLatLabel.setText("ΔLat: 0.000")
-        self.deltaDepLabel.setText("ΔDep: 0.000")
-        self.add_btn.setEnabled(True)
-
-    def update_deltas(self):
-        """Update delta values when all fields are filled."""
-        try:
-            # Check if all fields have values
-            if not all([
-                self.directionInput.text().strip(),
-                self.degreesInput.text().strip(),
-                self.minutesInput.text().strip(),
-                self.quadrantInput.text().strip(),
-                self.distanceInput.text().strip()
-            ]):
-                return
-
-            # Get values
-            ns = self.directionInput.text().strip().upper()
-            deg = int(self.degreesInput.text().strip())
-            min_ = int(self.minutesInput.text().strip())
-            ew = self.quadrantInput.text().strip().upper()
-            dist = float(self.distanceInput.text().strip().replace(",", "."))
-
-            # Additional validation for degrees and minutes
-            if deg < 0 or deg > 90:
-                self.degreesInput.setText("0")  # Reset to 0 if out of range
-                deg = 0
-            if min_ < 0 or min_ > 59:
-                self.minutesInput.setText("0")  # Reset to 0 if out of range
-                min_ = 0
-
-            # Calculate deltas using the updated function
-            delta_lat, delta_dep = calculate_deltas(ns, deg, min_, ew, dist)
-
-            # Update labels
-            self.deltaLatLabel.setText(f"ΔLat: {delta_lat:.3f}")
-            self.deltaDepLabel.setText(f"ΔDep: {delta_dep:.3f}")
-
-        except ValueError:
-            # Clear labels if calculation fails
-            self.deltaLatLabel.setText("ΔLat: 0.000")
-            self.deltaDepLabel.setText("ΔDep: 0.000")
+            # One bad line must not blank the others
+            for i in filled:
+                try:
+                    delta_lat, delta_dep = traverse.calculate_deltas(*traverse.parse_bearing_rows([rows[i]]))
+                except ValueError:
+                    continue
+                lines["delta_lat"][i] = delta_lat[0]
+                lines["delta_dep"][i] = delta_dep[0]
+
+class BearingItemDelegate(QStyledItemDelegate):
+    """Line edit editor with the length limit and validator of each bearing column."""
+
+    def createEditor(self, parent, option, index):
+        editor = QLineEdit(parent)
+        column = index.column()
+        editor.setPlaceholderText(BearingTableModel.PLACEHOLDERS[column])
+        if column == 0:
+            editor.setMaxLength(1)
+            editor.setValidator(QRegExpValidator(QRegExp("^[NSns]$"), editor))
+        elif column == 1:
+            # Allow up to 3 digits for 0-90 (e.g., 90)
+            editor.setMaxLength(3)
+            editor.setValidator(QIntValidator(0, 90, editor))
+        elif column == 2:
+            editor.setMaxLength(2)
+            editor.setValidator(QIntValidator(0, 59, editor))
+        elif column == 3:
+            editor.setMaxLength(1)
+            editor.setValidator(QRegExpValidator(QRegExp("^[EWew]$"), editor))
+        return editor
 
 class TitlePlotterPhilippineLandTitlesDialog(QDialog, FORM_CLASS):
     def __init__(self, iface, parent=None):
@@ -325,25 +350,58 @@ class TitlePlotterPhilippineLandTitlesDialog(QDialog, FORM_CLASS):
         self.labelWKT.setStyleSheet("background-color: #2b2b2b; color: #dcdcdc; padding: 6px;")
         self.labelWKT.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
 
-        # Initialize bearing rows list
-        self.bearing_rows = []
+        # Bearing lines live in one table model; the view creates an editor only for the edited cell
+        self.bearing_model = BearingTableModel(self)
+        self.bearingTableView.setModel(self.bearing_model)
+        self.bearingTableView.setItemDelegate(BearingItemDelegate(self.bearingTableView))
+        self.bearingTableView.setEditTriggers(
+            QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed | QAbstractItemView.AnyKeyPressed)
+        for column, width in enumerate(BearingTableModel.COLUMN_WIDTHS):
+            self.bearingTableView.setColumnWidth(column, width)
+        # Fixed row heights keep scrolling independent of the number of lines
+        self.bearingTableView.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.bearingTableView.verticalHeader().setMinimumWidth(60)
+        self.bearing_model.dataChanged.connect(self.lines_edited)
+        self.bearing_model.rowsInserted.connect(lambda *args: self.lines_restructured())
+        self.bearing_model.rowsRemoved.connect(lambda *args: self.lines_restructured())
+        self.bearing_model.modelReset.connect(self.lines_restructured)
+        self.addLineButton.clicked.connect(self.add_bearing_row)
+        self.removeLineButton.clicked.connect(self.remove_selected_rows)
+
+        # Bursts of edits are merged into one preview refresh once input goes quiet
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(self.preview_delay())
+        self.preview_timer.timeout.connect(self.refresh_preview)
+
+        # Per-line deltas and running corners, updated only for edited rows
+        self.traverse_cache = traverse.TraverseCache()
+        self._dirty_rows = set()
+        self._rows_restructured = True
+        self.tiePointNorthingInput.textChanged.connect(self.schedule_preview)
+        self.tiePointEastingInput.textChanged.connect(self.schedule_preview)
+        # Typed coordinates no longer belong to the selected tie point
+        self.tiePointNorthingInput.textEdited.connect(self.forget_tie_point)
+        self.tiePointEastingInput.textEdited.connect(self.forget_tie_point)
         
         # Connect signals
-        self.openTiePointDialogButton.clicked.connect(self.open_tiepoint_selector)
+        self.openTiePointDialogButton.clicked.connect(lambda: self.open_tiepoint_selector())
         self.plotButton.clicked.connect(self.plot_on_map)
 
         # --- Rearrange Layout --- 
         # Get references to widgets loaded from UI
         horizontalLayout_tiepoints = self.horizontalLayout # Northing/Easting layout
         technicalDescriptionLabel = self.technicalDescriptionLabel
-        scrollArea_bearings = self.scrollArea # Bearing inputs scroll area
+        bearingTable = self.bearingTableView # Bearing inputs table
+        lineButtonLayout = self.lineButtonLayout # Add/Remove Line buttons
         plotButton = self.plotButton
         # labelWKT is already referenced as self.labelWKT
 
         # Remove widgets from the original layout structure loaded by setupUi
         # They will be re-added in the desired order
         self.verticalLayout.removeWidget(technicalDescriptionLabel)
-        self.verticalLayout.removeWidget(scrollArea_bearings)
+        self.verticalLayout.removeWidget(bearingTable)
+        self.verticalLayout.removeItem(lineButtonLayout)
         self.verticalLayout.removeWidget(plotButton)
         self.verticalLayout.removeWidget(self.labelWKT) # Remove labelWKT to add it in order
         # Note: horizontalLayout_tiepoints might be the first item, leaving it might work, but explicitly adding gives control
@@ -359,6 +417,14 @@ class TitlePlotterPhilippineLandTitlesDialog(QDialog, FORM_CLASS):
             self.ocrButton.setEnabled(False)
             self.ocrButton.setToolTip("OCR unavailable. Required modules not installed.")
 
+        # Create the paste button for bearing lines copied from Excel or text
+        self.pasteLinesButton = QPushButton("Paste Lines")
+        self.pasteLinesButton.setToolTip("Replace the bearing lines with lines copied from Excel or a text document")
+        self.pasteLinesButton.clicked.connect(self.paste_bearing_rows)
+        input_button_layout = QHBoxLayout()
+        input_button_layout.addWidget(self.ocrButton)
+        input_button_layout.addWidget(self.pasteLinesButton)
+
         # Create a container for the preview canvas and zoom button
         preview_container = QWidget()
         preview_layout = QVBoxLayout(preview_container)
@@ -391,45 +457,37 @@ class TitlePlotterPhilippineLandTitlesDialog(QDialog, FORM_CLASS):
         self.newButton.setStyleSheet("background-color: #444; color: white; border-radius: 4px; font-size: 10pt;")
         self.newButton.clicked.connect(self.reset_plotter)
         button_layout.addWidget(self.newButton)
+
+        # Add Batch Plot button
+        self.batchPlotButton = QPushButton("Batch Plot")
+        self.batchPlotButton.setFixedSize(100, 24)
+        self.batchPlotButton.setStyleSheet("background-color: #444; color: white; border-radius: 4px; font-size: 10pt;")
+        self.batchPlotButton.setToolTip("Plot many lots from a CSV or JSONL file of technical descriptions")
+        self.batchPlotButton.clicked.connect(self.batch_plot)
+        button_layout.addWidget(self.batchPlotButton)
         
         # Add the button layout to the preview layout
         preview_layout.addLayout(button_layout)
 
         # Add widgets/layouts to the main vertical layout in the desired order
         self.verticalLayout.addLayout(horizontalLayout_tiepoints) # Northing/Easting
-        self.verticalLayout.addWidget(self.ocrButton) # Upload TCT Image Button
+        self.verticalLayout.addLayout(input_button_layout) # Upload TCT Image and Paste Lines Buttons
         self.verticalLayout.addWidget(technicalDescriptionLabel) # Technical Description Area Label
-        self.verticalLayout.addWidget(scrollArea_bearings) # Bearing Inputs
+        self.verticalLayout.addWidget(bearingTable) # Bearing Inputs
+        self.verticalLayout.addLayout(lineButtonLayout) # Add/Remove Line Buttons
         self.verticalLayout.addWidget(preview_container) # Polygon Preview Canvas
         self.verticalLayout.addWidget(self.labelWKT) # WKT Output Label
         self.verticalLayout.addWidget(plotButton) # Plot on Map Button
         # --- End Rearrange Layout ---
 
-        # Ensure bearingListLayout exists and is a QVBoxLayout (inside scrollArea_bearings)
-        # This is already handled by setupUi, but re-checking doesn't hurt
-        self.bearingListLayout = self.scrollAreaWidgetContents.layout()
-        if not isinstance(self.bearingListLayout, QVBoxLayout):
-             # This case should ideally not happen if UI is correctly set up
-            self.bearingListLayout = QVBoxLayout(self.scrollAreaWidgetContents)
-            self.bearingListLayout.setAlignment(Qt.AlignTop) # Ensure alignment
-            self.bearingListLayout.setContentsMargins(0,0,0,0) # Ensure margins
-            self.bearingListLayout.setSpacing(2) # Ensure spacing
-
-        # Set minimum height for the scroll area
-        # This is set in UI, but can be enforced here if needed
-        # self.scrollArea.setMinimumHeight(300)
-
-        # Set up initial row (this adds to bearingListLayout, which is inside scrollArea)
-        self.setup_initial_row()
-
         # Initialize tie point
         self.tie_point = None
 
         # Store the last generated WKT
         self.last_wkt = None
         
-        # Initialize preview layer (for the QgsMapCanvas)
-        self.preview_layer = None
+        # Initialize the preview layer (for the QgsMapCanvas), reused for every update
+        self.create_preview_layer()
 
         # Remove the old WKT output widget and Generate WKT button
         # These were removed in a previous step, keeping this check for safety
@@ -440,49 +498,70 @@ class TitlePlotterPhilippineLandTitlesDialog(QDialog, FORM_CLASS):
             self.generateWKTButton.setParent(None)
             self.generateWKTButton.deleteLater()
 
-    def setup_initial_row(self):
-        """Set up the initial bearing row."""
-        row = BearingRowWidget(self, is_first_row=True)
-        self.bearingListLayout.addWidget(row)
-        self.bearing_rows.append(row)
-        self.update_line_labels()
-
     def add_bearing_row(self):
-        """Add a new bearing input row."""
-        row = BearingRowWidget(self)
-        self.bearingListLayout.addWidget(row)
-        self.bearing_rows.append(row)
-        self.update_line_labels()
-
-    def remove_bearing_row(self, row_widget):
-        """Remove a bearing input row."""
-        if len(self.bearing_rows) > 1:  # Keep at least one row
-            self.bearingListLayout.removeWidget(row_widget)
-            row_widget.deleteLater()
-            self.bearing_rows.remove(row_widget)
-            self.update_line_labels()
-
-    def update_line_labels(self):
-        """Update the line labels based on their index."""
-        for i, row in enumerate(self.bearing_rows):
-            if i == 0:
-                row.lineLabel.setText("TP - 1")
-            elif i == len(self.bearing_rows) - 1:
-                row.lineLabel.setText(f"{i} - 1")
-            else:
-                row.lineLabel.setText(f"{i} - {i+1}")
+        """Append an empty bearing line and start editing it."""
+        row = self.bearing_model.rowCount()
+        self.bearing_model.insertRows(row, 1)
+        self.bearingTableView.setCurrentIndex(self.bearing_model.index(row, 0))
+        self.bearingTableView.edit(self.bearing_model.index(row, 0))
+
+    def remove_bearing_row(self, row):
+        """Remove the bearing line at the given row index."""
+        # Keep the tie line
+        if row > 0:
+            self.bearing_model.removeRows(row, 1)
+
+    def remove_selected_rows(self):
+        """Remove the selected bearing lines, or the current one if none is selected."""
+        rows = {index.row() for index in self.bearingTableView.selectionModel().selectedIndexes()}
+        if not rows and self.bearingTableView.currentIndex().isValid():
+            rows = {self.bearingTableView.currentIndex().row()}
+        # Remove from the bottom up so the remaining row indices stay valid
+        for row in sorted(rows, reverse=True):
+            self.remove_bearing_row(row)
+
+    def set_bearing_rows(self, rows, refresh=True):
+        """Replace all bearing lines with the given (ns, deg, min, ew, distance) tuples.
+
+        The model is reset once, so the view and the line labels are updated
+        once and the preview is recomputed once, unless refresh is False.
+        """
+        self.bearing_model.set_rows(rows)
+        self.preview_timer.stop()
+        self._dirty_rows.clear()
+        self._rows_restructured = True
+        if refresh:
+            self.generate_wkt()
+
+    def paste_bearing_rows(self):
+        """Load bearing lines copied from Excel or a text document.
+
+        Each clipboard line holds one bearing, either as five cells
+        (N/S, Deg, Min, E/W, Distance) or as text like "N 45 30 E 100.00".
+        """
+        text = QtWidgets.QApplication.clipboard().text()
+        rows = []
+        skipped = 0
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                rows.append(batch_plotter.parse_line(line))
+            except ValueError:
+                skipped += 1
+
+        if not rows:
+            QMessageBox.warning(self, "Paste Lines", "No bearing-distance lines found in the clipboard.")
+            return
+
+        self.set_bearing_rows(rows)
+        if skipped:
+            QMessageBox.information(self, "Paste Lines", f"Loaded {len(rows)} lines. {skipped} unrecognized lines were skipped.")
 
     def get_bearing_data(self):
         """Get all bearing data from the rows"""
         data = []
-        for row in self.bearing_rows:
-            row_layout = row.layout()
-            direction = row_layout.itemAt(0).widget().text().strip().upper()
-            degrees = row_layout.itemAt(1).widget().text().strip()
-            minutes = row_layout.itemAt(2).widget().text().strip()
-            quadrant = row_layout.itemAt(3).widget().text().strip().upper()
-            distance = row_layout.itemAt(4).widget().text().strip()
-            
+        for direction, degrees, minutes, quadrant, distance in self.bearing_model.line_rows():
             if all([direction, degrees, minutes, quadrant, distance]):
                 try:
                     data.append({
@@ -490,33 +569,18 @@ class TitlePlotterPhilippineLandTitlesDialog(QDialog, FORM_CLASS):
                         'degrees': int(degrees),
                         'minutes': int(minutes),
                         'quadrant': quadrant,
-                        'distance': float(distance)
+                        'distance': float(distance.replace(",", "."))
                     })
                 except ValueError:
                     continue
         return data
 
-    def draw_preview(self, coords):
-        """Draw the polygon preview on the QgsMapCanvas."""
-        if not coords or len(coords) < 2:
-            return
-
-        # Create a memory layer for the preview
+    def create_preview_layer(self):
+        """Create the long-lived preview layer and show it on the preview canvas."""
         self.preview_layer = QgsVectorLayer("Polygon?crs=EPSG:4326", "Preview Layer", "memory")
-        provider = self.preview_layer.dataProvider()
+        self.preview_fid = None
+        self.preview_geometry = None
 
-        # Create polygon geometry
-        polygon = QPolygonF([QPointF(x, y) for x, y in coords])
-        geometry = QgsGeometry.fromPolygonXY([[QgsPointXY(p.x(), p.y()) for p in polygon]])
-        
-        # Create and add feature
-        feature = QgsFeature()
-        feature.setGeometry(geometry)
-        provider.addFeatures([feature])
-        
-        # Update layer extent
-        self.preview_layer.updateExtents()
-        
         # Set consistent style for the preview layer
         symbol = QgsFillSymbol.createSimple({
             'color': '0,0,0,0',  # Transparent fill
@@ -524,87 +588,163 @@ class TitlePlotterPhilippineLandTitlesDialog(QDialog, FORM_CLASS):
             'outline_width': '2'
         })
         self.preview_layer.renderer().setSymbol(symbol)
-        self.preview_layer.triggerRepaint()
-        
-        # Set layer to canvas
         self.previewCanvas.setLayers([self.preview_layer])
-        self.previewCanvas.zoomToFeatureExtent(self.preview_layer.extent())
-        self.previewCanvas.refresh()
 
-    def generate_wkt(self):
-        """Generate WKT using Excel's coordinate calculation method."""
-        try:
-            # Get tie point coordinates
-            tie_n = float(self.tiePointNorthingInput.text().strip().replace(",", "."))
-            tie_e = float(self.tiePointEastingInput.text().strip().replace(",", "."))
+    def draw_preview(self, coords, first_changed=0):
+        """Draw the polygon preview on the QgsMapCanvas.
 
-            # Initialize coordinates list and current position
-            coords = []
-            current_n = tie_n
-            current_e = tie_e
+        The geometry of the single preview feature is updated in place: when
+        the corner count is unchanged only the vertices from first_changed on
+        are moved. The canvas only zooms when the polygon leaves the visible
+        extent.
+        """
+        if coords is None or len(coords) < 2:
+            return
 
-            # Process all bearing rows except the last one
-            for row in self.bearing_rows[:-1]:
-                try:
-                    # Get values from the row
-                    ns = row.directionInput.text().strip().upper()
-                    deg = int(row.degreesInput.text().strip())
-                    min_ = int(row.minutesInput.text().strip())
-                    ew = row.quadrantInput.text().strip().upper()
-                    dist = float(row.distanceInput.text().strip().replace(",", "."))
+        geometry = self.preview_geometry
+        # A closed ring repeats its first corner as the last vertex
+        if geometry is not None and first_changed > 0 and geometry.constGet().nCoordinates() == len(coords) + 1:
+            for i, (x, y) in enumerate(coords[first_changed:].tolist(), start=first_changed):
+                geometry.moveVertex(x, y, i)
+        else:
+            ring = [QgsPointXY(x, y) for x, y in coords.tolist()]
+            geometry = QgsGeometry.fromPolygonXY([ring])
+            self.preview_geometry = geometry
 
-                    # Calculate deltas
-                    delta_lat, delta_dep = calculate_deltas(ns, deg, min_, ew, dist)
+        provider = self.preview_layer.dataProvider()
+        if self.preview_fid is None:
+            feature = QgsFeature()
+            feature.setGeometry(geometry)
+            _, added = provider.addFeatures([feature])
+            self.preview_fid = added[0].id()
+        else:
+            provider.changeGeometryValues({self.preview_fid: geometry})
+
+        self.preview_layer.updateExtents()
+        self.preview_layer.triggerRepaint()
+
+        extent = geometry.boundingBox()
+        if not self.previewCanvas.extent().contains(extent):
+            self.previewCanvas.zoomToFeatureExtent(extent)
+        self.previewCanvas.refresh()
+
+    def clear_preview(self):
+        """Remove the polygon from the preview layer, keeping the layer itself."""
+        if self.preview_fid is not None:
+            self.preview_layer.dataProvider().deleteFeatures([self.preview_fid])
+            self.preview_fid = None
+            self.preview_geometry = None
+            self.preview_layer.updateExtents()
+            self.preview_layer.triggerRepaint()
+            self.previewCanvas.refresh()
 
-                    # Update current position
-                    current_n += delta_lat
-                    current_e += delta_dep
+    def preview_delay(self):
+        """Return the preview refresh delay in milliseconds from the settings."""
+        try:
+            return int(QSettings().value(PREVIEW_DELAY_SETTING, DEFAULT_PREVIEW_DELAY_MS))
+        except (TypeError, ValueError):
+            return DEFAULT_PREVIEW_DELAY_MS
+
+    def schedule_preview(self):
+        """Request a preview refresh; restarting the timer coalesces bursts of edits."""
+        self.preview_timer.start()
+
+    def lines_edited(self, top_left, bottom_right, roles=None):
+        """Remember which bearing lines were edited and schedule a refresh."""
+        self._dirty_rows.update(range(top_left.row(), bottom_right.row() + 1))
+        self.schedule_preview()
+
+    def lines_restructured(self):
+        """Schedule a full resynchronization after rows were added or removed."""
+        self._rows_restructured = True
+        self.schedule_preview()
+
+    def sync_traverse_cache(self):
+        """Push edited rows into the traverse cache; returns True if a line changed."""
+        # The last row is the closing line and does not move any corner
+        line_count = self.bearing_model.rowCount() - 1
+        if self._rows_restructured:
+            changed = self.traverse_cache.set_rows(self.bearing_model.line_rows()[:line_count])
+        else:
+            changed = False
+            for row in self._dirty_rows:
+                if row < line_count:
+                    changed |= self.traverse_cache.set_line(row, self.bearing_model.line(row))
+        self._dirty_rows.clear()
+        self._rows_restructured = False
+        return changed
+
+    def refresh_preview(self, force=False):
+        """Update the WKT and preview from the edited lines only.
+
+        Only the lines that changed are re-parsed and corners are recomputed
+        from the first changed line onwards. Nothing is redrawn when no
+        relevant input changed, unless force is set.
+        """
+        self.preview_timer.stop()
+        try:
+            rows_changed = self.sync_traverse_cache()
 
-                    # Add to coordinates list
-                    coords.append((current_e, current_n))
+            # Get tie point coordinates
+            try:
+                tie_n = float(self.tiePointNorthingInput.text().strip().replace(",", "."))
+                tie_e = float(self.tiePointEastingInput.text().strip().replace(",", "."))
+            except ValueError:
+                self.traverse_cache.clear_tie()
+                self.labelWKT.setText("Error: Invalid numeric input")
+                return
+            tie_changed = self.traverse_cache.set_tie(tie_e, tie_n)
+            if not (force or rows_changed or tie_changed):
+                return
 
-                except (ValueError, AttributeError) as e:
-                    return
+            first_changed = self.traverse_cache.first_changed
+            coords = self.traverse_cache.corners()
+            if coords is None:
+                # A line is incomplete or invalid, keep the last preview
+                return
 
             # Check if we have enough points for a polygon
             if len(coords) < 3:
                 self.labelWKT.setText("Insufficient points for a polygon (minimum 3)")
-                # Clear the preview layer as it's not a valid polygon
-                if self.preview_layer and self.preview_layer.isValid():
-                    QgsProject.instance().removeMapLayer(self.preview_layer)
-                    self.preview_layer = None
-                    self.previewCanvas.setLayers([])
-                    self.previewCanvas.refresh()
+                # Clear the preview as it's not a valid polygon
+                self.clear_preview()
                 return
 
-            # Create polygon and generate WKT
-            # Ensure coordinates are in (Easting, Northing) format for WKT
-            wkt_coords = ', '.join([f'{x} {y}' for x, y in coords])
-            # Add the starting point to close the polygon
-            if coords:
-                 wkt_coords += f', {coords[0][0]} {coords[0][1]}'
-
-            self.last_wkt = f"POLYGON (({wkt_coords}))"
+            # WKT (Easting, Northing) closed on the first corner, patched from the cached vertices
+            self.last_wkt = self.traverse_cache.wkt()
 
             # Update the WKT preview label
             self.labelWKT.setText(self.last_wkt)
 
             # Update visual preview (draw the polygon on the map canvas)
-            self.draw_preview(coords)
+            self.draw_preview(coords, first_changed)
 
-        except ValueError:
-            self.labelWKT.setText("Error: Invalid numeric input")
         except Exception as e:
             self.labelWKT.setText(f"An unexpected error occurred: {str(e)}")
 
-    def open_tiepoint_selector(self):
-        """Opens the tie point selection dialog."""
-        if TiePointSelectorDialog is None:
+    def generate_wkt(self):
+        """Generate WKT using Excel's coordinate calculation method."""
+        self._rows_restructured = True
+        self.refresh_preview(force=True)
+
+    def open_tiepoint_selector(self, map_position=None):
+        """Opens the tie point selection dialog.
+
+        map_position is an (x, y) in the map CRS whose nearest tie points are listed.
+        """
+        selector = load_tie_point_selector()
+        if selector is None:
             QtWidgets.QMessageBox.warning(self, "Dependency Missing", "The tie point selector dialog file (tie_point_selector_dialog.py) was not found.")
             return
 
-        dialog = TiePointSelectorDialog(self)
-        if dialog.exec_(): # exec_() returns QDialog.Accepted or QDialog.Rejected
+        canvas = self.iface.mapCanvas() if self.iface is not None else None
+        dialog = selector.TiePointSelectorDialog(self, canvas=canvas, map_position=map_position,
+                                                 crs=self.tie_point_crs_choice())
+        accepted = dialog.exec_() # exec_() returns QDialog.Accepted or QDialog.Rejected
+        if dialog.pick_requested:
+            self.pick_tie_point_position()
+            return
+        if accepted:
             selected_row = dialog.get_selected_row()
             if selected_row:
                 self.tie_point = selected_row
@@ -613,34 +753,32 @@ class TitlePlotterPhilippineLandTitlesDialog(QDialog, FORM_CLASS):
                 # Update preview after selecting a tie point
                 self.generate_wkt()
 
+    def pick_tie_point_position(self):
+        """Let the user click the map, then list the tie points nearest to the click."""
+        canvas = self.iface.mapCanvas()
+        self.previous_map_tool = canvas.mapTool()
+        self.pick_tool = QgsMapToolEmitPoint(canvas)
+        self.pick_tool.canvasClicked.connect(self.tie_point_position_picked)
+        canvas.setMapTool(self.pick_tool)
+        self.iface.messageBar().pushInfo("Title Plotter", "Click the map near the lot to find the nearest tie points.")
+
+    def tie_point_position_picked(self, point, button):
+        """Restore the previous map tool and reopen the selector near the clicked point."""
+        canvas = self.iface.mapCanvas()
+        if self.previous_map_tool is not None:
+            canvas.setMapTool(self.previous_map_tool)
+        else:
+            canvas.unsetMapTool(self.pick_tool)
+        self.iface.messageBar().clearWidgets()
+        self.open_tiepoint_selector(map_position=(point.x(), point.y()))
+
     def parse_bearing(self, direction, degrees, minutes, quadrant):
         """Parse bearing components into azimuth."""
         try:
-            # Convert to integers and validate
-            deg = int(degrees)
-            min_ = int(minutes)
-            
-            # Validate degrees and minutes
-            if deg < 0 or deg > 90:
-                raise ValueError(f"Degrees must be between 0 and 90 (got {deg})")
-            if min_ < 0 or min_ > 59:
-                raise ValueError(f"Minutes must be between 0 and 59 (got {min_})")
-                
-            # Calculate azimuth
-            angle = deg + (min_ / 60)
-            
-            if direction.upper() == "N" and quadrant.upper() == "E":
-                return angle
-            elif direction.upper() == "S" and quadrant.upper() == "E":
-                return 180 - angle
-            elif direction.upper() == "S" and quadrant.upper() == "W":
-                return 180 + angle
-            elif direction.upper() == "N" and quadrant.upper() == "W":
-                return 360 - angle
-            else:
-                raise ValueError(f"Invalid bearing direction combination: {direction}{quadrant}")
+            ns, deg, min_, ew, _ = traverse.parse_bearing_rows([(direction, degrees, minutes, quadrant, 0)])
         except ValueError as e:
             raise ValueError(f"Invalid bearing: {e}")
+        return float(traverse.bearing_to_azimuth(ns, deg, min_, ew)[0])
 
     def calculate_point(self, start_point, bearing_azimuth, distance):
         """Calculates the next point based on a starting point, azimuth, and distance.
@@ -652,109 +790,37 @@ class TitlePlotterPhilippineLandTitlesDialog(QDialog, FORM_CLASS):
             distance = float(str(distance).replace(",", "."))
             if bearing_azimuth is None or distance < 0:
                 return None
-                
-            # Convert azimuth from degrees to radians for trigonometric functions
-            azimuth_rad = math.radians(bearing_azimuth)
-            
-            # Calculate displacements (Easting is X, Northing is Y)
-            dx = distance * math.sin(azimuth_rad)
-            dy = distance * math.cos(azimuth_rad)
-            
-            next_x = start_point[0] + dx
-            next_y = start_point[1] + dy
-            
-            return (next_x, next_y)
-            
+
+            # Easting is X, Northing is Y
+            dx, dy = traverse.azimuth_deltas(bearing_azimuth, distance)
+            return (start_point[0] + float(dx), start_point[1] + float(dy))
+
         except ValueError:
             # Handle cases where distance conversion fails
             print(f"Invalid distance value: {distance}")
             return None
-        except Exception as e:
-             print(f"Error calculating point: {e}")
-             return None
-
-    def calculate_coordinates(self):
-        """Parses bearing/distance inputs from all rows and calculates the polygon coordinates.
-        Returns a list of (x, y) tuples or an empty list if inputs are invalid.
-        """
-        coords = []
-        try:
-            # Get starting tie point coordinates (Easting, Northing)
-            easting_text = self.tiePointEastingInput.text().strip().replace(",", ".")
-            northing_text = self.tiePointNorthingInput.text().strip().replace(",", ".")
-            
-            if not easting_text or not northing_text:
-                 self.wktOutput.setPlainText("Error: Tie point coordinates are required.")
-                 return []
-
-            start_easting = float(easting_text)
-            start_northing = float(northing_text)
-            current_point = (start_easting, start_northing)
-            coords.append(current_point)
-
-            # Iterate through bearing input rows
-            layout = self.bearingListLayout
-            if layout is None:
-                print("Error: bearingListLayout is not initialized.")
-                return []
-
-            for i in range(layout.count()):
-                row_item = layout.itemAt(i)
-                if row_item and row_item.widget():
-                    row_widget = row_item.widget()
-                    row_layout = row_widget.layout()
-                    
-                    if row_layout and row_layout.count() >= 5:
-                        # Get values from the QLineEdit widgets in the row
-                        direction = row_layout.itemAt(0).widget().text()
-                        degrees = row_layout.itemAt(1).widget().text()
-                        minutes = row_layout.itemAt(2).widget().text()
-                        quadrant = row_layout.itemAt(3).widget().text()
-                        # Normalize decimal separator in distance
-                        distance = row_layout.itemAt(4).widget().text().strip().replace(",", ".")
-
-                        # Check if essential fields are filled for this row
-                        if not any([direction, degrees, minutes, quadrant, distance]):
-                            continue
-                            
-                        if not all([direction, degrees, minutes, quadrant, distance]):
-                             self.wktOutput.setPlainText(f"Error: Incomplete bearing input in row {i+1}.")
-                             return []
-
-                        # Parse bearing and calculate the next point
-                        bearing_azimuth = self.parse_bearing(direction, degrees, minutes, quadrant)
-                        
-                        if bearing_azimuth is None:
-                             self.wktOutput.setPlainText(f"Error: Invalid bearing format in row {i+1}.")
-                             return []
-
-                        next_point = self.calculate_point(current_point, bearing_azimuth, distance)
-
-                        if next_point:
-                            coords.append(next_point)
-                            current_point = next_point
-                        else:
-                            self.wktOutput.setPlainText(f"Error: Invalid distance value in row {i+1}.")
-                            return []
-
-            return coords
-
-        except ValueError:
-            self.wktOutput.setPlainText("Error: Invalid numeric input found.")
-            return []
-        except Exception as e:
-            self.wktOutput.setPlainText(f"An unexpected error occurred during coordinate calculation: {e}")
-            return []
 
     def zoom_preview_to_layer(self):
         """Zoom the preview canvas to the extent of the preview layer."""
-        if self.preview_layer and self.preview_layer.isValid():
+        if self.preview_fid is not None:
             self.previewCanvas.setExtent(self.preview_layer.extent())
             self.previewCanvas.refresh()
 
     def plot_on_map(self):
         """Plot the polygon on the map canvas."""
-        if not self.last_wkt:
+        # The button takes focus from the table, which commits an edit whose
+        # preview refresh is still pending; plot the lines as they are now
+        if self.preview_timer.isActive():
+            self.preview_timer.stop()
+            self.refresh_preview()
+        if self.traverse_cache.tie is None:
+            QMessageBox.warning(self, "Error", "Please enter valid tie point coordinates.")
+            return
+        corners = self.traverse_cache.corners()
+        if corners is None:
+            QMessageBox.warning(self, "Error", "A bearing line is incomplete or invalid. Please check the lines.")
+            return
+        if len(corners) < 3 or not self.last_wkt:
             QMessageBox.warning(self, "Error", "No valid polygon to plot.")
             return
 
@@ -766,10 +832,11 @@ class TitlePlotterPhilippineLandTitlesDialog(QDialog, FORM_CLASS):
                 return
 
             canvas_crs = canvas.mapSettings().destinationCrs()
-
-            # Check if the canvas CRS is EPSG:4326 (WGS84)
-            if canvas_crs.authid() == "EPSG:4326":
-                QMessageBox.warning(self, "Invalid Projection", "Please switch the map projection to a local coordinate system (not WGS84 / EPSG:4326).")
+            tie_crs = self.lot_crs(canvas_crs.authid())
+            if tie_crs is None:
+                return
+            if tie_crs in coordinate_transform.PRS92_ZONES.values() and not prs92_zones.in_prs92_range(*self.traverse_cache.tie):
+                QMessageBox.warning(self, "Invalid Coordinates", "The tie point coordinates are outside the PRS92 grid range. Please check the northing and easting.")
                 return
 
             # Remove existing "Title Plot Preview" layer if it exists
@@ -787,8 +854,12 @@ class TitlePlotterPhilippineLandTitlesDialog(QDialog, FORM_CLASS):
             # Create and add feature
             feature = QgsFeature()
             
-            # Parse WKT and create geometry
-            geometry = QgsGeometry.fromWkt(self.last_wkt)
+            # Parse WKT and create geometry, moving the lot from the tie point CRS to the map
+            if tie_crs == canvas_crs.authid():
+                geometry = QgsGeometry.fromWkt(self.last_wkt)
+            else:
+                corners = coordinate_transform.transform_corners(corners, tie_crs, canvas_crs.authid())
+                geometry = QgsGeometry.fromWkt(traverse.polygon_wkt(corners.tolist()))
             
             # Validate geometry
             if not geometry or geometry.isEmpty():
@@ -826,11 +897,161 @@ class TitlePlotterPhilippineLandTitlesDialog(QDialog, FORM_CLASS):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to plot polygon: {str(e)}")
 
+    def forget_tie_point(self, *args):
+        """Drop the selected tie point once its coordinates are edited by hand."""
+        self.tie_point = None
+
+    def tie_point_crs_choice(self):
+        """Return the chosen tie point CRS: an auth id, prs92_zones.AUTO or None for the map CRS."""
+        return TIE_POINT_CRS_CHOICES[self.tiePointCrsComboBox.currentIndex()]
+
+    def lot_crs(self, map_crs, zone=None):
+        """Return the CRS a lot is traversed in, or None after a warning.
+
+        This is the CRS chosen for the tie point; with Auto, the PRS92 zone
+        of the selected tie point (or the given zone of a batch lot), and the
+        map CRS when it is not known. Bearings and distances need a
+        projected CRS, so a WGS84 map only works with a PRS92 zone.
+        """
+        tie_crs = self.tie_point_crs_choice()
+        if tie_crs == prs92_zones.AUTO:
+            if zone is None and self.tie_point:
+                zone = self.tie_point.get("zone")
+            tie_crs = prs92_zones.zone_crs(zone or prs92_zones.UNKNOWN_ZONE)
+        tie_crs = tie_crs or map_crs
+        if tie_crs == coordinate_transform.WGS84:
+            QMessageBox.warning(self, "Invalid Projection", "Please choose the PRS92 zone of the tie point or switch the map projection to a local coordinate system (not WGS84 / EPSG:4326).")
+            return None
+        return tie_crs
+
+    @staticmethod
+    def batch_to_map(batch, tie_crs, map_crs):
+        """Move the corners of a computed batch to the map CRS in one transform."""
+        if tie_crs != map_crs:
+            batch.corners = coordinate_transform.transform_corners(batch.corners, tie_crs, map_crs)
+        return batch
+
+    def batch_plot(self):
+        """Plot every lot of a CSV/JSONL file into a single layer.
+
+        With the Auto tie point CRS every lot is plotted in the PRS92 zone of
+        its province, into one layer per zone.
+        """
+        file_name, _ = QFileDialog.getOpenFileName(
+            self,
+            "Select Technical Descriptions",
+            "",
+            "Technical Descriptions (*.csv *.jsonl *.json)"
+        )
+        if not file_name:
+            return
+
+        canvas = self.iface.mapCanvas()
+        canvas_crs = canvas.mapSettings().destinationCrs()
+        map_crs = canvas_crs.authid()
+        by_zone = self.tie_point_crs_choice() == prs92_zones.AUTO
+        tie_crs = None
+        if not by_zone:
+            tie_crs = self.lot_crs(map_crs)
+            if tie_crs is None:
+                return
+
+        # Large batches can be written straight to a GeoPackage
+        output_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save Plotted Lots (Cancel for a temporary layer)",
+            os.path.splitext(file_name)[0] + ".gpkg",
+            "GeoPackage (*.gpkg)"
+        )
+
+        progress = QProgressDialog("Plotting lots...", "Cancel", 0, 0, self)
+        progress.setWindowTitle("Batch Plot")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(500)
+
+        def report(stats):
+            progress.setLabelText(f"Plotting lots...\n{stats}")
+            QgsApplication.processEvents()
+            return not progress.wasCanceled()
+
+        selector = load_tie_point_selector()
+        find_tie_point = selector.find_tie_point if selector is not None else None
+
+        invalid = []
+        # Output layer per CRS, created when its first lot arrives
+        layers = {}
+
+        def layer_for(crs, name):
+            if crs not in layers:
+                layers[crs] = create_lots_layer(crs, name=name, path=output_path or None, add_to_file=bool(layers))
+            return layers[crs]
+
+        def write_batch(batch):
+            if not by_zone:
+                invalid.extend(add_lot_features(layer_for(map_crs, "Title Plot Batch"), self.batch_to_map(batch, tie_crs, map_crs)))
+                return
+            for zone in np.unique(batch.zones).tolist():
+                lots = batch.take(np.flatnonzero(batch.zones == zone))
+                zone_crs = prs92_zones.zone_crs(zone)
+                if zone_crs is not None:
+                    invalid.extend(add_lot_features(layer_for(zone_crs, f"Title Plot Batch Zone {zone}"), lots))
+                elif map_crs != coordinate_transform.WGS84:
+                    # Lots of an unknown zone are taken to be in the map CRS, as without Auto
+                    invalid.extend(add_lot_features(layer_for(map_crs, "Title Plot Batch"), lots))
+                else:
+                    invalid.extend((lot_id, "Unknown PRS92 zone; set the province of the lot") for lot_id in lots.lot_ids)
+
+        try:
+            stats = batch_plotter.run_batch(
+                batch_plotter.read_lots(file_name),
+                write_batch,
+                find_tie_point,
+                progress=report,
+            )
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to plot batch: {str(e)}")
+            return
+        finally:
+            progress.close()
+
+        skipped = stats.errors + invalid
+        plotted = 0
+        extent = None
+        for layer in layers.values():
+            layer.updateExtents()
+            if not layer.featureCount():
+                continue
+            plotted += layer.featureCount()
+            QgsProject.instance().addMapLayer(layer)
+            layer.renderer().setSymbol(QgsFillSymbol.createSimple({
+                'color': '255,0,0,50',
+                'outline_color': 'red',
+                'outline_width': '1'
+            }))
+            layer.triggerRepaint()
+            layer_extent = canvas.mapSettings().layerExtentToOutputExtent(layer, layer.extent())
+            if extent is None:
+                extent = layer_extent
+            else:
+                extent.combineExtentWith(layer_extent)
+        if extent is not None:
+            canvas.setExtent(extent)
+            canvas.refresh()
+
+        message = f"Plotted {plotted} lots"
+        if len(layers) > 1:
+            message += f" into {len(layers)} layers, one per PRS92 zone"
+        message += f".\n{stats}"
+        if skipped:
+            details = "\n".join(f"{lot_id}: {error}" for lot_id, error in skipped[:10])
+            message += f"\n{len(skipped)} lots skipped:\n{details}"
+        QMessageBox.information(self, "Batch Plot", message)
+
     def open_ocr_dialog(self):
         """Open the OCR dialog for TCT image processing."""
         if not OCR_AVAILABLE:
             QMessageBox.warning(self, "OCR Unavailable", 
-                              "Required OCR modules (pytesseract, Pillow, opencv-python) are not installed.")
+                              "Required OCR modules (pytesseract or tesserocr, Pillow, opencv-python) are not installed.")
             return
             
         # Import check_tesseract function
@@ -854,19 +1075,13 @@ class TitlePlotterPhilippineLandTitlesDialog(QDialog, FORM_CLASS):
         self.tiePointEastingInput.setText("")
         self.tie_point = None
 
-        # Clear all bearing rows except the first one
-        while len(self.bearing_rows) > 1:
-            self.remove_bearing_row(self.bearing_rows[-1])
-
-        # Reset the first row
-        if self.bearing_rows:
-            self.bearing_rows[0].reset_values()
+        # Clear all bearing rows except the first one, which is emptied
+        self.set_bearing_rows([], refresh=False)
 
-        # Clear WKT and preview
+        # Clear WKT and preview; the cleared inputs need no refresh
+        self.preview_timer.stop()
+        self.sync_traverse_cache()
+        self.traverse_cache.clear_tie()
         self.labelWKT.setText("")
         self.last_wkt = None
-        if self.preview_layer and self.preview_layer.isValid():
-            QgsProject.instance().removeMapLayer(self.preview_layer)
-            self.preview_layer = None
-            self.previewCanvas.setLayers([])
-            self.previewCanvas.refresh() 
\ No newline at end of file
+        self.clear_preview() 
\ No newline at end of file
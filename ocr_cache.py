@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""Content-addressed on-disk cache of OCR results.
+
+Two kinds of entries are kept, each in a file named after its key:
+preprocessed page images (PNG) and raw OCR text. Keys are hashes of the
+scan's bytes and of everything that changes the result (region, page,
+preprocessing, engine and its settings; see ocr_pipeline.cache_keys), so
+an entry never needs invalidating: a changed scan or setting simply has
+another key. Re-reading a scan after a parser fix only re-runs
+parse_bearings over the cached text.
+
+The cache is capped in bytes. Reading an entry marks it as recently used
+through its modification time and the least recently used entries are
+removed when the cap is exceeded. Files are written atomically, so batch
+OCR worker processes can share the directory; an entry that cannot be
+decoded anyway (e.g. damaged on disk) is removed and counted as a miss.
+Hits, misses and evictions are counted per process. This module has no Qt
+dependency.
+"""
+
+import functools
+import hashlib
+import os
+import threading
+
+import numpy as np
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+# Eviction removes entries until the cache is this fraction of its cap
+EVICT_TO = 0.8
+
+TEXT_SUFFIX = ".txt"
+IMAGE_SUFFIX = ".png"
+
+
+def default_directory():
+    """Return the per-user cache directory of the plugin."""
+    base = (os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+            or os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(base, "TitlePlotterPH", "ocr")
+
+
+@functools.lru_cache(maxsize=256)
+def _file_digest(path, size, mtime):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_digest(path):
+    """Return the SHA-256 hex digest of a file's bytes, hashed once per version of the file."""
+    stat = os.stat(path)
+    return _file_digest(os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+
+class OcrCache:
+    """Capped LRU cache of preprocessed images and OCR text in a directory."""
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or default_directory()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Bytes on disk, counted on first write
+        self._size = None
+        self._lock = threading.Lock()
+
+    def _path(self, key, suffix):
+        return os.path.join(self.directory, key[:2], key + suffix)
+
+    def _read(self, key, suffix, read):
+        """Return read(path) of an entry, or None; read raises ValueError for a corrupt entry."""
+        path = self._path(key, suffix)
+        try:
+            value = read(path)
+            # Mark as recently used
+            os.utime(path)
+        except OSError:
+            value = None
+        except ValueError:
+            value = None
+            self._remove(path)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def _write(self, key, suffix, data):
+        path = self._path(key, suffix)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(data)
+        try:
+            # A rewritten entry replaces the bytes of the old one
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+        os.replace(temporary, path)
+        with self._lock:
+            if self._size is None:
+                self._size = self.size()
+            else:
+                self._size += len(data) - replaced
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _remove(self, path):
+        """Remove a corrupt entry."""
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            if self._size is not None:
+                self._size -= size
+
+    def get_text(self, key):
+        """Return the cached OCR text of a key, or None."""
+        def read(path):
+            # A damaged file raises UnicodeDecodeError, a ValueError
+            with open(path, encoding="utf-8") as f:
+                return f.read()
+        return self._read(key, TEXT_SUFFIX, read)
+
+    def put_text(self, key, text):
+        self._write(key, TEXT_SUFFIX, text.encode("utf-8"))
+
+    def get_image(self, key):
+        """Return the cached preprocessed image of a key, or None."""
+        def read(path):
+            with open(path, "rb") as f:
+                data = np.frombuffer(f.read(), dtype=np.uint8)
+            try:
+                image = cv2.imdecode(data, cv2.IMREAD_UNCHANGED)
+            except cv2.error as e:
+                raise ValueError(str(e))
+            if image is None:
+                raise ValueError(f"Cannot decode {path}")
+            return image
+        return self._read(key, IMAGE_SUFFIX, read)
+
+    def put_image(self, key, image):
+        # Thresholded pages are mostly runs of one value and compress well as PNG
+        ok, data = cv2.imencode(IMAGE_SUFFIX, image)
+        if ok:
+            self._write(key, IMAGE_SUFFIX, data.tobytes())
+
+    def _entries(self):
+        """Return (mtime, size, path) of every cache file."""
+        entries = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith((TEXT_SUFFIX, IMAGE_SUFFIX)):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size(self):
+        """Return the bytes on disk of all entries."""
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """Remove the least recently used entries down to EVICT_TO of the cap."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= EVICT_TO * self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+        self._size = total
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            for _, _, path in self._entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._size = 0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __str__(self):
+        return (f"{self.hits} hits, {self.misses} misses ({100 * self.hit_rate:.0f}% hit rate), "
+                f"{self.evictions} evicted")
+
+
+# Shared caches by directory
+_CACHES = {}
+
+
+def get_cache(directory=None):
+    """Return the shared OCR cache of a directory (by default the user's), created on first use."""
+    directory = directory or default_directory()
+    if directory not in _CACHES:
+        _CACHES[directory] = OcrCache(directory)
+    return _CACHES[directory]
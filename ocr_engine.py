@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""OCR engines that turn preprocessed title scans into text.
+
+All backends share one interface, ``recognize(image) -> text``:
+
+- TesserocrEngine keeps a Tesseract API with its language model loaded in
+  this process, so a page costs only the recognition itself.
+- CliEngine runs the tesseract executable through pytesseract, which
+  writes a temporary image, starts a process and loads the language model
+  again for every page.
+- StubEngine returns fixed text without Tesseract, for tests.
+
+get_engine returns one shared engine, the in-process one when tesserocr
+is installed. What is installed (packages, the executable and its
+version) is detected once per session on first use, never at import, so
+importing the OCR dialog starts no process. This module has no Qt
+dependency.
+"""
+
+import functools
+import hashlib
+import os
+import shutil
+import threading
+
+import numpy as np
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+
+# Default install location of the UB Mannheim Windows build
+WINDOWS_TESSERACT_PATH = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+DEFAULT_LANGUAGE = "eng"
+# Page segmentation mode 6: assume a single uniform block of text
+DEFAULT_PSM = 6
+
+
+class OcrError(Exception):
+    """Raised when no OCR engine can be started."""
+
+
+@functools.lru_cache(maxsize=None)
+def tesseract_path():
+    """Return the path of the tesseract executable, or None if it is not installed."""
+    found = shutil.which("tesseract")
+    if found:
+        return found
+    if os.path.exists(WINDOWS_TESSERACT_PATH):
+        return WINDOWS_TESSERACT_PATH
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def tesseract_version():
+    """Return the Tesseract version as a string, or None if it is not available.
+
+    With only the executable installed this runs ``tesseract --version``
+    once per session.
+    """
+    if tesserocr is not None:
+        # "tesseract 5.3.0\n leptonica-1.82.0\n ..."
+        return tesserocr.tesseract_version().split()[1]
+    if pytesseract is not None and tesseract_path() is not None:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_path()
+        try:
+            return str(pytesseract.get_tesseract_version())
+        except (pytesseract.TesseractNotFoundError, OSError):
+            return None
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def available_engines():
+    """Return the names of the engines usable in this session, fastest first."""
+    names = []
+    if tesserocr is not None:
+        names.append(TesserocrEngine.name)
+    if pytesseract is not None and tesseract_path() is not None:
+        names.append(CliEngine.name)
+    return tuple(names)
+
+
+def image_digest(image):
+    """Return the SHA-1 hex digest of an image array's shape and pixels."""
+    image = np.ascontiguousarray(image)
+    digest = hashlib.sha1(str((image.shape, image.dtype.str)).encode("ascii"))
+    digest.update(image.data)
+    return digest.hexdigest()
+
+
+class OcrEngine:
+    """Base class of the OCR backends."""
+
+    name = None
+
+    def __init__(self, language=DEFAULT_LANGUAGE, psm=DEFAULT_PSM):
+        self.language = language
+        self.psm = psm
+
+    @property
+    def key(self):
+        """Return a string identifying the engine, its version and its settings."""
+        return f"{self.name}:{self.version()}:{self.language}:psm{self.psm}"
+
+    def version(self):
+        return tesseract_version()
+
+    def recognize(self, image):
+        """Return the text of a grayscale or BGR uint8 image array."""
+        raise NotImplementedError
+
+    def close(self):
+        """Release the resources held by the engine."""
+
+
+class TesserocrEngine(OcrEngine):
+    """In-process Tesseract that keeps its language model loaded.
+
+    A Tesseract API recognizes one image at a time, so calls from several
+    threads are serialized; batch OCR uses one engine per process.
+    """
+
+    name = "tesserocr"
+
+    def __init__(self, language=DEFAULT_LANGUAGE, psm=DEFAULT_PSM):
+        super().__init__(language, psm)
+        # Raises RuntimeError when the language data cannot be loaded
+        self._api = tesserocr.PyTessBaseAPI(lang=language, psm=psm)
+        self._lock = threading.Lock()
+
+    def recognize(self, image):
+        image = np.ascontiguousarray(image, dtype=np.uint8)
+        height, width = image.shape[:2]
+        channels = 1 if image.ndim == 2 else image.shape[2]
+        with self._lock:
+            self._api.SetImageBytes(image.tobytes(), width, height, channels, width * channels)
+            return self._api.GetUTF8Text()
+
+    def close(self):
+        with self._lock:
+            self._api.End()
+
+
+class CliEngine(OcrEngine):
+    """The tesseract executable, started once per image through pytesseract."""
+
+    name = "cli"
+
+    def __init__(self, language=DEFAULT_LANGUAGE, psm=DEFAULT_PSM):
+        super().__init__(language, psm)
+        path = tesseract_path()
+        if path is None:
+            raise OSError("The tesseract executable was not found")
+        pytesseract.pytesseract.tesseract_cmd = path
+
+    def recognize(self, image):
+        return pytesseract.image_to_string(image, lang=self.language, config=f"--psm {self.psm}")
+
+
+class StubEngine(OcrEngine):
+    """Deterministic engine that returns fixed text without running Tesseract.
+
+    text is the text of every image, or a function of the image array
+    returning its text. calls counts the recognized images.
+    """
+
+    name = "stub"
+
+    def __init__(self, text="", language=DEFAULT_LANGUAGE, psm=DEFAULT_PSM):
+        super().__init__(language, psm)
+        self.text = text
+        self.calls = 0
+
+    def version(self):
+        return "0"
+
+    def recognize(self, image):
+        self.calls += 1
+        return self.text(image) if callable(self.text) else self.text
+
+
+ENGINE_CLASSES = {engine.name: engine for engine in (TesserocrEngine, CliEngine, StubEngine)}
+
+# Shared engines by name, created on first use
+_ENGINES = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def get_engine(name=None):
+    """Return the shared engine of the given name, or the fastest available one.
+
+    Raises:
+        OcrError: If no engine can be started.
+    """
+    names = (name,) if name else available_engines()
+    errors = []
+    with _ENGINES_LOCK:
+        for engine_name in names:
+            if engine_name not in _ENGINES:
+                try:
+                    _ENGINES[engine_name] = ENGINE_CLASSES[engine_name]()
+                except (RuntimeError, OSError) as e:
+                    errors.append(f"{engine_name}: {e}")
+                    continue
+            return _ENGINES[engine_name]
+    if not names:
+        raise OcrError("Tesseract OCR is not installed (neither tesserocr nor pytesseract with tesseract)")
+    raise OcrError("No OCR engine could be started: " + "; ".join(errors))
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""OCR stages that turn a title scan into bearing-distance lines.
+
+A scan goes through four stages: load (decode it into a pixel array,
+ideally a view of the decoder's buffer, as grayscale, BGR or BGRA),
+preprocess (grayscale and threshold), recognize (OCR engine, see
+ocr_engine) and parse (pick the bearing lines out of the raw text).
+run_ocr runs them in order, reporting each stage as it starts and
+stopping between stages when cancelled, so the OCR dialog can run it in
+a background task. parse_bearings only needs the raw text, so a parser
+fix can be re-run without OCR.
+
+Before recognition the page can be cropped to its technical description
+(see find_description_region), so Tesseract does not spend its time on
+headers, owner names, annotations and seals. Regions are (x, y, width,
+height) boxes in image pixels.
+
+Given an ocr_cache.OcrCache and a digest of the scan, run_ocr skips the
+stages whose result is cached: with cached text only parsing runs, with
+a cached preprocessed image only recognition. This module has no Qt
+dependency.
+"""
+
+import hashlib
+import re
+
+import numpy as np
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+STAGES = ("load", "preprocess", "recognize", "parse")
+
+# Region that is found with find_description_region after loading
+AUTO_REGION = "auto"
+# Part of the cache keys of preprocessed images; bump it when preprocess or
+# find_description_region change so that images cached before are not reused
+PREPROCESS_VERSION = 1
+
+# Region detection runs on pages scaled down to at most this width
+DETECTION_WIDTH = 1000
+# A technical description has at least this many full text lines
+MIN_REGION_LINES = 3
+# Fraction of the block width a text line must fill to count as a full line
+FULL_LINE_FILL = 0.5
+# Blocks covering more of the page than this are not worth cropping to
+MAX_REGION_AREA = 0.9
+# Margin added around a detected region, as a fraction of the page width
+REGION_MARGIN = 0.01
+
+# Common OCR slips in bearing lines, replaced in order
+OCR_REPLACEMENTS = (
+    ('%', '°'),
+    ('’', "'"),
+    ('o', '°'),
+    (',', '.'),
+    ('O', '0'),
+    ('|', '1'),
+    ('°°', '°'),
+    ('  ', ' '),
+)
+
+# Forgiving pattern of one bearing-distance line
+BEARING_PATTERN = re.compile(
+    r"""
+    (?P<ns>[NS])                # N or S
+    [\s.]*                      # Optional spacing/dot
+    (?P<deg>\d{1,3})            # Degrees (1-3 digits)
+    [^\dA-Za-z]?[°%o]?[^\dA-Za-z]?  # Common OCR substitutions
+    (?P<min>\d{1,2})            # Minutes
+    [^\dA-Za-z]?['7]?           # Common OCR substitutions for '
+    [\s.]*                      # Optional spacing
+    (?P<ew>[EW])                # E or W
+    [\s,]*                      # Optional spacing/comma
+    (?P<dist>\d+(?:\.\d+)?)     # Distance (e.g. 123.45)
+    [\s]*[mM]?                  # Optional 'm' or 'M'
+    """,
+    re.IGNORECASE | re.VERBOSE
+)
+
+
+def clean_text(raw_text):
+    """Undo common OCR slips in bearing lines."""
+    for old, new in OCR_REPLACEMENTS:
+        raw_text = raw_text.replace(old, new)
+    return raw_text
+
+
+def parse_bearings(raw_text):
+    """Extract bearing-distance lines from raw OCR text.
+
+    Returns:
+        List of dicts with direction, degrees, minutes, quadrant and
+        distance keys, in the order they appear in the text. Matches with
+        minutes over 59 or a zero distance are dropped.
+    """
+    bearings = []
+    for match in BEARING_PATTERN.finditer(clean_text(raw_text)):
+        minutes = int(match.group('min'))
+        distance = float(match.group('dist'))
+        # Degrees over 90 are kept here and rejected with the other bearing rules later
+        if minutes > 59 or distance <= 0:
+            continue
+        bearings.append({
+            'direction': match.group('ns').upper(),
+            'degrees': int(match.group('deg')),
+            'minutes': minutes,
+            'quadrant': match.group('ew').upper(),
+            'distance': distance,
+        })
+    return bearings
+
+
+def to_gray(image):
+    """Return a grayscale, BGR or BGRA uint8 image as grayscale.
+
+    Grayscale images are returned as they are, without a copy.
+    """
+    if image.ndim == 2:
+        return image
+    if image.shape[2] == 4:
+        return cv2.cvtColor(image, cv2.COLOR_BGRA2GRAY)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
+def preprocess(image):
+    """Grayscale and Otsu-threshold a grayscale, BGR or BGRA image for OCR."""
+    gray = to_gray(image)
+    _, thresh = cv2.threshold(gray, 150, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return thresh
+
+
+def _count_runs(flags):
+    """Return the number of runs of True in a boolean array."""
+    if not len(flags):
+        return 0
+    return int(flags[0]) + int(np.count_nonzero(flags[1:] & ~flags[:-1]))
+
+
+def find_description_region(image):
+    """Return the (x, y, width, height) of the technical description block, or None.
+
+    Characters are joined into text lines and text lines into blocks with
+    morphology, after removing ruled lines and page borders. The block
+    with the most full-width text lines, weighted by its width, is taken:
+    a technical description is a long justified paragraph of bearing
+    lines, while headers, names and annotations are short and seals and
+    signatures are solid blobs. None means the whole page should be read.
+    """
+    gray = to_gray(image)
+    height, width = gray.shape
+    scale = min(1.0, DETECTION_WIDTH / width)
+    if scale < 1.0:
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    _, ink = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    small_height, small_width = ink.shape
+
+    # Remove ruled lines and borders, which would join everything into one block
+    rules = cv2.morphologyEx(ink, cv2.MORPH_OPEN, cv2.getStructuringElement(cv2.MORPH_RECT, (small_width // 4, 1)))
+    rules |= cv2.morphologyEx(ink, cv2.MORPH_OPEN, cv2.getStructuringElement(cv2.MORPH_RECT, (1, small_height // 4)))
+    ink = cv2.subtract(ink, rules)
+
+    text_lines = cv2.dilate(ink, cv2.getStructuringElement(cv2.MORPH_RECT, (max(3, small_width // 50), 1)))
+    # Join lines less than two line heights apart, whatever the line spacing of the scan
+    line_boxes = [cv2.boundingRect(c) for c in cv2.findContours(
+        text_lines, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[-2]]
+    line_height = np.median([box[3] for box in line_boxes]) if line_boxes else 1
+    blocks = cv2.dilate(text_lines, cv2.getStructuringElement(cv2.MORPH_RECT, (1, max(3, int(2 * line_height)))))
+    contours = cv2.findContours(blocks, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[-2]
+
+    best, best_score = None, 0
+    for contour in contours:
+        x, y, block_width, block_height = cv2.boundingRect(contour)
+        fill = np.count_nonzero(text_lines[y:y + block_height, x:x + block_width], axis=1) / block_width
+        lines = _count_runs(fill > FULL_LINE_FILL)
+        if lines >= MIN_REGION_LINES and lines * block_width > best_score:
+            best, best_score = (x, y, block_width, block_height), lines * block_width
+    if best is None:
+        return None
+
+    margin = REGION_MARGIN * small_width
+    x0 = max(0, int((best[0] - margin) / scale))
+    y0 = max(0, int((best[1] - margin) / scale))
+    x1 = min(width, int(np.ceil((best[0] + best[2] + margin) / scale)))
+    y1 = min(height, int(np.ceil((best[1] + best[3] + margin) / scale)))
+    if (x1 - x0) * (y1 - y0) > MAX_REGION_AREA * width * height:
+        return None
+    return x0, y0, x1 - x0, y1 - y0
+
+
+def crop(image, region):
+    """Return the part of an image inside a region, clipped to the image."""
+    if region is None:
+        return image
+    x, y, width, height = (int(round(v)) for v in region)
+    return image[max(0, y):max(0, y + height), max(0, x):max(0, x + width)]
+
+
+def cache_keys(source, engine, region=None, page=0):
+    """Return the cache keys (image_key, text_key) of a page.
+
+    source is a digest of the scan's bytes. The image key covers what the
+    preprocessed image depends on; the text key adds the engine, its
+    version and its settings.
+    """
+    image_key = hashlib.sha256(repr((source, page, region, PREPROCESS_VERSION)).encode("utf-8")).hexdigest()
+    text_key = hashlib.sha256(repr((image_key, engine.key)).encode("utf-8")).hexdigest()
+    return image_key, text_key
+
+
+def run_ocr(load, engine, progress=None, cancelled=None, region=None, cache=None, source=None, page=0):
+    """Run all OCR stages on one image.
+
+    Args:
+        load: Function returning the image as a grayscale, BGR or BGRA
+            uint8 array; it may be a view of the decoded image's buffer.
+        engine: ocr_engine engine recognizing the preprocessed image.
+        progress: Optional function called with each stage name as it starts.
+        cancelled: Optional function returning True to stop; checked
+            between stages, a running recognition is not interrupted.
+        region: Optional (x, y, width, height) to read instead of the whole
+            image, or AUTO_REGION to read the region find_description_region
+            finds.
+        cache: Optional ocr_cache.OcrCache of preprocessed images and text.
+        source: Digest of the scan's bytes; the cache is only used with it.
+        page: Page of a multi-page scan, part of the cache keys.
+
+    Returns:
+        Tuple (bearings, raw_text, text_cached), or None if cancelled;
+        text_cached is True when the text came from the cache and the page
+        was not recognized.
+    """
+    def start(stage):
+        if cancelled is not None and cancelled():
+            return False
+        if progress is not None:
+            progress(stage)
+        return True
+
+    keys = None
+    raw_text = processed = None
+    if cache is not None and source is not None:
+        keys = cache_keys(source, engine, region, page)
+        raw_text = cache.get_text(keys[1])
+        if raw_text is None:
+            processed = cache.get_image(keys[0])
+
+    text_cached = raw_text is not None
+    if raw_text is None and processed is None:
+        if not start("load"):
+            return None
+        image = load()
+        image = crop(image, find_description_region(image) if region == AUTO_REGION else region)
+        if not start("preprocess"):
+            return None
+        processed = preprocess(image)
+        if keys is not None:
+            cache.put_image(keys[0], processed)
+    if raw_text is None:
+        if not start("recognize"):
+            return None
+        raw_text = engine.recognize(processed)
+        if keys is not None:
+            cache.put_text(keys[1], raw_text)
+    if not start("parse"):
+        return None
+    return parse_bearings(raw_text), raw_text, text_cached
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""PRS92 zone of Philippine provinces and municipalities.
+
+Every province is assigned the PRS92 Philippines zone (EPSG:3121-3125,
+central meridians 117 to 125 degrees east) whose band holds most of its
+area. Municipalities of provinces that straddle two zones, such as
+southern Palawan, are listed separately. Names are matched case, accent
+and punctuation insensitively, so "CEBU", "Cebu" and "Province of Cebu"
+are the same province.
+
+The tie point store compiles the zone of every tie point once; lots are
+assigned their zone from their province and municipality. This module
+has no Qt dependency.
+"""
+
+import re
+import unicodedata
+
+import numpy as np
+
+from . import coordinate_transform
+
+# Tie point CRS choice that takes every tie point's zone from its province
+AUTO = "auto"
+# Zone code of tie points and lots whose province is not in the table
+UNKNOWN_ZONE = 0
+
+PROVINCE_ZONES = {
+    # Zone II: northern Palawan and Tawi-Tawi
+    "palawan": 2, "tawi tawi": 2,
+    # Zone III: northern and central Luzon, Metro Manila, CALABARZON, Mindoro, Sulu
+    "abra": 3, "apayao": 3, "benguet": 3, "ifugao": 3, "kalinga": 3, "mountain province": 3,
+    "ilocos norte": 3, "ilocos sur": 3, "la union": 3, "pangasinan": 3,
+    "batanes": 3, "cagayan": 3, "isabela": 3, "nueva vizcaya": 3, "quirino": 3,
+    "aurora": 3, "bataan": 3, "bulacan": 3, "nueva ecija": 3, "pampanga": 3, "tarlac": 3, "zambales": 3,
+    "metro manila": 3, "national capital region": 3, "ncr": 3,
+    "batangas": 3, "cavite": 3, "laguna": 3, "quezon": 3, "rizal": 3,
+    "marinduque": 3, "occidental mindoro": 3, "oriental mindoro": 3, "sulu": 3,
+    # Zone IV: Bicol, western and central Visayas, Zamboanga peninsula
+    "romblon": 4, "albay": 4, "camarines norte": 4, "camarines sur": 4, "masbate": 4, "sorsogon": 4,
+    "aklan": 4, "antique": 4, "capiz": 4, "guimaras": 4, "iloilo": 4,
+    "negros occidental": 4, "negros oriental": 4, "cebu": 4, "siquijor": 4,
+    "zamboanga del norte": 4, "zamboanga del sur": 4, "zamboanga sibugay": 4,
+    "misamis occidental": 4, "basilan": 4,
+    # Zone V: eastern Visayas and most of Mindanao
+    "catanduanes": 5, "bohol": 5, "biliran": 5, "eastern samar": 5, "leyte": 5, "northern samar": 5,
+    "samar": 5, "western samar": 5, "southern leyte": 5,
+    "bukidnon": 5, "camiguin": 5, "lanao del norte": 5, "misamis oriental": 5,
+    "davao de oro": 5, "compostela valley": 5, "davao del norte": 5, "davao del sur": 5,
+    "davao occidental": 5, "davao oriental": 5,
+    "cotabato": 5, "north cotabato": 5, "sarangani": 5, "south cotabato": 5, "sultan kudarat": 5,
+    "agusan del norte": 5, "agusan del sur": 5, "dinagat islands": 5,
+    "surigao del norte": 5, "surigao del sur": 5,
+    "lanao del sur": 5, "maguindanao": 5, "maguindanao del norte": 5, "maguindanao del sur": 5,
+}
+
+# (province, municipality) -> zone where a municipality lies in another band than its province
+MUNICIPALITY_ZONES = {
+    ("palawan", "balabac"): 1,
+    ("palawan", "bataraza"): 1,
+    ("palawan", "brooke s point"): 1,
+    ("palawan", "kalayaan"): 1,
+    ("palawan", "quezon"): 1,
+    ("palawan", "rizal"): 1,
+    ("palawan", "sofronio espanola"): 1,
+}
+
+# Plausible PRS92 grid coordinates of the Philippines in any zone, in metres
+EASTING_RANGE = (250000.0, 750000.0)
+NORTHING_RANGE = (400000.0, 2450000.0)
+
+NOT_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+PROVINCE_PREFIX = re.compile(r"^(?:province of|prov of) ")
+
+
+def normalize_name(name):
+    """Return the lookup form of a province or municipality name."""
+    text = unicodedata.normalize("NFKD", str(name or "").casefold())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = NOT_ALPHANUMERIC.sub(" ", text).strip()
+    return PROVINCE_PREFIX.sub("", text)
+
+
+def zone_for(province, municipality=None):
+    """Return the PRS92 zone (1-5) of a province and municipality, or UNKNOWN_ZONE."""
+    province = normalize_name(province)
+    if municipality:
+        zone = MUNICIPALITY_ZONES.get((province, normalize_name(municipality)))
+        if zone is not None:
+            return zone
+    return PROVINCE_ZONES.get(province, UNKNOWN_ZONE)
+
+
+def zone_crs(zone):
+    """Return the auth id of a zone, or None for UNKNOWN_ZONE."""
+    return coordinate_transform.PRS92_ZONES.get(int(zone))
+
+
+def crs_zone(crs):
+    """Return the zone of a PRS92 zone auth id, or UNKNOWN_ZONE for any other CRS."""
+    for zone, zone_auth_id in coordinate_transform.PRS92_ZONES.items():
+        if zone_auth_id == crs:
+            return zone
+    return UNKNOWN_ZONE
+
+
+def zone_codes(provinces, municipalities):
+    """Return the zones of many records as an int8 array.
+
+    Each distinct (province, municipality) pair is looked up once.
+    """
+    zones = {}
+    codes = np.zeros(len(provinces), dtype=np.int8)
+    for i, key in enumerate(zip(provinces, municipalities)):
+        if key not in zones:
+            zones[key] = zone_for(*key)
+        codes[i] = zones[key]
+    return codes
+
+
+def in_prs92_range(easting, northing):
+    """Return True where coordinates are plausible PRS92 grid coordinates.
+
+    Catches degrees typed instead of metres and coordinates that are
+    missing digits; it cannot tell the zone from the coordinates.
+    """
+    easting = np.asarray(easting, dtype=np.float64)
+    northing = np.asarray(northing, dtype=np.float64)
+    return ((easting >= EASTING_RANGE[0]) & (easting <= EASTING_RANGE[1])
+            & (northing >= NORTHING_RANGE[0]) & (northing <= NORTHING_RANGE[1]))
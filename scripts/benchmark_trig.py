@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""Benchmark traverse trig: per-line math calls vs. vectorized vs. lookup table.
+
+Run from the plugin folder:
+
+    python scripts/benchmark_trig.py [lines]
+"""
+
+import math
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import traverse  # noqa: E402
+
+
+def per_call_deltas(ns, deg, minutes, ew, distance):
+    """The pre-engine method: radians, cos and sin for every line."""
+    result = []
+    for line_ns, line_deg, line_min, line_ew, line_dist in zip(ns, deg, minutes, ew, distance):
+        angle_radians = math.radians(line_deg + (line_min / 60))
+        delta_lat = line_dist * math.cos(angle_radians)
+        delta_dep = line_dist * math.sin(angle_radians)
+        if line_ns == 'S':
+            delta_lat *= -1
+        if line_ew == 'W':
+            delta_dep *= -1
+        result.append((round(delta_lat, 3), round(delta_dep, 3)))
+    return result
+
+
+def vectorized_deltas(ns, deg, minutes, ew, distance):
+    """Vectorized, but still evaluating sin and cos for every line."""
+    angle = np.radians(deg + minutes / 60.0)
+    lat_sign = np.where(ns == "S", -1.0, 1.0)
+    dep_sign = np.where(ew == "W", -1.0, 1.0)
+    return (np.round(lat_sign * distance * np.cos(angle), 3),
+            np.round(dep_sign * distance * np.sin(angle), 3))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    rng = np.random.default_rng(0)
+    ns = rng.choice(np.array(["N", "S"]), count)
+    ew = rng.choice(np.array(["E", "W"]), count)
+    deg = rng.integers(0, 90, count)
+    minutes = rng.integers(0, 60, count)
+    distance = np.round(rng.uniform(1, 500, count), 2)
+    python_lists = (ns.tolist(), deg.tolist(), minutes.tolist(), ew.tolist(), distance.tolist())
+
+    lookup_lat, lookup_dep = traverse.calculate_deltas(ns, deg, minutes, ew, distance)
+    vector_lat, vector_dep = vectorized_deltas(ns, deg, minutes, ew, distance)
+    print(f"{count} lines; table and per-line trig agree: "
+          f"{np.array_equal(lookup_lat, vector_lat) and np.array_equal(lookup_dep, vector_dep)}")
+
+    cases = [
+        ("math per line", lambda: per_call_deltas(*python_lists), 1),
+        ("numpy sin/cos", lambda: vectorized_deltas(ns, deg, minutes, ew, distance), 5),
+        ("lookup table", lambda: traverse.calculate_deltas(ns, deg, minutes, ew, distance), 5),
+    ]
+    for name, function, number in cases:
+        seconds = min(timeit.repeat(function, number=number, repeat=3)) / number
+        print(f"{name:>15}: {seconds * 1000:9.1f} ms  ({count / seconds / 1e6:6.1f} M lines/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""Compile resources/tiepoints.json into the binary tie point store.
+
+Run from the plugin folder whenever the tie point JSON changes:
+
+    python scripts/build_tiepoint_store.py [tiepoints.json] [tiepoints.npz]
+"""
+
+import importlib
+import os
+import sys
+import time
+
+PLUGIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(PLUGIN_DIR))
+
+# Imported through the plugin package, the store imports its search module relatively
+tiepoint_store = importlib.import_module(os.path.basename(PLUGIN_DIR) + ".tiepoint_store")
+
+
+def main():
+    json_path = sys.argv[1] if len(sys.argv) > 1 else tiepoint_store.JSON_PATH
+    store_path = sys.argv[2] if len(sys.argv) > 2 else tiepoint_store.STORE_PATH
+
+    start = time.perf_counter()
+    store = tiepoint_store.build_store(json_path, store_path)
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tiepoint_store.open_store(store_path)
+    opened = time.perf_counter() - start
+
+    print(f"Wrote {len(store)} tie points to {store_path} ({os.path.getsize(store_path) / 1e6:.1f} MB) in {built:.2f} s")
+    print(f"SHA-256: {store.checksum}")
+    print(f"Opening and verifying the store takes {opened * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""Measure what loading the plugin adds to QGIS startup.
+
+Each run starts a fresh Python process that imports the plugin package,
+calls classFactory() and initGui() the way QGIS does at startup, and reports
+the time spent and which heavy modules were pulled in. Run it with the
+Python interpreter of a QGIS installation (e.g. the OSGeo4W shell), once per
+checkout to compare before and after a change:
+
+    python scripts/measure_startup.py [runs]
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+PLUGIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("pandas", "cv2", "pytesseract", "shapely")
+
+CHILD = r"""
+import importlib, json, sys, time
+sys.path.insert(0, {parent!r})
+utilities = importlib.import_module({package!r} + ".test.utilities")
+_, _, iface, _ = utilities.get_qgis_app()
+for name in ("addPluginToMenu", "removePluginMenu"):
+    if not hasattr(iface, name):
+        setattr(iface, name, lambda *args: None)
+preloaded = set(sys.modules)
+
+start = time.perf_counter()
+plugin_package = importlib.import_module({package!r})
+imported = time.perf_counter()
+plugin = plugin_package.classFactory(iface)
+created = time.perf_counter()
+plugin.initGui()
+ready = time.perf_counter()
+
+print(json.dumps({{
+    "import_ms": (imported - start) * 1000,
+    "class_factory_ms": (created - imported) * 1000,
+    "init_gui_ms": (ready - created) * 1000,
+    "heavy_modules": sorted(m for m in {heavy!r} if m in sys.modules and m not in preloaded),
+}}))
+"""
+
+
+def measure_once():
+    code = CHILD.format(
+        parent=os.path.dirname(PLUGIN_DIR),
+        package=os.path.basename(PLUGIN_DIR),
+        heavy=HEAVY_MODULES,
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    # The plugin may print while loading; the measurement is the last line
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    results = [measure_once() for _ in range(runs)]
+    for key in ("import_ms", "class_factory_ms", "init_gui_ms"):
+        values = sorted(result[key] for result in results)
+        print(f"{key:>17}: best {values[0]:8.1f} ms, median {values[len(values) // 2]:8.1f} ms")
+    total = min(r["import_ms"] + r["class_factory_ms"] + r["init_gui_ms"] for r in results)
+    print(f"{'total':>17}: best {total:8.1f} ms")
+    print(f"Heavy modules loaded at startup: {', '.join(results[0]['heavy_modules']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
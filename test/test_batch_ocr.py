@@ -0,0 +1,99 @@
+# coding=utf-8
+"""Batch OCR tests.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'isaacenagework@gmail.com'
+__date__ = '2025-05-31'
+__copyright__ = 'Copyright 2025, isaacenage'
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from .. import batch_ocr
+from .. import batch_plotter
+from .. import ocr_cache
+from .. import ocr_engine
+from .. import ocr_pipeline
+
+# OCR text of the pages of a two-page title, keyed by the page's gray level
+PAGE_TEXTS = {
+    40: "TECHNICAL DESCRIPTION\nN 45 30 E 100.50 m. from BLLM 1;\nS 89 15 E 25.10 m.;\nS 0 45 W",
+    200: "40.00 m.;\nN 89 15 W 25.10 m. to the point of beginning.",
+}
+
+
+class BatchOcrTest(unittest.TestCase):
+    """Test stitching pages into titles and the batch OCR run."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_pages_are_stitched_into_one_title(self):
+        record = batch_ocr.title_record("/scans/T-123.tif", [PAGE_TEXTS[40], PAGE_TEXTS[200]])
+        self.assertEqual(record['lot_id'], "T-123")
+        self.assertEqual(record['pages'], 2)
+        lines = [(b['direction'], b['degrees'], b['minutes'], b['quadrant'], b['distance']) for b in record['lines']]
+        self.assertEqual(lines[2], ("S", 0, 45, "W", 40.0))
+        self.assertEqual(len(lines), 4)
+
+    def test_unreadable_documents_are_reported(self):
+        path = os.path.join(self.directory.name, "missing.pdf")
+        stats = batch_ocr.run_batch_ocr([path], lambda record: None, ocr_engine.StubEngine(), workers=1)
+        self.assertEqual([source for source, _ in stats.errors], [path])
+        self.assertEqual(stats.titles, 0)
+
+    @unittest.skipIf(batch_ocr.Image is None or ocr_pipeline.cv2 is None, "Pillow and OpenCV are not installed")
+    def test_multi_page_tiff_becomes_one_lot(self):
+        path = os.path.join(self.directory.name, "T-123.tif")
+        pages = [batch_ocr.Image.fromarray(np.full((40, 60), level, dtype=np.uint8)) for level in PAGE_TEXTS]
+        pages[0].save(path, save_all=True, append_images=pages[1:])
+        output_path = os.path.join(self.directory.name, "titles.jsonl")
+
+        def page_text(image):
+            # Pages are recognized in page order
+            return PAGE_TEXTS[list(PAGE_TEXTS)[engine.calls - 1]]
+        engine = ocr_engine.StubEngine(page_text)
+        stats = batch_ocr.write_jsonl([path], output_path, engine, workers=1)
+
+        self.assertEqual((stats.titles, stats.pages), (1, 2))
+        self.assertGreater(stats.pages_per_minute, 0)
+        lots = list(batch_plotter.read_lots(output_path))
+        self.assertEqual(lots[0]['lot_id'], "T-123")
+        self.assertEqual(len(lots[0]['lines']), 4)
+
+    @unittest.skipIf(batch_ocr.Image is None or ocr_pipeline.cv2 is None, "Pillow and OpenCV are not installed")
+    def test_second_run_reads_the_cache(self):
+        path = os.path.join(self.directory.name, "T-123.tif")
+        pages = [batch_ocr.Image.fromarray(np.full((40, 60), level, dtype=np.uint8)) for level in PAGE_TEXTS]
+        pages[0].save(path, save_all=True, append_images=pages[1:])
+        cache = ocr_cache.OcrCache(os.path.join(self.directory.name, "cache"))
+        engine = ocr_engine.StubEngine(lambda image: PAGE_TEXTS[list(PAGE_TEXTS)[engine.calls - 1]])
+
+        records = []
+        first = batch_ocr.run_batch_ocr([path], records.append, engine, workers=1, cache=cache)
+        second = batch_ocr.run_batch_ocr([path], records.append, engine, workers=1, cache=cache)
+
+        self.assertEqual((first.cached_pages, second.cached_pages), (0, 2))
+        self.assertEqual(engine.calls, 2)
+        self.assertEqual(records[0]['lines'], records[1]['lines'])
+
+        # Only the preprocessed pages are cached for another engine setting
+        other_engine = ocr_engine.StubEngine(lambda image: PAGE_TEXTS[list(PAGE_TEXTS)[other_engine.calls - 1]], psm=4)
+        third = batch_ocr.run_batch_ocr([path], records.append, other_engine, workers=1, cache=cache)
+        self.assertEqual((third.cached_pages, other_engine.calls), (0, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+# coding=utf-8
+"""Batch plotting tests.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'isaacenagework@gmail.com'
+__date__ = '2025-05-31'
+__copyright__ = 'Copyright 2025, isaacenage'
+
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from .. import batch_plotter
+
+SQUARE_LINES = ["N 0 0 E 10.00", "N 90 0 E 100", "S 0 0 E 100", "S 90 0 W 100", "N 0 0 W 100"]
+
+
+class BatchPlotterTest(unittest.TestCase):
+    """Test reading and computing batches of lots."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def test_csv_rows_are_grouped_by_lot(self):
+        rows = ["lot_id,tie_northing,tie_easting,direction,degrees,minutes,quadrant,distance"]
+        for lot_id, tie in (("A", "1000,2000"), ("B", "5000,6000")):
+            for line in SQUARE_LINES:
+                ns, deg, minutes, ew, distance = batch_plotter.parse_line(line)
+                rows.append(f"{lot_id},{tie},{ns},{deg},{minutes},{ew},{distance}")
+        lots = list(batch_plotter.read_lots(self.write("lots.csv", "\n".join(rows))))
+        self.assertEqual([lot['lot_id'] for lot in lots], ["A", "B"])
+        self.assertEqual(len(lots[1]['lines']), 5)
+
+    def test_malformed_json_lines_are_lot_errors(self):
+        lot = {"lot_id": "A", "tie_northing": 1000, "tie_easting": 2000, "lines": SQUARE_LINES}
+        path = self.write("lots.jsonl", "\n".join([json.dumps(lot), "{not json", "[1, 2]"]))
+        stats = batch_plotter.run_batch(batch_plotter.read_lots(path), lambda batch: None, workers=1)
+        self.assertEqual(stats.lots, 1)
+        self.assertEqual([lot_id for lot_id, _ in stats.errors], ["2", "3"])
+        self.assertIn("Malformed JSON", stats.errors[0][1])
+
+    def test_json_file_is_an_array_of_lots(self):
+        lot = {"tie_northing": 1000, "tie_easting": 2000, "lines": SQUARE_LINES}
+        lots = list(batch_plotter.read_lots(self.write("lots.json", json.dumps([lot, lot]))))
+        self.assertEqual([lot['lot_id'] for lot in lots], ["1", "2"])
+        with self.assertRaises(ValueError):
+            list(batch_plotter.read_lots(self.write("lot.json", json.dumps(lot))))
+
+    def test_compute_lots(self):
+        records = [
+            {"lot_id": "A", "tie_northing": 1000, "tie_easting": 2000, "lines": SQUARE_LINES},
+            {"lot_id": "B", "tie_point": "BLLM 1", "lines": SQUARE_LINES[:-1] + ["N 0 0 W 99.5"]},
+            {"lot_id": "C", "tie_point": "UNKNOWN", "lines": SQUARE_LINES},
+        ]
+        path = self.write("lots.jsonl", "\n".join(json.dumps(r) for r in records))
+
+        def resolve(name, province, municipality):
+            return (0.0, 0.0) if name == "BLLM 1" else None
+
+        batch = batch_plotter.compute_lots(batch_plotter.read_lots(path), resolve)
+
+        self.assertEqual(batch.lot_ids, ["A", "B"])
+        self.assertEqual([lot_id for lot_id, _ in batch.errors], ["C"])
+        np.testing.assert_allclose(batch.lot_corners(0), [[2000, 1010], [2100, 1010], [2100, 910], [2000, 910]])
+        np.testing.assert_allclose(batch.areas, [10000.0, 10000.0])
+        np.testing.assert_allclose(batch.misclosures, [0.0, 0.5], atol=1e-9)
+
+    def test_zones_and_range_check(self):
+        lots = [
+            {"lot_id": "A", "province": "Cebu", "tie_northing": 1150000, "tie_easting": 520000, "lines": SQUARE_LINES},
+            {"lot_id": "B", "province": "CEBU", "tie_northing": 10.3, "tie_easting": 123.9, "lines": SQUARE_LINES},
+            {"lot_id": "C", "tie_northing": 1000, "tie_easting": 2000, "lines": SQUARE_LINES},
+            {"lot_id": "D", "province": "Palawan", "municipality": "Bataraza",
+             "tie_northing": 950000, "tie_easting": 480000, "lines": SQUARE_LINES},
+        ]
+        batch = batch_plotter.compute_lots(lots)
+
+        self.assertEqual(batch.lot_ids, ["A", "C", "D"])
+        self.assertEqual([lot_id for lot_id, _ in batch.errors], ["B"])
+        self.assertEqual(batch.zones.tolist(), [4, 0, 1])
+
+        subset = batch.take([2, 0])
+        self.assertEqual(subset.lot_ids, ["D", "A"])
+        self.assertEqual(subset.zones.tolist(), [1, 4])
+        np.testing.assert_allclose(subset.lot_corners(1), batch.lot_corners(0))
+        np.testing.assert_allclose(subset.areas, batch.areas[[2, 0]])
+
+    def test_parallel_matches_serial(self):
+        bowtie = ["N 0 0 E 10", "N 90 0 E 100", "S 45 0 W 141.421", "N 90 0 E 100", "S 45 0 W 141.421"]
+        lots = [
+            {"lot_id": str(i), "tie_northing": 1000 * i, "tie_easting": 2000, "lines": bowtie if i == 3 else SQUARE_LINES}
+            for i in range(5)
+        ]
+        serial = batch_plotter.compute_lots(lots)
+        parallel = batch_plotter.compute_lots_parallel(lots, workers=2, chunk_size=2)
+        batch_plotter.shutdown_pool()
+
+        self.assertEqual(parallel.lot_ids, serial.lot_ids)
+        np.testing.assert_array_equal(parallel.offsets, serial.offsets)
+        np.testing.assert_allclose(parallel.corners, serial.corners)
+        self.assertEqual(parallel.valid.tolist(), [True, True, True, False, True])
+
+    def test_run_batch_streams_chunks(self):
+        lots = ({"lot_id": str(i), "tie_northing": 0, "tie_easting": 0, "lines": SQUARE_LINES} for i in range(7))
+        chunks = []
+        stats = batch_plotter.run_batch(lots, chunks.append, workers=1, chunk_size=3)
+
+        self.assertEqual([len(chunk) for chunk in chunks], [3, 3, 1])
+        self.assertEqual((stats.lots, stats.lines), (7, 35))
+
+    def test_run_batch_can_be_stopped(self):
+        lots = ({"lot_id": str(i), "tie_northing": 0, "tie_easting": 0, "lines": SQUARE_LINES} for i in range(7))
+        chunks = []
+        stats = batch_plotter.run_batch(lots, chunks.append, workers=1, chunk_size=3, progress=lambda stats: False)
+
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(stats.lots, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
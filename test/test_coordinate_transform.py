@@ -0,0 +1,60 @@
+# coding=utf-8
+"""Coordinate transform service tests.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'isaacenagework@gmail.com'
+__date__ = '2025-05-31'
+__copyright__ = 'Copyright 2025, isaacenage'
+
+import unittest
+
+import numpy as np
+
+from .. import coordinate_transform
+
+
+class CoordinateTransformTest(unittest.TestCase):
+    """Test caching and array transforms."""
+
+    def setUp(self):
+        self.calls = []
+        # Shift by the zone number so transformed points are easy to check
+        zones = coordinate_transform.PRS92_ZONES.items()
+        coordinate_transform._CACHE.transforms = {
+            (crs, other): self.shift(other_zone - zone) for zone, crs in zones for other_zone, other in zones
+        }
+
+    def tearDown(self):
+        coordinate_transform._CACHE.transforms = {}
+
+    def shift(self, offset):
+        def transform(x, y):
+            self.calls.append(len(x))
+            return x + offset * 1000, y
+        return transform
+
+    def test_same_crs_is_a_copy(self):
+        x, y = coordinate_transform.transform([1.0, 2.0], [3.0, 4.0], "EPSG:3123", "EPSG:3123")
+        np.testing.assert_array_equal(x, [1.0, 2.0])
+        self.assertEqual(self.calls, [])
+
+    def test_transforms_are_cached_per_pair(self):
+        first = coordinate_transform.get_transform("EPSG:3121", "EPSG:3123")
+        self.assertIs(coordinate_transform.get_transform("EPSG:3121", "EPSG:3123"), first)
+
+    @unittest.skipIf(coordinate_transform.transformer_class() is None, "pyproj is not installed")
+    def test_prs92_zone_origin(self):
+        coordinate_transform._CACHE.transforms = {}
+        x, y = coordinate_transform.transform_point(121.0, 0.0, coordinate_transform.WGS84, "EPSG:3123")
+        self.assertAlmostEqual(x, 500000.0, delta=200)
+        self.assertAlmostEqual(y, 0.0, delta=500)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+# coding=utf-8
+"""OCR cache tests.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'isaacenagework@gmail.com'
+__date__ = '2025-05-31'
+__copyright__ = 'Copyright 2025, isaacenage'
+
+import os
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from .. import ocr_cache
+from .. import ocr_engine
+from .. import ocr_pipeline
+
+RAW_TEXT = "N 45 30 E 100.50 m.\nS 89 15 E 25.10 m.\nS 0 45 W 40.00 m."
+
+
+class OcrCacheTest(unittest.TestCase):
+    """Test cache hits, keys and LRU eviction."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ocr_cache.OcrCache(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_text_round_trip_and_stats(self):
+        self.assertIsNone(self.cache.get_text("ab" * 32))
+        self.cache.put_text("ab" * 32, RAW_TEXT)
+        self.assertEqual(self.cache.get_text("ab" * 32), RAW_TEXT)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(str(self.cache), "1 hits, 1 misses (50% hit rate), 0 evicted")
+
+    def test_corrupt_entries_are_misses_and_removed(self):
+        self.cache.put_text("ab" * 32, RAW_TEXT)
+        text_path = self.cache._path("ab" * 32, ocr_cache.TEXT_SUFFIX)
+        image_path = self.cache._path("cd" * 32, ocr_cache.IMAGE_SUFFIX)
+        with open(text_path, "wb") as f:
+            f.write(b"\xff\xfe\xfa")
+        os.makedirs(os.path.dirname(image_path))
+        with open(image_path, "wb") as f:
+            f.write(b"not a png")
+
+        self.assertIsNone(self.cache.get_text("ab" * 32))
+        if ocr_cache.cv2 is not None:
+            self.assertIsNone(self.cache.get_image("cd" * 32))
+            self.assertFalse(os.path.exists(image_path))
+        self.assertFalse(os.path.exists(text_path))
+        self.assertEqual(self.cache.hits, 0)
+
+    def test_rewritten_entries_are_counted_once(self):
+        self.cache.put_text("ab" * 32, "x" * 100)
+        self.cache.put_text("ab" * 32, "x" * 100)
+        self.cache.put_text("cd" * 32, "x" * 100)
+        self.assertEqual(self.cache._size, self.cache.size())
+        self.assertEqual(self.cache.size(), 200)
+
+    def test_keys_depend_on_source_region_and_engine(self):
+        engine = ocr_engine.StubEngine()
+        image_key, text_key = ocr_pipeline.cache_keys("scan", engine)
+        self.assertEqual((image_key, text_key), ocr_pipeline.cache_keys("scan", engine))
+        self.assertNotEqual(image_key, ocr_pipeline.cache_keys("scan", engine, (0, 0, 10, 10))[0])
+        self.assertNotEqual(image_key, ocr_pipeline.cache_keys("scan", engine, page=1)[0])
+        self.assertEqual(image_key, ocr_pipeline.cache_keys("scan", ocr_engine.StubEngine(psm=4))[0])
+        self.assertNotEqual(text_key, ocr_pipeline.cache_keys("scan", ocr_engine.StubEngine(psm=4))[1])
+
+    def test_least_recently_used_entries_are_evicted(self):
+        for i, key in enumerate(("aa", "bb", "cc")):
+            self.cache.put_text(key * 32, "x" * 100)
+            # Modification times must differ to order the entries
+            used = time.time() - 100 + i
+            os.utime(self.cache._path(key * 32, ocr_cache.TEXT_SUFFIX), (used, used))
+        self.cache.max_bytes = 350
+        self.cache.get_text("aa" * 32)
+        self.cache.put_text("dd" * 32, "x" * 100)
+
+        self.assertIsNotNone(self.cache.get_text("aa" * 32))
+        self.assertIsNone(self.cache.get_text("bb" * 32))
+        self.assertIsNone(self.cache.get_text("cc" * 32))
+        self.assertIsNotNone(self.cache.get_text("dd" * 32))
+        self.assertEqual(self.cache.evictions, 2)
+        self.assertEqual(self.cache.size(), 200)
+
+    def test_cached_text_skips_recognition(self):
+        engine = ocr_engine.StubEngine(RAW_TEXT)
+        self.cache.put_text(ocr_pipeline.cache_keys("scan", engine)[1], RAW_TEXT)
+        stages = []
+        bearings, raw_text, text_cached = ocr_pipeline.run_ocr(
+            lambda: self.fail("a cached page must not be loaded"), engine, stages.append, cache=self.cache, source="scan")
+        self.assertEqual(stages, ["parse"])
+        self.assertTrue(text_cached)
+        self.assertEqual((raw_text, len(bearings), engine.calls), (RAW_TEXT, 3, 0))
+
+    @unittest.skipIf(ocr_pipeline.cv2 is None, "OpenCV is not installed")
+    def test_cached_image_skips_preprocessing(self):
+        page = np.full((20, 30, 3), 255, dtype=np.uint8)
+        engine = ocr_engine.StubEngine(RAW_TEXT)
+        ocr_pipeline.run_ocr(lambda: page, engine, cache=self.cache, source="scan")
+
+        stages = []
+        other_engine = ocr_engine.StubEngine(RAW_TEXT, psm=4)
+        result = ocr_pipeline.run_ocr(lambda: page, other_engine, stages.append, cache=self.cache, source="scan")
+        self.assertEqual(stages, ["recognize", "parse"])
+        # Recognized again, so the text is not a cache hit
+        self.assertFalse(result[2])
+        self.assertEqual(other_engine.calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
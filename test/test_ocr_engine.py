@@ -0,0 +1,52 @@
+# coding=utf-8
+"""OCR engine tests.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'isaacenagework@gmail.com'
+__date__ = '2025-05-31'
+__copyright__ = 'Copyright 2025, isaacenage'
+
+import unittest
+
+import numpy as np
+
+from .. import ocr_engine
+
+
+class OcrEngineTest(unittest.TestCase):
+    """Test engine selection and the stub engine."""
+
+    def test_stub_engine_is_deterministic(self):
+        engine = ocr_engine.StubEngine(lambda image: f"N 10 20 E {image.shape[1]}.00")
+        image = np.zeros((4, 12), dtype=np.uint8)
+        self.assertEqual(engine.recognize(image), "N 10 20 E 12.00")
+        self.assertEqual(engine.recognize(image), "N 10 20 E 12.00")
+        self.assertEqual(engine.calls, 2)
+        self.assertEqual(engine.key, "stub:0:eng:psm6")
+
+    def test_engines_are_shared(self):
+        self.assertIs(ocr_engine.get_engine("stub"), ocr_engine.get_engine("stub"))
+
+    def test_detection_is_cached(self):
+        self.assertIs(ocr_engine.available_engines(), ocr_engine.available_engines())
+        self.assertEqual(ocr_engine.available_engines.cache_info().currsize, 1)
+
+    def test_image_digest_depends_on_pixels_and_shape(self):
+        image = np.zeros((4, 6), dtype=np.uint8)
+        self.assertEqual(ocr_engine.image_digest(image), ocr_engine.image_digest(image.copy()))
+        self.assertNotEqual(ocr_engine.image_digest(image), ocr_engine.image_digest(image.reshape(6, 4)))
+
+    @unittest.skipUnless(ocr_engine.available_engines(), "Tesseract is not installed")
+    def test_installed_engine_reads_blank_page(self):
+        engine = ocr_engine.get_engine()
+        self.assertEqual(engine.recognize(np.full((100, 300), 255, dtype=np.uint8)).strip(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+# coding=utf-8
+"""OCR pipeline tests.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'isaacenagework@gmail.com'
+__date__ = '2025-05-31'
+__copyright__ = 'Copyright 2025, isaacenage'
+
+import unittest
+
+import numpy as np
+
+from .. import ocr_engine
+from .. import ocr_pipeline
+
+RAW_TEXT = """TECHNICAL DESCRIPTION
+Beginning at a point marked "1" on plan, being
+N 45° 30' E 100.50 m. from BLLM No. 1; thence
+S 89 l5' E, 25,10 m. to point 2;
+S 0O 45' W 40.00 m. to point 3;
+N 12 75' W 10.00 m. to point 4;
+"""
+
+
+class OcrPipelineTest(unittest.TestCase):
+    """Test bearing parsing and the staged OCR run."""
+
+    def test_parse_bearings(self):
+        bearings = ocr_pipeline.parse_bearings(RAW_TEXT)
+        self.assertEqual(
+            [(b['direction'], b['degrees'], b['minutes'], b['quadrant'], b['distance']) for b in bearings],
+            [("N", 45, 30, "E", 100.5), ("S", 0, 45, "W", 40.0)])
+
+    def test_parse_bearings_without_lines(self):
+        self.assertEqual(ocr_pipeline.parse_bearings("OWNER: JUAN DELA CRUZ"), [])
+
+    def test_cancel_between_stages(self):
+        stages = []
+        engine = ocr_engine.StubEngine(RAW_TEXT)
+        result = ocr_pipeline.run_ocr(
+            lambda: np.zeros((4, 4, 3), dtype=np.uint8), engine, stages.append, lambda: len(stages) == 1)
+        self.assertIsNone(result)
+        self.assertEqual(stages, ["load"])
+        self.assertEqual(engine.calls, 0)
+
+    @unittest.skipIf(ocr_pipeline.cv2 is None, "OpenCV is not installed")
+    def test_run_ocr_reports_every_stage(self):
+        stages = []
+        engine = ocr_engine.StubEngine(RAW_TEXT)
+        bearings, raw_text, text_cached = ocr_pipeline.run_ocr(
+            lambda: np.full((20, 20, 3), 255, dtype=np.uint8), engine, stages.append)
+        self.assertFalse(text_cached)
+        self.assertEqual(stages, list(ocr_pipeline.STAGES))
+        self.assertEqual(raw_text, RAW_TEXT)
+        self.assertEqual(len(bearings), 2)
+
+    def test_crop_is_clipped_to_the_image(self):
+        image = np.zeros((10, 20), dtype=np.uint8)
+        self.assertEqual(ocr_pipeline.crop(image, (15, -5, 10, 10)).shape, (5, 5))
+        self.assertIs(ocr_pipeline.crop(image, None), image)
+
+    @unittest.skipIf(ocr_pipeline.cv2 is None, "OpenCV is not installed")
+    def test_gray_and_bgra_images_are_read_alike(self):
+        gray = np.tile(np.arange(0, 250, 10, dtype=np.uint8), (5, 1))
+        # Padded BGRA rows, as in a view of a 32-bit QImage
+        bgra = np.zeros((5, 30, 4), dtype=np.uint8)
+        bgra[:, :25, :3] = gray[:, :, np.newaxis]
+        bgra[:, :, 3] = 255
+        self.assertIs(ocr_pipeline.to_gray(gray), gray)
+        np.testing.assert_array_equal(ocr_pipeline.to_gray(bgra[:, :25]), gray)
+
+    @unittest.skipIf(ocr_pipeline.cv2 is None, "OpenCV is not installed")
+    def test_region_holds_the_description_block(self):
+        cv2 = ocr_pipeline.cv2
+        page = np.full((2800, 2000), 255, dtype=np.uint8)
+        cv2.rectangle(page, (40, 40), (1960, 2760), 0, 6)
+        cv2.putText(page, "TRANSFER CERTIFICATE OF TITLE", (300, 200), cv2.FONT_HERSHEY_SIMPLEX, 3, 0, 6)
+        cv2.putText(page, "Owner: JUAN DELA CRUZ", (200, 400), cv2.FONT_HERSHEY_SIMPLEX, 2, 0, 4)
+        for i in range(10):
+            cv2.putText(page, f"thence N {10 + i} 30 E {100 + i}.50 m. to point {i + 2}; thence S {i} 15 W",
+                        (150, 900 + 70 * i), cv2.FONT_HERSHEY_SIMPLEX, 1.6, 0, 3)
+        cv2.circle(page, (1500, 2300), 250, 0, -1)
+
+        x, y, width, height = ocr_pipeline.find_description_region(page)
+        self.assertTrue(x <= 150 and 400 < y < 850 and y + height > 1530 and y + height < 2050)
+        self.assertLess(width * height, 0.3 * page.size)
+
+        shapes = []
+        engine = ocr_engine.StubEngine(lambda image: shapes.append(image.shape) or RAW_TEXT)
+        ocr_pipeline.run_ocr(lambda: page, engine, region=(x, y, width, height))
+        self.assertEqual(shapes, [(height, width)])
+
+    @unittest.skipIf(ocr_pipeline.cv2 is None, "OpenCV is not installed")
+    def test_blank_page_has_no_region(self):
+        self.assertIsNone(ocr_pipeline.find_description_region(np.full((300, 200), 255, dtype=np.uint8)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+# coding=utf-8
+"""PRS92 zone lookup tests.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'isaacenagework@gmail.com'
+__date__ = '2025-05-31'
+__copyright__ = 'Copyright 2025, isaacenage'
+
+import unittest
+
+from .. import prs92_zones
+
+
+class Prs92ZonesTest(unittest.TestCase):
+    """Test zone lookup and the grid range check."""
+
+    def test_province_names_are_normalized(self):
+        for name in ("CEBU", "Cebu", "Province of Cebu", " cebu "):
+            self.assertEqual(prs92_zones.zone_for(name), 4, name)
+        self.assertEqual(prs92_zones.zone_for("Tawi-Tawi"), 2)
+        self.assertEqual(prs92_zones.zone_for("METRO MANILA"), 3)
+
+    def test_municipality_overrides_province(self):
+        self.assertEqual(prs92_zones.zone_for("PALAWAN", "Puerto Princesa"), 2)
+        self.assertEqual(prs92_zones.zone_for("PALAWAN", "Brooke's Point"), 1)
+        self.assertEqual(prs92_zones.zone_for("PALAWAN", "Española"), 2)
+        self.assertEqual(prs92_zones.zone_for("PALAWAN", "Sofronio Española"), 1)
+
+    def test_unknown_province(self):
+        self.assertEqual(prs92_zones.zone_for("Atlantis"), prs92_zones.UNKNOWN_ZONE)
+        self.assertEqual(prs92_zones.zone_for(None), prs92_zones.UNKNOWN_ZONE)
+        self.assertIsNone(prs92_zones.zone_crs(prs92_zones.UNKNOWN_ZONE))
+        self.assertEqual(prs92_zones.zone_crs(3), "EPSG:3123")
+        self.assertEqual(prs92_zones.crs_zone("EPSG:3123"), 3)
+        self.assertEqual(prs92_zones.crs_zone("EPSG:4326"), prs92_zones.UNKNOWN_ZONE)
+
+    def test_zone_codes(self):
+        codes = prs92_zones.zone_codes(["CEBU", "BOHOL", "CEBU", ""], ["", "", "", ""])
+        self.assertEqual(codes.tolist(), [4, 5, 4, 0])
+
+    def test_range_check(self):
+        self.assertTrue(prs92_zones.in_prs92_range(520000, 1150000))
+        self.assertFalse(prs92_zones.in_prs92_range(123.9, 10.3))
+        self.assertEqual(prs92_zones.in_prs92_range([520000, 52000], [1150000, 1150000]).tolist(), [True, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+# coding=utf-8
+"""Tie point search tests.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'isaacenagework@gmail.com'
+__date__ = '2025-05-31'
+__copyright__ = 'Copyright 2025, isaacenage'
+
+import unittest
+
+from .. import tiepoint_search
+from .. import tiepoint_store
+
+NAMES = ["BLLM 121", "BLLM 1", "MBM 12", "BLLM 12", "PBM 7", "BBM 2"]
+PROVINCES = ["CEBU", "CEBU", "BOHOL", "BOHOL", "CEBU", "BOHOL"]
+
+
+class TiePointSearchTest(unittest.TestCase):
+    """Test folding, ranking and filtering of the trigram search."""
+
+    def setUp(self):
+        index = tiepoint_search.TrigramIndex.from_texts(NAMES)
+        empty = tiepoint_search.TrigramIndex.from_texts([""] * len(NAMES))
+        municipalities = tiepoint_search.CategoryColumn.from_values([""] * len(NAMES))
+        provinces = tiepoint_search.CategoryColumn.from_values(PROVINCES)
+        self.search = tiepoint_search.TiePointSearch(
+            index, empty, tiepoint_search.TrigramIndex.from_texts(municipalities.names), municipalities, provinces)
+
+    def names(self, **filters):
+        return [NAMES[i] for i in self.search.search(**filters)]
+
+    def test_fold_ignores_spacing_number_prefix_and_ocr_slips(self):
+        folded = tiepoint_search.fold("BLLM 1")
+        for text in ("bllm1", "BLLM No. 1", "BLLM #1", "8LLM 1", "BLLM-l"):
+            self.assertEqual(tiepoint_search.fold(text), folded, text)
+        self.assertEqual(tiepoint_search.fold("Parañaque"), "paranaque".translate(tiepoint_search.OCR_FOLD))
+
+    def test_exact_then_prefix_then_contains(self):
+        self.assertEqual(self.names(name="bllm 12")[:2], ["BLLM 12", "BLLM 121"])
+        self.assertEqual(self.names(name="BLLM No.1")[0], "BLLM 1")
+        self.assertIn("MBM 12", self.names(name="m 12"))
+
+    def test_fuzzy_match_ranks_closest_first(self):
+        self.assertEqual(self.names(name="blm 12")[0], "BLLM 12")
+
+    def test_short_queries(self):
+        self.assertEqual(self.names(name="7"), ["PBM 7"])
+        self.assertEqual(self.names(name="pb"), ["PBM 7"])
+
+    def test_province_filter_and_limit(self):
+        self.assertEqual(self.names(name="bllm", province="BOHOL"), ["BLLM 12"])
+        self.assertEqual(self.names(province="BOHOL"), ["MBM 12", "BLLM 12", "BBM 2"])
+        self.assertEqual(self.names(province="LEYTE"), [])
+        self.assertEqual(len(self.search.search(name="bllm", limit=2)), 2)
+
+    def test_pages_match_search_order(self):
+        pages = list(self.search.search_pages(2, name="bllm"))
+        self.assertEqual([len(page) for page in pages], [2, 1])
+        self.assertEqual([i for page in pages for i in page], list(self.search.search(name="bllm")))
+        self.assertEqual([list(page) for page in self.search.search_pages(2, province="LEYTE")], [[]])
+
+    def test_cancelled_search_stops(self):
+        self.assertEqual(list(self.search.search_pages(2, name="bllm", cancelled=lambda: True)), [])
+
+    def test_categories_group_records(self):
+        provinces = tiepoint_search.CategoryColumn.from_values(PROVINCES)
+        self.assertEqual(provinces.names, ["BOHOL", "CEBU"])
+        self.assertEqual(list(provinces.members(provinces.code("CEBU"))), [0, 1, 4])
+        self.assertEqual(provinces.code("LEYTE"), -1)
+        ids, scores = provinces.expand([1, 0], [2.0, 1.0])
+        self.assertEqual(list(ids), [0, 1, 2, 3, 4, 5])
+        self.assertEqual(list(scores), [2.0, 2.0, 1.0, 1.0, 2.0, 1.0])
+
+    def test_store_round_trips_the_index(self):
+        records = [{"TIE POINT NAME": name, "PROVINCE": province, "NORTHING": 0, "EASTING": 0}
+                   for name, province in zip(NAMES, PROVINCES)]
+        store = tiepoint_store.TiePointStore(tiepoint_store.compile_records(records))
+        found = store.search_index().search(name="8LLM 12", municipality="cebu")
+        self.assertEqual([store.column("name")[i] for i in found][:2], ["BLLM 121", "BLLM 1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+# coding=utf-8
+"""Nearest tie point lookup tests.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'isaacenagework@gmail.com'
+__date__ = '2025-05-31'
+__copyright__ = 'Copyright 2025, isaacenage'
+
+import unittest
+
+import numpy as np
+
+from .. import tiepoint_spatial
+
+
+class NearestIndexTest(unittest.TestCase):
+    """Test k-nearest queries with and without SciPy."""
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.easting = rng.uniform(400000, 600000, 2000)
+        self.northing = rng.uniform(1000000, 1200000, 2000)
+        self.easting[5] = np.nan
+        self.index = tiepoint_spatial.NearestIndex(self.easting, self.northing)
+
+    def brute_force(self, easting, northing, k):
+        distances = np.hypot(self.easting - easting, self.northing - northing)
+        distances[np.isnan(distances)] = np.inf
+        return np.argsort(distances, kind="stable")[:k]
+
+    def test_nearest_matches_brute_force(self):
+        for easting, northing in ((500000, 1100000), (self.easting[7], self.northing[7])):
+            ids, distances = self.index.nearest(easting, northing, 10)
+            np.testing.assert_array_equal(ids, self.brute_force(easting, northing, 10))
+            self.assertTrue(np.all(np.diff(distances) >= 0))
+        self.assertEqual(self.index.nearest(self.easting[7], self.northing[7], 1)[0][0], 7)
+
+    def test_numpy_fallback(self):
+        self.index.tree = None
+        ids, _ = self.index.nearest(500000, 1100000, 10)
+        np.testing.assert_array_equal(ids, self.brute_force(500000, 1100000, 10))
+
+    def test_points_without_coordinates_are_skipped(self):
+        self.assertEqual(len(self.index), 1999)
+        self.assertNotIn(5, self.index.nearest(500000, 1100000, 1999)[0])
+        empty = tiepoint_spatial.NearestIndex(np.empty(0), np.empty(0))
+        self.assertEqual(len(empty.nearest(0, 0, 5)[0]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+# coding=utf-8
+"""Tie point store tests.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'isaacenagework@gmail.com'
+__date__ = '2025-05-31'
+__copyright__ = 'Copyright 2025, isaacenage'
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+
+from .. import tiepoint_store
+
+RAW_TIEPOINTS = [
+    {"TIE POINT NAME": "BLLM 1", "DESCRIPTION": "Cebu Cadastre", "PROVINCE": "CEBU",
+     "MUNICIPALITY": "DANAO CITY", "NORTHING": 1150000.5, "EASTING": 520000.25},
+    {"TIE POINT NAME": "BBM 2", "DESCRIPTION": None, "PROVINCE": "BOHOL",
+     "MUNICIPALITY": None, "NORTHING": "1080000,75", "EASTING": 600000},
+    {"TIE POINT NAME": None, "PROVINCE": "BOHOL", "NORTHING": 0, "EASTING": 0},
+    {"TIE POINT NAME": "  ", "PROVINCE": "BOHOL", "NORTHING": 0, "EASTING": 0},
+    {"TIE POINT NAME": "MBM 3", "PROVINCE": None, "NORTHING": 0, "EASTING": 0},
+]
+
+
+class TiePointStoreTest(unittest.TestCase):
+    """Test compiling and opening the tie point store."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.json_path = os.path.join(self.directory.name, "tiepoints.json")
+        self.store_path = os.path.join(self.directory.name, "tiepoints.npz")
+        with open(self.json_path, "w", encoding="utf-8") as f:
+            json.dump(RAW_TIEPOINTS, f)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_build_applies_cleaning(self):
+        tiepoint_store.build_store(self.json_path, self.store_path)
+        store = tiepoint_store.open_store(self.store_path)
+
+        self.assertEqual(store.column("name"), ["BLLM 1", "BBM 2"])
+        self.assertEqual(store.column("municipality"), ["DANAO CITY", "BOHOL"])
+        self.assertEqual(store.column("description"), ["Cebu Cadastre", ""])
+        np.testing.assert_array_equal(store.northing, [1150000.5, 1080000.75])
+        self.assertEqual(store.row(1)["easting"], 600000.0)
+
+    def test_sort_keys_order_rows(self):
+        store = tiepoint_store.TiePointStore(tiepoint_store.compile_records(RAW_TIEPOINTS))
+        self.assertEqual(list(np.argsort(store.sort_key("name"))), [1, 0])
+        self.assertEqual(list(np.argsort(store.sort_key("northing"))), [1, 0])
+
+    def test_zones_come_from_province(self):
+        store = tiepoint_store.TiePointStore(tiepoint_store.compile_records(RAW_TIEPOINTS))
+        self.assertEqual(store.zone.tolist(), [4, 5])
+        self.assertEqual(store.row(0)["zone"], 4)
+        self.assertEqual(store.nearest_index(5).ids.tolist(), [1])
+
+    def test_nearest_in_a_zone_ignores_other_zones(self):
+        # Same grid coordinates in zone 4 (Cebu) and zone 5 (Bohol), hundreds of km apart
+        raw = [
+            {"TIE POINT NAME": "BLLM 1", "PROVINCE": "CEBU", "NORTHING": 1150000, "EASTING": 520000},
+            {"TIE POINT NAME": "BLLM 2", "PROVINCE": "BOHOL", "NORTHING": 1150010, "EASTING": 520000},
+        ]
+        store = tiepoint_store.TiePointStore(tiepoint_store.compile_records(raw))
+        ids, distances = store.nearest_in_crs(520000, 1150010, "EPSG:3124", k=2)
+        self.assertEqual(ids.tolist(), [0])
+        self.assertEqual(distances.tolist(), [10.0])
+        self.assertEqual(store.nearest_in_crs(520000, 1150000, "EPSG:3125", k=2)[0].tolist(), [1])
+
+    def test_corrupt_store_is_rejected(self):
+        arrays = tiepoint_store.compile_records(RAW_TIEPOINTS)
+        arrays["easting"] = arrays["easting"] + 1.0
+        np.savez(self.store_path, **arrays)
+        with self.assertRaises(tiepoint_store.StoreError):
+            tiepoint_store.open_store(self.store_path)
+
+    def test_truncated_store_is_rebuilt(self):
+        tiepoint_store.build_store(self.json_path, self.store_path)
+        with open(self.store_path, "r+b") as f:
+            f.truncate(os.path.getsize(self.store_path) // 2)
+        with self.assertRaises(tiepoint_store.StoreError):
+            tiepoint_store.open_store(self.store_path)
+
+        store = tiepoint_store.load_store(self.store_path, self.json_path)
+        self.assertEqual(len(store), 2)
+        self.assertEqual(len(tiepoint_store.open_store(self.store_path)), 2)
+
+    def test_stale_store_is_rebuilt(self):
+        tiepoint_store.build_store(self.json_path, self.store_path)
+        with open(self.json_path, "w", encoding="utf-8") as f:
+            json.dump(RAW_TIEPOINTS[:1], f)
+        stale_time = os.path.getmtime(self.json_path) - 10
+        os.utime(self.store_path, (stale_time, stale_time))
+
+        store = tiepoint_store.load_store(self.store_path, self.json_path)
+        self.assertEqual(len(store), 1)
+        self.assertEqual(len(tiepoint_store.open_store(self.store_path)), 1)
+
+    def test_missing_files_give_empty_store(self):
+        store = tiepoint_store.load_store(self.store_path, self.json_path + ".missing")
+        self.assertEqual(len(store), 0)
+        self.assertEqual(store.column("name"), [])
+
+    def test_background_load_does_not_block_callers(self):
+        started, release = threading.Event(), threading.Event()
+
+        def slow_load():
+            started.set()
+            release.wait(5)
+            return tiepoint_store.TiePointStore(tiepoint_store.compile_records(RAW_TIEPOINTS))
+
+        load_store = tiepoint_store.load_store
+        tiepoint_store.load_store = slow_load
+        try:
+            loader = tiepoint_store.load_in_background()
+            self.assertTrue(started.wait(5))
+            # Asking again while the load runs returns at once with the same thread
+            self.assertIs(tiepoint_store.load_in_background(), loader)
+            self.assertFalse(tiepoint_store.is_loaded())
+            release.set()
+            loader.join(5)
+            self.assertTrue(tiepoint_store.is_loaded())
+        finally:
+            release.set()
+            tiepoint_store.load_store = load_store
+            tiepoint_store._STORE = None
+            tiepoint_store._LOADER = None
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+# coding=utf-8
+"""Traverse engine tests.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'isaacenagework@gmail.com'
+__date__ = '2025-05-31'
+__copyright__ = 'Copyright 2025, isaacenage'
+
+import math
+import unittest
+
+import numpy as np
+
+from .. import traverse
+
+# A 100 x 150 m rectangle tied 50 m north of the tie point
+RECTANGLE_ROWS = [
+    ("N", "0", "0", "E", "50"),
+    ("N", "69", "16", "E", "100.00"),
+    ("S", "20", "44", "E", "150,00"),
+    ("S", "69", "16", "W", "100.00"),
+    ("N", "20", "44", "W", "150.00"),
+]
+
+
+def loop_corners(tie_easting, tie_northing, rows):
+    """Reference implementation: walk the lines one at a time with math."""
+    coords = []
+    current_e, current_n = tie_easting, tie_northing
+    for ns, deg, minute, ew, distance in rows:
+        angle = math.radians(int(deg) + int(minute) / 60)
+        delta_lat = round(float(distance.replace(",", ".")) * math.cos(angle), 3)
+        delta_dep = round(float(distance.replace(",", ".")) * math.sin(angle), 3)
+        current_n += -delta_lat if ns == "S" else delta_lat
+        current_e += -delta_dep if ew == "W" else delta_dep
+        coords.append((current_e, current_n))
+    return coords
+
+
+class TraverseTest(unittest.TestCase):
+    """Test the vectorized traverse against the line-by-line method."""
+
+    def test_bearing_to_azimuth(self):
+        azimuth = traverse.bearing_to_azimuth(
+            np.array(["N", "S", "S", "N"]), [69, 20, 69, 20], [16, 44, 16, 44], np.array(["E", "E", "W", "W"]))
+        np.testing.assert_allclose(azimuth, [69.26666667, 159.26666667, 249.26666667, 339.26666667])
+
+    def test_trig_tables_match_math(self):
+        sin, cos = traverse.bearing_trig([0, 20, 69, 90], [0, 44, 16, 0])
+        for i, (deg, minute) in enumerate([(0, 0), (20, 44), (69, 16), (90, 0)]):
+            self.assertEqual(sin[i], math.sin(math.radians(deg + minute / 60)))
+            self.assertEqual(cos[i], math.cos(math.radians(deg + minute / 60)))
+        sin, _ = traverse.bearing_trig([20], [44], [30])
+        self.assertAlmostEqual(sin[0], math.sin(math.radians(20 + 44 / 60 + 30 / 3600)), places=12)
+
+    def test_lot_corners_match_loop(self):
+        lines = traverse.parse_bearing_rows(RECTANGLE_ROWS)
+        corners = traverse.lot_corners(1000.0, 2000.0, *lines)
+        self.assertEqual(corners.tolist(), [list(c) for c in loop_corners(1000.0, 2000.0, RECTANGLE_ROWS[:-1])])
+
+    def test_traverse_lots_restarts_at_each_tie_point(self):
+        ns, deg, minutes, ew, distance = traverse.parse_bearing_rows(RECTANGLE_ROWS * 2)
+        delta_lat, delta_dep = traverse.calculate_deltas(ns, deg, minutes, ew, distance)
+        coords = traverse.traverse_lots([1000.0, 5000.0], [2000.0, 7000.0], [0, 5, 10], delta_lat, delta_dep)
+        np.testing.assert_allclose(coords[:5], loop_corners(1000.0, 2000.0, RECTANGLE_ROWS))
+        np.testing.assert_allclose(coords[5:], loop_corners(5000.0, 7000.0, RECTANGLE_ROWS))
+
+    def test_invalid_row_is_reported(self):
+        rows = list(RECTANGLE_ROWS)
+        rows[2] = ("S", "95", "44", "E", "150")
+        with self.assertRaisesRegex(ValueError, "Bearing row 3"):
+            traverse.parse_bearing_rows(rows)
+
+    def test_polygon_wkt_is_closed(self):
+        wkt = traverse.polygon_wkt([(0.0, 0.0), (1.0, 0.0), (1.0, 1.0)])
+        self.assertEqual(wkt, "POLYGON ((0.0 0.0, 1.0 0.0, 1.0 1.0, 0.0 0.0))")
+
+
+class TraverseCacheTest(unittest.TestCase):
+    """Test that patching single lines matches a full recomputation."""
+
+    def full_corners(self, tie, rows):
+        lines = traverse.parse_bearing_rows(rows)
+        return traverse.traverse(tie[0], tie[1], *traverse.calculate_deltas(*lines)).tolist()
+
+    def test_edit_single_line(self):
+        cache = traverse.TraverseCache()
+        cache.set_tie(1000.0, 2000.0)
+        rows = RECTANGLE_ROWS[:-1]
+        cache.set_rows(rows)
+        self.assertEqual(cache.corners().tolist(), self.full_corners((1000.0, 2000.0), rows))
+
+        edited = list(rows)
+        edited[2] = ("S", "20", "45", "E", "150.10")
+        self.assertTrue(cache.set_line(2, edited[2]))
+        self.assertFalse(cache.set_line(2, edited[2]))
+        self.assertEqual(cache.first_changed, 2)
+        self.assertEqual(cache.corners().tolist(), self.full_corners((1000.0, 2000.0), edited))
+        self.assertEqual(cache.wkt(), traverse.polygon_wkt(self.full_corners((1000.0, 2000.0), edited)))
+
+    def test_invalid_line_and_resize(self):
+        cache = traverse.TraverseCache()
+        cache.set_tie(0.0, 0.0)
+        cache.set_rows(RECTANGLE_ROWS[:-1])
+        cache.set_line(1, ("N", "", "16", "E", "100"))
+        self.assertIsNone(cache.corners())
+
+        cache.set_rows(RECTANGLE_ROWS)
+        self.assertEqual(cache.corners().tolist(), self.full_corners((0.0, 0.0), RECTANGLE_ROWS))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+"""Trigram search over tie point names, descriptions and municipalities.
+
+Texts are folded before indexing and searching: lower cased, stripped of
+accents, spaces and punctuation, "No." in front of a number is dropped and
+letters that OCR confuses with digits are mapped to the digit (B -> 8,
+O -> 0, I/L -> 1, S -> 5, Z -> 2, G -> 6). "BLLM 1", "BLLM No.1" and
+"8LLM 1" therefore all fold to the same text.
+
+Province and municipality are categorical: their distinct values are kept
+once with the ids of the records of every value grouped together, so a
+province filter is a slice and a municipality is matched among the
+distinct names only.
+
+The inverted index maps every trigram of the folded texts to the sorted ids
+of the records containing it. It is built once by the tie point store
+compiler and kept as three arrays (trigram codes, offsets, postings), so a
+query is a few binary searches and one ``np.bincount`` over the postings of
+its trigrams. This module has no Qt dependency.
+"""
+
+import bisect
+import re
+import unicodedata
+
+import numpy as np
+
+ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+OCR_FOLD = str.maketrans({"b": "8", "o": "0", "i": "1", "l": "1", "s": "5", "z": "2", "g": "6"})
+NUMBER_PREFIX = re.compile(r"\b(?:no|nr)\.?\s*(?=\d)|#")
+NOT_ALPHANUMERIC = re.compile(r"[^a-z0-9]")
+
+# Fraction of the query trigrams a record must contain to count as a fuzzy match
+MIN_SIMILARITY = 0.5
+
+# Byte value -> position in ALPHABET
+_CHAR_CODES = np.zeros(256, dtype=np.int64)
+_CHAR_CODES[np.frombuffer(ALPHABET.encode("ascii"), dtype=np.uint8)] = np.arange(len(ALPHABET))
+
+
+def fold(text):
+    """Return the search form of a text."""
+    text = unicodedata.normalize("NFKD", str(text).lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = NUMBER_PREFIX.sub("", text)
+    return NOT_ALPHANUMERIC.sub("", text).translate(OCR_FOLD)
+
+
+def _trigram_codes(texts):
+    """Return (trigram codes, record ids) of all trigrams of folded texts."""
+    lengths = np.array([len(text) for text in texts], dtype=np.int64)
+    chars = _CHAR_CODES[np.frombuffer("".join(texts).encode("ascii"), dtype=np.uint8)]
+    if len(chars) < 3:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    records = np.repeat(np.arange(len(texts)), lengths)
+    codes = chars[:-2] * len(ALPHABET) ** 2 + chars[1:-1] * len(ALPHABET) + chars[2:]
+    # Windows that span two records are not trigrams of either
+    within = records[:-2] == records[2:]
+    return codes[within], records[:-2][within]
+
+
+def build_trigram_index(texts):
+    """Build the inverted index of a list of folded texts.
+
+    Returns:
+        Tuple (grams, offsets, postings): sorted unique trigram codes, and
+        for trigram ``grams[i]`` the sorted record ids
+        ``postings[offsets[i]:offsets[i+1]]``.
+    """
+    codes, records = _trigram_codes(texts)
+    # One (trigram, record) pair per record even if the trigram repeats
+    pairs = np.unique(codes * max(len(texts), 1) + records)
+    pair_grams = pairs // max(len(texts), 1)
+    grams, first = np.unique(pair_grams, return_index=True)
+    offsets = np.append(first, len(pairs)).astype(np.int64)
+    postings = (pairs % max(len(texts), 1)).astype(np.int32)
+    return grams.astype(np.int32), offsets, postings
+
+
+class TrigramIndex:
+    """Ranked substring and typo-tolerant search over one text column."""
+
+    def __init__(self, texts, grams, offsets, postings):
+        # Folded texts, only scanned for queries shorter than a trigram
+        self.texts = texts
+        self.grams = grams
+        self.offsets = offsets
+        self.postings = postings
+        self.lengths = np.array([len(text) for text in texts], dtype=np.int64)
+        first_codes, first_records = _trigram_codes([text[:3] for text in texts])
+        self.first_grams = np.full(len(texts), -1, dtype=np.int64)
+        self.first_grams[first_records] = first_codes
+        # Texts too short to have a trigram, searched by scanning
+        self.short_ids = np.flatnonzero(self.lengths < 3)
+
+    @classmethod
+    def from_texts(cls, texts):
+        """Fold and index a list of raw texts."""
+        folded = [fold(text) for text in texts]
+        return cls(folded, *build_trigram_index(folded))
+
+    def __len__(self):
+        return len(self.texts)
+
+    def match(self, query):
+        """Return (ids, scores) of the records matching a query, ids ascending.
+
+        Records containing the folded query score 1 plus their trigram
+        similarity, those starting with it 2 plus, and an exact match 3 plus.
+        Records sharing at least MIN_SIMILARITY of the query trigrams match
+        with their similarity alone. Among equal scores, texts closer to the
+        query length score slightly higher.
+        """
+        folded = fold(query)
+        if not folded:
+            return np.arange(len(self.texts)), np.zeros(len(self.texts))
+        if len(folded) < 3:
+            return self._match_short(folded)
+
+        query_grams, _ = _trigram_codes([folded])
+        query_grams = np.unique(query_grams)
+        positions = np.searchsorted(self.grams, query_grams)
+        positions = positions[positions < len(self.grams)]
+        positions = positions[np.isin(self.grams[positions], query_grams)]
+        counts = self._posting_counts(positions)
+        ids = np.flatnonzero(counts >= max(MIN_SIMILARITY * len(query_grams), 1))
+        similarity = counts[ids] / len(query_grams)
+
+        # Every query trigram present is taken as containing the query
+        contains = similarity == 1.0
+        starts = contains & (self.first_grams[ids] == _trigram_codes([folded[:3]])[0][0])
+        exact = starts & (self.lengths[ids] == len(folded))
+        closeness = 1e-3 * np.abs(self.lengths[ids] - len(folded))
+        return ids, similarity + contains + starts + exact - closeness
+
+    def _posting_counts(self, positions):
+        """Return how many of the trigrams at the given positions each record contains."""
+        if not len(positions):
+            return np.zeros(len(self.texts), dtype=np.int64)
+        postings = np.concatenate([self.postings[self.offsets[p]:self.offsets[p + 1]] for p in positions])
+        return np.bincount(postings, minlength=len(self.texts))
+
+    def _match_short(self, folded):
+        """Match a query of one or two characters through the trigrams containing it."""
+        size = len(ALPHABET)
+        code = int(_CHAR_CODES[ord(folded[0])])
+        if len(folded) == 2:
+            code = code * size + int(_CHAR_CODES[ord(folded[1])])
+            within = (self.grams // size == code) | (self.grams % size ** 2 == code)
+            first = self.first_grams // size
+        else:
+            within = (self.grams // size ** 2 == code) | (self.grams // size % size == code) | (self.grams % size == code)
+            first = self.first_grams // size ** 2
+        found = self._posting_counts(np.flatnonzero(within)) > 0
+        found[[i for i in self.short_ids if folded in self.texts[i]]] = True
+
+        ids = np.flatnonzero(found)
+        starts = (first[ids] == code) & (self.first_grams[ids] >= 0)
+        for j in np.flatnonzero(self.lengths[ids] < 3):
+            starts[j] = self.texts[ids[j]].startswith(folded)
+        exact = self.lengths[ids] == len(folded)
+        closeness = 1e-3 * np.abs(self.lengths[ids] - len(folded))
+        return ids, 2.0 + starts + exact - closeness
+
+
+def build_categories(values):
+    """Group the records of a text column by value.
+
+    Returns:
+        Tuple (names, codes, order, offsets): the sorted distinct values,
+        each record's position in names, and the record ids grouped by
+        value; the records with value ``names[c]`` are
+        ``order[offsets[c]:offsets[c+1]]`` in ascending order.
+    """
+    names, codes = np.unique(np.array(values, dtype=str), return_inverse=True)
+    codes = codes.ravel().astype(np.int32)
+    order = np.argsort(codes, kind="stable").astype(np.int32)
+    offsets = np.zeros(len(names) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=len(names)), out=offsets[1:])
+    return names.tolist(), codes, order, offsets
+
+
+class CategoryColumn:
+    """A categorical text column: distinct names, record codes and record groups."""
+
+    def __init__(self, names, codes, order, offsets):
+        self.names = names
+        self.codes = codes
+        self.order = order
+        self.offsets = offsets
+
+    @classmethod
+    def from_values(cls, values):
+        return cls(*build_categories(values))
+
+    def code(self, name):
+        """Return the code of a name, or -1 if no record has it."""
+        code = bisect.bisect_left(self.names, name)
+        return code if code < len(self.names) and self.names[code] == name else -1
+
+    def members(self, code):
+        """Return the ascending ids of the records with a code."""
+        return self.order[self.offsets[code]:self.offsets[code + 1]].astype(np.int64)
+
+    def expand(self, codes, scores):
+        """Return (ids, scores) of the records of several codes, ids ascending.
+
+        Every record gets the score of its code.
+        """
+        codes = np.asarray(codes, dtype=np.int64)
+        starts = self.offsets[codes]
+        sizes = self.offsets[codes + 1] - starts
+        # Position of every record within its group, shifted to the group start
+        group_ends = np.cumsum(sizes)
+        positions = np.arange(group_ends[-1] if len(sizes) else 0) + np.repeat(starts - (group_ends - sizes), sizes)
+        ids = self.order[positions].astype(np.int64)
+        scores = np.repeat(scores, sizes)
+        ascending = np.argsort(ids, kind="stable")
+        return ids[ascending], scores[ascending]
+
+
+class TiePointSearch:
+    """Combined search over the name, description, municipality and province of tie points."""
+
+    def __init__(self, name_index, description_index, municipality_index, municipalities, provinces):
+        """Combine the indexes of the searchable fields.
+
+        name_index and description_index cover the records, municipality_index
+        the distinct municipality names. municipalities and provinces are
+        CategoryColumns.
+        """
+        self.indexes = {
+            "name": name_index,
+            "description": description_index,
+            "municipality": municipality_index,
+        }
+        self.municipalities = municipalities
+        self.provinces = provinces
+
+    def __len__(self):
+        return len(self.provinces.codes)
+
+    def _rank(self, name, description, municipality, province, cancelled=None):
+        """Return (ids, scores) of the matching tie points in store order.
+
+        Scores is None without text filters. Returns None if ``cancelled()``
+        turns True between the field lookups.
+        """
+        ids = None
+        score = None
+        for field, query in (("name", name), ("description", description), ("municipality", municipality)):
+            if not fold(query):
+                continue
+            if cancelled is not None and cancelled():
+                return None
+            field_ids, field_score = self.indexes[field].match(query)
+            if field == "municipality":
+                field_ids, field_score = self.municipalities.expand(field_ids, field_score)
+            if ids is None:
+                ids, score = field_ids, field_score
+            else:
+                # Intersect through a dense score array; cheaper than sorting both id sets
+                dense = np.full(len(self), np.nan)
+                dense[field_ids] = field_score
+                other = dense[ids]
+                keep = ~np.isnan(other)
+                ids, score = ids[keep], score[keep] + other[keep]
+        if province:
+            code = self.provinces.code(province)
+            if code < 0:
+                return np.empty(0, dtype=np.int64), None
+            if ids is None:
+                ids = self.provinces.members(code)
+            else:
+                keep = self.provinces.codes[ids] == code
+                ids, score = ids[keep], score[keep]
+        if ids is None:
+            ids = np.arange(len(self))
+        return ids, score
+
+    @staticmethod
+    def _best(ids, score, limit):
+        """Return the ``limit`` best ids, sorted by descending score."""
+        if len(ids) > limit:
+            # Only the best `limit` matches need to be sorted
+            best = np.sort(np.argpartition(-score, limit - 1)[:limit])
+            ids, score = ids[best], score[best]
+        # Stable sort keeps the store order among equal scores
+        return ids[np.argsort(-score, kind="stable")]
+
+    def search(self, name="", description="", municipality="", province="", limit=None):
+        """Return tie point ids matching all given filters, best matches first.
+
+        Text filters are ranked substring/fuzzy matches, the province must
+        match exactly. Without text filters the ids keep the store order.
+        Only the matching ids are scored and sorted, never the whole store.
+        """
+        ids, score = self._rank(name, description, municipality, province)
+        if score is None:
+            return ids if limit is None else ids[:limit]
+        return self._best(ids, score, len(ids) if limit is None else limit)
+
+    def search_pages(self, page_size, name="", description="", municipality="", province="", cancelled=None):
+        """Yield the ids of search() in pages of ``page_size``, best matches first.
+
+        The first page is picked with a partial sort, so it is ready before
+        the remaining matches are sorted. At least one (possibly empty) page
+        is yielded unless ``cancelled()`` turns True, which stops the search
+        at the next field lookup or page.
+        """
+        ranked = self._rank(name, description, municipality, province, cancelled)
+        if ranked is None:
+            return
+        ids, score = ranked
+        if score is None:
+            order = ids
+        else:
+            first = self._best(ids, score, page_size)
+            yield first
+            if len(ids) <= page_size or (cancelled is not None and cancelled()):
+                return
+            order = self._best(ids, score, len(ids))
+            # Ties at the page boundary may be ordered differently by the partial sort
+            order = order[~np.isin(order, first)]
+        for start in range(0, max(len(order), 1), page_size):
+            if cancelled is not None and cancelled():
+                return
+            yield order[start:start + page_size]
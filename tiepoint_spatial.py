@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""Nearest tie point lookup by position.
+
+Tie points are indexed by easting and northing in a k-d tree when SciPy is
+available (it ships with most QGIS installs); otherwise distances to all
+tie points are computed with NumPy, which is still fast enough for the
+national database. Tie points without coordinates are left out. SciPy is
+imported when the first index is built, not at import, since importing
+scipy.spatial alone would slow down QGIS startup. This module has no Qt
+dependency.
+"""
+
+import functools
+
+import numpy as np
+
+
+@functools.lru_cache(maxsize=None)
+def kdtree_class():
+    """Return SciPy's cKDTree, or None if SciPy is not installed; imported once."""
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError:
+        return None
+    return cKDTree
+
+
+class NearestIndex:
+    """Spatial index answering k-nearest tie point queries."""
+
+    def __init__(self, easting, northing, ids=None):
+        """Index the tie points with the given ids, or all of them."""
+        easting = np.asarray(easting, dtype=np.float64)
+        northing = np.asarray(northing, dtype=np.float64)
+        ids = np.arange(len(easting)) if ids is None else np.asarray(ids, dtype=np.int64)
+        # Store ids of the tie points with coordinates
+        self.ids = ids[np.isfinite(easting[ids]) & np.isfinite(northing[ids])]
+        self.easting = np.ascontiguousarray(easting[self.ids])
+        self.northing = np.ascontiguousarray(northing[self.ids])
+        self.tree = None
+        cKDTree = kdtree_class() if len(self.ids) else None
+        if cKDTree is not None:
+            self.tree = cKDTree(np.column_stack([self.easting, self.northing]))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def nearest(self, easting, northing, k=10):
+        """Return (ids, distances) of the k tie points closest to a position, nearest first."""
+        k = min(k, len(self.ids))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        if self.tree is not None:
+            distances, positions = self.tree.query((easting, northing), k=k)
+            return self.ids[np.atleast_1d(positions)], np.atleast_1d(distances)
+
+        squared = (self.easting - easting) ** 2 + (self.northing - northing) ** 2
+        if k < len(squared):
+            positions = np.argpartition(squared, k - 1)[:k]
+        else:
+            positions = np.arange(len(squared))
+        positions = positions[np.argsort(squared[positions], kind="stable")]
+        return self.ids[positions], np.sqrt(squared[positions])
@@ -0,0 +1,402 @@
+# -*- coding: utf-8 -*-
+"""Compiled tie point database.
+
+``resources/tiepoints.json`` is cleaned once by an offline build step
+(``scripts/build_tiepoint_store.py``) and written to
+``resources/tiepoints.npz`` as plain columnar arrays: every text column is
+one UTF-8 buffer with character offsets per tie point, and northings and
+eastings are float64 arrays. Opening the store is a few array reads instead
+of parsing and cleaning the JSON on every plugin import.
+
+Province and municipality are stored as categories: the distinct names
+once, a code per tie point and the tie point ids grouped by code (see
+tiepoint_search.build_categories), so filtering by them reads one slice.
+The PRS92 zone of every tie point is looked up from its province and
+municipality when the store is compiled (see prs92_zones).
+
+The store records a SHA-256 checksum of its arrays, which is verified when
+it is opened. The name and description columns and the distinct
+municipality names also carry their folded texts and trigram index (see
+tiepoint_search), so searching needs no index building at run time.
+
+This module has no Qt dependency and importing it costs nothing at QGIS
+startup. The shared tie points are loaded on first use by get_store(), or
+ahead of time in a background thread by load_in_background().
+"""
+
+import hashlib
+import json
+import os
+import threading
+import zipfile
+import zlib
+
+import numpy as np
+
+from . import coordinate_transform
+from . import prs92_zones
+from . import tiepoint_search
+from . import tiepoint_spatial
+
+STORE_VERSION = 4
+
+RESOURCES_DIR = os.path.join(os.path.dirname(__file__), "resources")
+JSON_PATH = os.path.join(RESOURCES_DIR, "tiepoints.json")
+STORE_PATH = os.path.join(RESOURCES_DIR, "tiepoints.npz")
+
+# Store field -> column name of the JSON (after title casing) and of the selector table
+TEXT_FIELDS = {
+    "name": "Tie Point Name",
+    "description": "Description",
+    "province": "Province",
+    "municipality": "Municipality",
+}
+COORDINATE_FIELDS = {
+    "northing": "Northing",
+    "easting": "Easting",
+}
+# Text fields stored as categories
+CATEGORY_FIELDS = ("province", "municipality")
+# Text fields with a trigram search index, over the distinct names of category fields
+SEARCH_FIELDS = ("name", "description", "municipality")
+
+
+# Shared tie points, loaded on first use
+_STORE = None
+# Held for the whole load, so concurrent callers of get_store wait for one load
+_LOAD_LOCK = threading.RLock()
+# Held only briefly, to start the loader thread; never while loading
+_LOADER_LOCK = threading.Lock()
+_LOADER = None
+
+
+class StoreError(Exception):
+    """Raised when a compiled tie point store is unreadable or corrupt."""
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+
+def _to_float(value):
+    try:
+        return float(str(value).strip().replace(",", "."))
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def clean_records(raw_data):
+    """Clean raw tie point records into column lists.
+
+    Keys are title cased ("PROVINCE" -> "Province"), a missing Municipality
+    is filled in with the Province and records without a tie point name or
+    province are dropped.
+
+    Returns:
+        Dict of store field -> list of values.
+    """
+    columns = {field: [] for field in list(TEXT_FIELDS) + list(COORDINATE_FIELDS)}
+    for raw_row in raw_data:
+        row = {key.title(): value for key, value in raw_row.items()}
+        name = row.get("Tie Point Name")
+        province = row.get("Province")
+        if _is_missing(name) or _is_missing(province) or str(name).strip() == "":
+            continue
+        municipality = row.get("Municipality")
+        if _is_missing(municipality):
+            municipality = province
+        description = row.get("Description")
+
+        columns["name"].append(str(name))
+        columns["description"].append("" if _is_missing(description) else str(description))
+        columns["province"].append(str(province))
+        columns["municipality"].append(str(municipality))
+        columns["northing"].append(_to_float(row.get("Northing")))
+        columns["easting"].append(_to_float(row.get("Easting")))
+    return columns
+
+
+def _encode_text(values):
+    """Return (UTF-8 buffer, character offsets) for a list of strings."""
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in values], out=offsets[1:])
+    data = np.frombuffer("".join(values).encode("utf-8"), dtype=np.uint8)
+    return data, offsets
+
+
+def _checksum(arrays):
+    digest = hashlib.sha256()
+    for key in sorted(arrays):
+        if key != "checksum":
+            digest.update(key.encode("utf-8"))
+            digest.update(np.ascontiguousarray(arrays[key]).tobytes())
+    return digest.hexdigest()
+
+
+def compile_records(raw_data):
+    """Clean raw records and return the arrays of a store."""
+    columns = clean_records(raw_data)
+    arrays = {"version": np.array(STORE_VERSION)}
+    search_texts = {}
+    for field in TEXT_FIELDS:
+        if field in CATEGORY_FIELDS:
+            names, arrays[f"{field}_codes"], arrays[f"{field}_order"], arrays[f"{field}_group_offsets"] = \
+                tiepoint_search.build_categories(columns[field])
+            arrays[f"{field}_names_data"], arrays[f"{field}_names_offsets"] = _encode_text(names)
+            search_texts[field] = names
+        else:
+            arrays[f"{field}_data"], arrays[f"{field}_offsets"] = _encode_text(columns[field])
+            search_texts[field] = columns[field]
+    for field in SEARCH_FIELDS:
+        folded = [tiepoint_search.fold(value) for value in search_texts[field]]
+        arrays[f"{field}_folded_data"], arrays[f"{field}_folded_offsets"] = _encode_text(folded)
+        (arrays[f"{field}_grams"], arrays[f"{field}_gram_offsets"],
+         arrays[f"{field}_postings"]) = tiepoint_search.build_trigram_index(folded)
+    for field in COORDINATE_FIELDS:
+        arrays[field] = np.array(columns[field], dtype=np.float64)
+    arrays["zone"] = prs92_zones.zone_codes(columns["province"], columns["municipality"])
+    arrays["checksum"] = np.array(_checksum(arrays))
+    return arrays
+
+
+def build_store(json_path=JSON_PATH, store_path=STORE_PATH):
+    """Compile a tie point JSON file into a store file and return the opened store."""
+    with open(json_path, "r", encoding="utf-8") as f:
+        raw_data = json.load(f)
+    arrays = compile_records(raw_data)
+    # Write next to the target and rename, so a reader never sees half a file
+    temp_path = store_path + ".tmp.npz"
+    np.savez(temp_path, **arrays)
+    os.replace(temp_path, store_path)
+    return TiePointStore(arrays)
+
+
+def open_store(store_path=STORE_PATH):
+    """Open a compiled store and verify its version and checksum.
+
+    Raises:
+        StoreError: If the file is not a valid store.
+    """
+    try:
+        with np.load(store_path, allow_pickle=False) as npz:
+            arrays = {key: npz[key] for key in npz.files}
+    except (OSError, ValueError, EOFError, KeyError, zipfile.BadZipFile, zlib.error) as e:
+        # A truncated or damaged archive fails in the zip layer rather than in NumPy
+        raise StoreError(f"Cannot read tie point store {store_path}: {e}")
+    if "version" not in arrays or int(arrays["version"]) != STORE_VERSION:
+        raise StoreError(f"Tie point store {store_path} has an unsupported version")
+    if "checksum" not in arrays or str(arrays["checksum"]) != _checksum(arrays):
+        raise StoreError(f"Tie point store {store_path} is corrupt (checksum mismatch)")
+    return TiePointStore(arrays)
+
+
+def load_store(store_path=STORE_PATH, json_path=JSON_PATH):
+    """Return the tie point store, compiling it from the JSON when needed.
+
+    The compiled store is used unless the JSON is newer. A missing, stale or
+    corrupt store is rebuilt from the JSON; if it cannot be written the
+    cleaned data is still returned. Without either file the store is empty.
+    """
+    has_json = os.path.exists(json_path)
+    if os.path.exists(store_path):
+        if not has_json or os.path.getmtime(store_path) >= os.path.getmtime(json_path):
+            try:
+                return open_store(store_path)
+            except StoreError as e:
+                if not has_json:
+                    raise
+                print(f"{e}; rebuilding it from {json_path}")
+    if not has_json:
+        return TiePointStore(compile_records([]))
+    try:
+        return build_store(json_path, store_path)
+    except OSError as e:
+        print(f"Could not write tie point store {store_path}: {e}")
+        with open(json_path, "r", encoding="utf-8") as f:
+            return TiePointStore(compile_records(json.load(f)))
+
+
+class TiePointStore:
+    """Read access to the columns of a compiled tie point store.
+
+    Text columns are decoded from their UTF-8 buffer on first access;
+    category columns share one string per distinct name.
+    """
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self.northing = arrays["northing"]
+        self.easting = arrays["easting"]
+        self.zone = arrays["zone"]
+        self.checksum = str(arrays["checksum"])
+        self._text = {}
+        self._categories = {}
+        self._sort_keys = {}
+        self._search = None
+        # Nearest tie point indexes per zone, None for all tie points
+        self._nearest = {}
+
+    def __len__(self):
+        return len(self.northing)
+
+    def _decode(self, key):
+        text = self.arrays[f"{key}_data"].tobytes().decode("utf-8")
+        offsets = self.arrays[f"{key}_offsets"].tolist()
+        return [text[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+    def column(self, field):
+        """Return a text column (name, description, province or municipality) as a list."""
+        if field not in self._text:
+            if field in CATEGORY_FIELDS:
+                categories = self.categories(field)
+                self._text[field] = [categories.names[code] for code in categories.codes.tolist()]
+            else:
+                self._text[field] = self._decode(field)
+        return self._text[field]
+
+    def categories(self, field):
+        """Return the CategoryColumn of province or municipality."""
+        if field not in self._categories:
+            self._categories[field] = tiepoint_search.CategoryColumn(
+                self._decode(f"{field}_names"),
+                self.arrays[f"{field}_codes"],
+                self.arrays[f"{field}_order"],
+                self.arrays[f"{field}_group_offsets"],
+            )
+        return self._categories[field]
+
+    def row(self, index):
+        """Return one tie point as a dict with lower case keys."""
+        record = {field: self.column(field)[index] for field in TEXT_FIELDS}
+        record["northing"] = float(self.northing[index])
+        record["easting"] = float(self.easting[index])
+        record["zone"] = int(self.zone[index])
+        return record
+
+    def sort_key(self, field):
+        """Return an array that orders tie points by a field when sorted.
+
+        Text fields give the rank of each tie point's case folded text,
+        northing and easting their values. Computed once per field, so
+        sorting any subset of ids is a single argsort over this array.
+        """
+        if field in COORDINATE_FIELDS:
+            return self.arrays[field]
+        if field not in self._sort_keys:
+            if field in CATEGORY_FIELDS:
+                # Rank the distinct names only and look the ranks up by code
+                categories = self.categories(field)
+                texts = np.array([name.casefold() for name in categories.names], dtype=str)
+                _, ranks = np.unique(texts, return_inverse=True)
+                self._sort_keys[field] = ranks.ravel().astype(np.int64)[categories.codes]
+            else:
+                texts = np.array([text.casefold() for text in self.column(field)], dtype=str)
+                _, ranks = np.unique(texts, return_inverse=True)
+                self._sort_keys[field] = ranks.ravel().astype(np.int64)
+        return self._sort_keys[field]
+
+    def search_index(self):
+        """Return the trigram search over this store, built from its arrays on first use."""
+        if self._search is None:
+            indexes = [
+                tiepoint_search.TrigramIndex(
+                    self._decode(f"{field}_folded"),
+                    self.arrays[f"{field}_grams"],
+                    self.arrays[f"{field}_gram_offsets"],
+                    self.arrays[f"{field}_postings"],
+                )
+                for field in SEARCH_FIELDS
+            ]
+            self._search = tiepoint_search.TiePointSearch(
+                *indexes, self.categories("municipality"), self.categories("province"))
+        return self._search
+
+
+    def nearest_index(self, zone=None):
+        """Return the nearest tie point index over the stored coordinates, built on first use.
+
+        With a zone only the tie points of that PRS92 zone are indexed.
+        """
+        if zone not in self._nearest:
+            ids = None if zone is None else np.flatnonzero(self.zone == zone)
+            self._nearest[zone] = tiepoint_spatial.NearestIndex(self.easting, self.northing, ids)
+        return self._nearest[zone]
+
+    def nearest_in_crs(self, x, y, crs, k=10):
+        """Return (ids, distances) of the k tie points nearest to a position in a CRS.
+
+        In a PRS92 zone only the tie points of that zone are searched: the
+        zones share their false easting and overlap in northing, so the same
+        coordinates in another zone are a place hundreds of km away. Other
+        CRSs go through nearest_to_position.
+        """
+        zone = prs92_zones.crs_zone(crs)
+        if zone != prs92_zones.UNKNOWN_ZONE:
+            return self.nearest_index(zone).nearest(x, y, k)
+        return self.nearest_to_position(x, y, crs, k)
+
+    def nearest_to_position(self, x, y, crs, k=10):
+        """Return (ids, distances) of the k tie points nearest to a position in any CRS.
+
+        The position is transformed into every PRS92 zone and compared with
+        the tie points of that zone in their own grid, so each tie point
+        needs no transform. Tie points of an unknown zone are left out.
+        """
+        ids, distances = [], []
+        for zone in np.unique(self.zone).tolist():
+            zone_crs = prs92_zones.zone_crs(zone)
+            if zone_crs is None:
+                continue
+            zone_x, zone_y = coordinate_transform.transform_point(x, y, crs, zone_crs)
+            zone_ids, zone_distances = self.nearest_index(zone).nearest(zone_x, zone_y, k)
+            ids.append(zone_ids)
+            distances.append(zone_distances)
+        if not ids:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        ids, distances = np.concatenate(ids), np.concatenate(distances)
+        order = np.argsort(distances, kind="stable")[:k]
+        return ids[order], distances[order]
+
+
+def get_store():
+    """Return the shared tie point store with its search index, loading it on first use.
+
+    Safe to call from any thread; a caller arriving while another thread is
+    loading waits for that load instead of starting a second one.
+    """
+    global _STORE
+    with _LOAD_LOCK:
+        if _STORE is None:
+            store = load_store()
+            store.search_index()
+            _STORE = store
+        return _STORE
+
+
+def is_loaded():
+    """Return True once the shared tie points are ready to use."""
+    return _STORE is not None
+
+
+def _load_quietly():
+    try:
+        get_store()
+    except Exception as e:
+        print(f"Error loading tie points: {e}")
+
+
+def load_in_background():
+    """Start loading the shared tie points in a daemon thread.
+
+    Returns the loader thread, or None if the tie points are already
+    loaded. Calling it again while a load is running returns the same thread.
+    """
+    global _LOADER
+    # Not the load lock: the UI thread calls this and must not wait for a running load
+    with _LOADER_LOCK:
+        if _STORE is not None:
+            return None
+        if _LOADER is None or not _LOADER.is_alive():
+            _LOADER = threading.Thread(target=_load_quietly, name="tiepoint-loader", daemon=True)
+            _LOADER.start()
+        return _LOADER
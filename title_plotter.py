@@ -27,7 +27,7 @@ Key Features:
  *                                                                         *
  ***************************************************************************/
 """
-from qgis.PyQt.QtCore import QSettings, QTranslator, QCoreApplication
+from qgis.PyQt.QtCore import QSettings, QTranslator, QCoreApplication, QTimer
 from qgis.PyQt.QtGui import QIcon
 from qgis.PyQt.QtWidgets import QAction
 from qgis.PyQt import QtWidgets, uic
@@ -35,14 +35,20 @@ from qgis.PyQt.QtCore import Qt
 from qgis.PyQt.QtGui import QPainter, QPen, QColor
 from qgis.PyQt.QtWidgets import QGraphicsScene, QGraphicsLineItem
 from qgis.core import QgsGeometry, QgsFeature, QgsVectorLayer, QgsProject
-import math
 import os
+from . import traverse
+from . import batch_plotter
+from . import tiepoint_store
 from .dialogs.title_plotter_dialog import TitlePlotterPhilippineLandTitlesDialog
-from .dialogs.tie_point_selector_dialog import TiePointSelectorDialog
 
 # Initialize Qt resources from file resources.py
 from . import resources
 
+# QSettings key to warm the tie point database in the background after startup
+PRELOAD_TIEPOINTS_SETTING = "TitlePlotterPH/preloadTiePoints"
+# Delay before warming, so QGIS finishes starting up first
+PRELOAD_DELAY_MS = 3000
+
 class TitlePlotterPhilippineLandTitles:
     """QGIS Plugin Implementation."""
 
@@ -79,10 +85,10 @@ class TitlePlotterPhilippineLandTitles:
         # Must be set in initGui() to survive plugin reloads
         self.first_start = None
 
-        self.dlg = TitlePlotterPhilippineLandTitlesDialog(self.iface)
+        # The dialog is created on first run, see run()
+        self.dlg = None
         self.scene = QGraphicsScene()
         self.current_points = []
-        self.setup_connections()
 
     # noinspection PyMethodMayBeStatic
     def tr(self, message):
@@ -175,9 +181,6 @@ class TitlePlotterPhilippineLandTitles:
     def initGui(self):
         """Create the menu entries and toolbar icons inside the QGIS GUI."""
 
-        # Initialize the dialog
-        self.dlg = TitlePlotterPhilippineLandTitlesDialog(self.iface)
-        
         # Create the action that will start plugin configuration
         icon_path = os.path.join(os.path.dirname(__file__), "icons", "icon.png")
         self.action = QAction(QIcon(icon_path), "Title Plotter – Philippine Land Titles", self.iface.mainWindow())
@@ -189,87 +192,20 @@ class TitlePlotterPhilippineLandTitles:
         # will be set False in run()
         self.first_start = True
 
-        self.setup_connections()
-
-    def setup_connections(self):
-        """Set up signal connections for the dialog."""
-        self.dlg.openTiePointDialogButton.clicked.connect(self.open_tiepoint_selector)
-        self.dlg.plotButton.clicked.connect(self.dlg.plot_on_map)
-
-    def add_bearing_row(self):
-        # Create a new row of bearing inputs
-        row_layout = QtWidgets.QHBoxLayout()
-        
-        direction = QtWidgets.QLineEdit()
-        direction.setMaxLength(1)
-        direction.setPlaceholderText("N/S")
-        
-        degrees = QtWidgets.QLineEdit()
-        degrees.setMaxLength(3)
-        degrees.setPlaceholderText("Deg")
-        
-        minutes = QtWidgets.QLineEdit()
-        minutes.setMaxLength(2)
-        minutes.setPlaceholderText("Min")
-        
-        quadrant = QtWidgets.QLineEdit()
-        quadrant.setMaxLength(1)
-        quadrant.setPlaceholderText("E/W")
-        
-        distance = QtWidgets.QLineEdit()
-        distance.setPlaceholderText("Distance (m)")
-        
-        delete_btn = QtWidgets.QPushButton("-")
-        delete_btn.clicked.connect(lambda: self.delete_bearing_row(row_layout))
-        
-        row_layout.addWidget(direction)
-        row_layout.addWidget(degrees)
-        row_layout.addWidget(minutes)
-        row_layout.addWidget(quadrant)
-        row_layout.addWidget(distance)
-        row_layout.addWidget(delete_btn)
-        
-        self.dlg.bearingListLayout.addLayout(row_layout)
-        self.update_preview()
-
-    def delete_bearing_row(self, row_layout):
-        # Remove all widgets in the row
-        while row_layout.count():
-            item = row_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        # Remove the layout itself
-        self.dlg.bearingListLayout.removeItem(row_layout)
-        self.update_preview()
+        # Load the tie points in the background once the GUI is up
+        if QSettings().value(PRELOAD_TIEPOINTS_SETTING, True, type=bool):
+            QTimer.singleShot(PRELOAD_DELAY_MS, tiepoint_store.load_in_background)
 
     def parse_bearing(self, direction, degrees, minutes, quadrant):
         try:
-            deg = float(degrees)
-            min = float(minutes)
-            azimuth = deg + (min / 60.0)
-            
-            if direction.upper() == 'N':
-                if quadrant.upper() == 'E':
-                    return azimuth
-                else:  # W
-                    return 360 - azimuth
-            else:  # S
-                if quadrant.upper() == 'E':
-                    return 180 - azimuth
-                else:  # W
-                    return 180 + azimuth
+            ns, deg, min_, ew, _ = traverse.parse_bearing_rows([(direction, degrees, minutes, quadrant, 0)])
         except ValueError:
             return None
+        return float(traverse.bearing_to_azimuth(ns, deg, min_, ew)[0])
 
     def calculate_point(self, start_point, bearing, distance):
-        # Convert bearing to radians
-        bearing_rad = math.radians(bearing)
-        
-        # Calculate new point
-        dx = distance * math.sin(bearing_rad)
-        dy = distance * math.cos(bearing_rad)
-        
-        return (start_point[0] + dx, start_point[1] + dy)
+        dx, dy = traverse.azimuth_deltas(bearing, distance)
+        return (start_point[0] + float(dx), start_point[1] + float(dy))
 
     def update_preview(self):
         self.scene.clear()
@@ -283,18 +219,7 @@ class TitlePlotterPhilippineLandTitles:
             self.current_points.append(current_point)
             
             # Process each bearing row
-            for i in range(self.dlg.bearingListLayout.count()):
-                row_layout = self.dlg.bearingListLayout.itemAt(i)
-                if not isinstance(row_layout, QtWidgets.QHBoxLayout):
-                    continue
-                
-                # Get values from widgets
-                direction = row_layout.itemAt(0).widget().text()
-                degrees = row_layout.itemAt(1).widget().text()
-                minutes = row_layout.itemAt(2).widget().text()
-                quadrant = row_layout.itemAt(3).widget().text()
-                distance = row_layout.itemAt(4).widget().text()
-                
+            for direction, degrees, minutes, quadrant, distance in self.dlg.bearing_model.line_rows():
                 if not all([direction, degrees, minutes, quadrant, distance]):
                     continue
                 
@@ -334,6 +259,7 @@ class TitlePlotterPhilippineLandTitles:
             pass
 
     def open_tiepoint_selector(self):
+        from .dialogs.tie_point_selector_dialog import TiePointSelectorDialog
         dialog = TiePointSelectorDialog()
         if dialog.exec_():
             selected_row = dialog.get_selected_row()
@@ -366,3 +292,4 @@ class TitlePlotterPhilippineLandTitles:
         for action in self.actions:
             self.iface.removePluginMenu(self.menu, action)
             self.iface.removeToolBarIcon(action)
+        batch_plotter.shutdown_pool()
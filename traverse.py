@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+"""Headless traverse engine for Philippine technical descriptions.
+
+Every function here works on NumPy arrays and has no Qt dependency, so the
+main dialog, the OCR path and batch tooling all share one implementation.
+A traverse line is a quadrant bearing (N/S, degrees, minutes, E/W) plus a
+distance in metres. Latitudes and departures are computed for all lines at
+once and corners are the cumulative sum of those deltas from the tie point.
+"""
+
+import numpy as np
+
+# Deltas are rounded like the Excel sheets surveyors check titles against
+DELTA_DECIMALS = 3
+
+
+def _angle_table(units_per_degree):
+    """Return (sin, cos) tables over a full circle at the given angle resolution.
+
+    Angles are built as ``degrees + part / units_per_degree`` so lookups give
+    the same values as computing the typed bearing directly.
+    """
+    degrees = np.arange(360, dtype=np.float64)[:, None]
+    parts = np.arange(units_per_degree, dtype=np.float64)[None, :] / units_per_degree
+    angles = np.radians(degrees + parts).ravel()
+    return np.sin(angles), np.cos(angles)
+
+
+# Titles give bearings in whole degrees and minutes, so traverse trig is a
+# lookup at index degrees * 60 + minutes
+SIN_TABLE, COS_TABLE = _angle_table(60)
+
+# Seconds-resolution sin and cos tables (~21 MB together), only built when a bearing has seconds
+_SECOND_TABLES = None
+
+
+def _second_tables():
+    global _SECOND_TABLES
+    if _SECOND_TABLES is None:
+        _SECOND_TABLES = _angle_table(3600)
+    return _SECOND_TABLES
+
+
+def bearing_trig(deg, minutes, seconds=None):
+    """Return (sin, cos) of bearing angles from the precomputed tables."""
+    index = np.asarray(deg, dtype=np.intp) * 60 + np.asarray(minutes, dtype=np.intp)
+    if seconds is None or not np.any(seconds):
+        return SIN_TABLE[index], COS_TABLE[index]
+    sin_table, cos_table = _second_tables()
+    index = index * 60 + np.asarray(seconds, dtype=np.intp)
+    return sin_table[index], cos_table[index]
+
+
+def parse_bearing_rows(rows):
+    """Convert raw bearing rows into engine arrays.
+
+    Args:
+        rows: Sequence of (ns, degrees, minutes, ew, distance) tuples. Values
+            may be strings as typed in the dialog ("," is accepted as the
+            decimal separator) or numbers.
+
+    Returns:
+        Tuple of arrays (ns, deg, minutes, ew, distance).
+
+    Raises:
+        ValueError: If a row cannot be parsed or is out of range.
+    """
+    count = len(rows)
+    ns = np.empty(count, dtype="U1")
+    ew = np.empty(count, dtype="U1")
+    deg = np.empty(count, dtype=np.int16)
+    minutes = np.empty(count, dtype=np.int16)
+    distance = np.empty(count, dtype=np.float64)
+
+    for i, (row_ns, row_deg, row_min, row_ew, row_dist) in enumerate(rows):
+        try:
+            ns[i] = str(row_ns).strip().upper()
+            deg[i] = int(str(row_deg).strip())
+            minutes[i] = int(str(row_min).strip())
+            ew[i] = str(row_ew).strip().upper()
+            distance[i] = float(str(row_dist).strip().replace(",", "."))
+        except (TypeError, ValueError, OverflowError) as e:
+            raise ValueError(f"Bearing row {i+1} has invalid input: {e}")
+
+    validate_bearings(ns, deg, minutes, ew, distance)
+    return ns, deg, minutes, ew, distance
+
+
+def bearing_dicts_to_rows(bearings):
+    """Convert bearing dicts (as produced by OCR) into engine row tuples."""
+    return [
+        (b['direction'], b['degrees'], b['minutes'], b['quadrant'], b['distance'])
+        for b in bearings
+    ]
+
+
+def validate_bearings(ns, deg, minutes, ew, distance):
+    """Raise ValueError naming the first row that is out of range."""
+    checks = [
+        (~np.isin(ns, ("N", "S")), "direction must be N or S"),
+        (~np.isin(ew, ("E", "W")), "quadrant must be E or W"),
+        ((deg < 0) | (deg > 90), "Degrees must be between 0 and 90"),
+        ((minutes < 0) | (minutes > 59), "Minutes must be between 0 and 59"),
+        (~np.isfinite(distance) | (distance < 0), "distance must be a non-negative number"),
+    ]
+    for bad, message in checks:
+        if bad.any():
+            i = int(np.flatnonzero(bad)[0])
+            raise ValueError(f"Bearing row {i+1} has invalid input: {message}")
+
+
+def bearing_to_azimuth(ns, deg, minutes, ew):
+    """Convert quadrant bearings to azimuths in degrees from north."""
+    ns = np.asarray(ns)
+    ew = np.asarray(ew)
+    angle = np.asarray(deg, dtype=np.float64) + np.asarray(minutes, dtype=np.float64) / 60.0
+    south = ns == "S"
+    west = ew == "W"
+    azimuth = np.where(south, 180.0 - angle, angle)
+    azimuth = np.where(west, np.where(south, 180.0 + angle, 360.0 - angle), azimuth)
+    return azimuth
+
+
+def azimuth_deltas(azimuth, distance):
+    """Return unrounded (delta_easting, delta_northing) for azimuths in degrees.
+
+    Azimuths on the whole-minute grid are looked up in the trig tables; any
+    other angle falls back to computing sin/cos.
+    """
+    azimuth = np.mod(np.asarray(azimuth, dtype=np.float64), 360.0)
+    distance = np.asarray(distance, dtype=np.float64)
+    minutes = azimuth * 60.0
+    index = np.rint(minutes).astype(np.intp) % len(SIN_TABLE)
+    on_grid = np.abs(minutes - np.rint(minutes)) < 1e-6
+    if np.all(on_grid):
+        return distance * SIN_TABLE[index], distance * COS_TABLE[index]
+    azimuth_rad = np.radians(azimuth)
+    sin = np.where(on_grid, SIN_TABLE[index], np.sin(azimuth_rad))
+    cos = np.where(on_grid, COS_TABLE[index], np.cos(azimuth_rad))
+    return distance * sin, distance * cos
+
+
+def calculate_deltas(ns, deg, minutes, ew, distance, seconds=None):
+    """Return (delta_lat, delta_dep) arrays for the given bearing lines.
+
+    Signs follow the quadrant: S makes the latitude negative and W makes the
+    departure negative. Both deltas are rounded to DELTA_DECIMALS places.
+    """
+    sin, cos = bearing_trig(deg, minutes, seconds)
+    distance = np.asarray(distance, dtype=np.float64)
+
+    lat_sign = np.where(np.asarray(ns) == "S", -1.0, 1.0)
+    dep_sign = np.where(np.asarray(ew) == "W", -1.0, 1.0)
+
+    delta_lat = np.round(lat_sign * distance * cos, DELTA_DECIMALS)
+    delta_dep = np.round(dep_sign * distance * sin, DELTA_DECIMALS)
+    return delta_lat, delta_dep
+
+
+def traverse(tie_easting, tie_northing, delta_lat, delta_dep):
+    """Return an (n, 2) array of (easting, northing) after each line."""
+    # Start the running sum at the tie point so the additions happen in the
+    # same order as walking the lines one by one
+    coords = np.empty((len(delta_lat) + 1, 2), dtype=np.float64)
+    coords[0] = (tie_easting, tie_northing)
+    coords[1:, 0] = delta_dep
+    coords[1:, 1] = delta_lat
+    np.cumsum(coords, axis=0, out=coords)
+    return coords[1:]
+
+
+def traverse_lots(tie_eastings, tie_northings, offsets, delta_lat, delta_dep):
+    """Run the traverse for many lots in one pass.
+
+    Lines of all lots are stored back to back; lot ``i`` owns the lines
+    ``offsets[i]:offsets[i+1]``.
+
+    Args:
+        tie_eastings: Array with one tie point easting per lot.
+        tie_northings: Array with one tie point northing per lot.
+        offsets: Integer array of length ``lots + 1`` starting at 0.
+        delta_lat: Latitudes of every line of every lot.
+        delta_dep: Departures of every line of every lot.
+
+    Returns:
+        (total_lines, 2) array of (easting, northing) after each line.
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    counts = np.diff(offsets)
+
+    coords = np.empty((len(delta_lat), 2), dtype=np.float64)
+    np.cumsum(delta_dep, out=coords[:, 0])
+    np.cumsum(delta_lat, out=coords[:, 1])
+
+    # Running totals of the previous lots, so every lot restarts at its tie point
+    starts = np.zeros((len(counts), 2), dtype=np.float64)
+    has_previous = offsets[:-1] > 0
+    starts[has_previous] = coords[offsets[:-1][has_previous] - 1]
+
+    base = np.column_stack((
+        np.asarray(tie_eastings, dtype=np.float64),
+        np.asarray(tie_northings, dtype=np.float64),
+    )) - starts
+    coords += np.repeat(base, counts, axis=0)
+    return coords
+
+
+def lot_corners(tie_easting, tie_northing, ns, deg, minutes, ew, distance):
+    """Return the corners of a lot as an (n, 2) array.
+
+    The first line runs from the tie point to corner 1 and the last line closes
+    the polygon back to corner 1, so the corners are the traverse positions
+    after every line except the last.
+    """
+    delta_lat, delta_dep = calculate_deltas(ns, deg, minutes, ew, distance)
+    return traverse(tie_easting, tie_northing, delta_lat[:-1], delta_dep[:-1])
+
+
+def polygon_wkt(corners):
+    """Format corners as a closed WKT polygon."""
+    vertices = [f'{x} {y}' for x, y in corners]
+    vertices.append(vertices[0])
+    return f"POLYGON (({', '.join(vertices)}))"
+
+
+class TraverseCache:
+    """Per-line deltas and running corners of one traverse, patched line by line.
+
+    The dialog feeds raw row texts in; only lines whose text changed are
+    re-parsed, and corners are only recomputed from the first changed line
+    onwards. WKT vertex strings are cached per corner the same way.
+    """
+
+    def __init__(self):
+        self.tie = None
+        self.rows = []
+        self.delta_lat = np.zeros(0)
+        self.delta_dep = np.zeros(0)
+        self.valid = np.zeros(0, dtype=bool)
+        self._corners = np.zeros((0, 2))
+        self._vertices = []
+        # Corners before this line index are up to date
+        self._clean = 0
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def first_changed(self):
+        """Index of the first corner that will move on the next corners() call."""
+        return self._clean
+
+    def set_tie(self, easting, northing):
+        """Set the tie point; returns True if it moved."""
+        if self.tie == (easting, northing):
+            return False
+        self.tie = (easting, northing)
+        self._clean = 0
+        return True
+
+    def clear_tie(self):
+        """Forget the tie point, e.g. while its input is being edited."""
+        self.tie = None
+        self._clean = 0
+
+    def set_line(self, index, row):
+        """Update one line from its raw (ns, deg, min, ew, distance) row.
+
+        Returns True if the row differs from the cached one.
+        """
+        row = tuple(row)
+        if self.rows[index] == row:
+            return False
+        self.rows[index] = row
+        try:
+            ns, deg, minutes, ew, distance = parse_bearing_rows([row])
+            delta_lat, delta_dep = calculate_deltas(ns, deg, minutes, ew, distance)
+            self.delta_lat[index] = delta_lat[0]
+            self.delta_dep[index] = delta_dep[0]
+            self.valid[index] = True
+        except ValueError:
+            self.valid[index] = False
+        self._clean = min(self._clean, index)
+        return True
+
+    def set_rows(self, rows):
+        """Resynchronize with a full list of rows after lines were added or removed.
+
+        Returns True if anything changed.
+        """
+        rows = [tuple(row) for row in rows]
+        if rows == self.rows:
+            return False
+        # Keep the parsed lines that are unchanged at the start of the traverse
+        keep = 0
+        while keep < min(len(rows), len(self.rows)) and rows[keep] == self.rows[keep]:
+            keep += 1
+        count = len(rows)
+        self.delta_lat = np.resize(self.delta_lat, count)
+        self.delta_dep = np.resize(self.delta_dep, count)
+        self.valid = np.resize(self.valid, count)
+        self._corners = np.resize(self._corners, (count, 2))
+        del self._vertices[keep:]
+        self.rows = self.rows[:keep] + [None] * (count - keep)
+        self._clean = min(self._clean, keep)
+        for index in range(keep, count):
+            self.set_line(index, rows[index])
+        return True
+
+    def corners(self):
+        """Return the (n, 2) corner array, or None if a line is invalid."""
+        if self.tie is None or not self.valid.all():
+            return None
+        start = self._clean
+        if start < len(self.rows):
+            previous = self._corners[start - 1] if start else self.tie
+            self._corners[start:] = traverse(previous[0], previous[1], self.delta_lat[start:], self.delta_dep[start:])
+            del self._vertices[start:]
+            self._vertices.extend(f'{x} {y}' for x, y in self._corners[start:].tolist())
+            self._clean = len(self.rows)
+        return self._corners
+
+    def wkt(self):
+        """Return the closed WKT polygon of the current corners."""
+        if self.corners() is None or not self._vertices:
+            return None
+        return f"POLYGON (({', '.join(self._vertices)}, {self._vertices[0]}))"